@@ -16,7 +16,9 @@ Version: 1.0.0
 import signal
 import sys
 import logging
-from flask import Flask, jsonify
+import orjson
+from flask import Flask, Response, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 
 # Import utilities
@@ -25,8 +27,8 @@ from utils.config import config
 
 # Import service blueprints
 from services.process_monitor.routes import process_bp, init_process_monitor, shutdown_process_monitor
-from services.integrity_scanner.routes import integrity_bp
-from services.ioc_hunting.routes import ioc_bp
+from services.integrity_scanner.routes import integrity_bp, shutdown_integrity_scanner
+from services.ioc_hunting.routes import ioc_bp, shutdown_ioc_hunter
 from services.behavior_monitor.routes import behavior_bp
 from services.containment.routes import containment_bp
 from services.report.routes import report_bp
@@ -35,8 +37,29 @@ from services.report.routes import report_bp
 setup_logging(level=config.LOG_LEVEL, log_file=config.LOG_FILE)
 logger = get_logger(__name__)
 
+class OrjsonProvider(JSONProvider):
+    """JSON provider that serializes all responses with orjson."""
+    
+    option = orjson.OPT_NON_STR_KEYS
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs) -> Response:
+        # Skip the bytes -> str -> bytes round trip of the base implementation
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=self.option),
+            mimetype='application/json'
+        )
+
+
 # Create Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Enable CORS for frontend integration
 CORS(app, origins=config.CORS_ORIGINS)
@@ -60,15 +83,54 @@ logger.info("Registered blueprints: process, integrity, ioc, behavior, contain,
 # Global Endpoints
 # ============================================================================
 
+# Static payloads are serialized once at import time; health probes and
+# load balancers hit these endpoints constantly.
+_ROOT_JSON = orjson.dumps({
+    'name': 'Siren Backend API',
+    'version': '1.0.0',
+    'status': 'online',
+    'documentation': '/api/health'
+})
+
+_HEALTH_JSON = orjson.dumps({
+    'status': 'healthy',
+    'server': 'siren_backend',
+    'version': '1.0.0',
+    'services': {
+        'process_monitor': {
+            'status': 'active',
+            'endpoint': '/api/process/health'
+        },
+        'integrity_scanner': {
+            'status': 'active',
+            'endpoint': '/api/integrity/scan/<host_id>'
+        },
+        'ioc_hunting': {
+            'status': 'active',
+            'endpoint': '/api/ioc/hunt'
+        },
+        'behavior_monitor': {
+            'status': 'active',
+            'endpoint': '/api/behavior/events'
+        },
+        'containment': {
+            'status': 'active',
+            'endpoint': '/api/contain/isolate/<host>'
+        },
+        'report_generation': {
+            'status': 'active',
+            'endpoint': '/api/report/generate/<incident_id>'
+        }
+    }
+})
+
+_STATIC_HEADERS = {'Cache-Control': 'public, max-age=60'}
+
+
 @app.route('/', methods=['GET'])
 def root():
     """Root endpoint - API information"""
-    return jsonify({
-        'name': 'Siren Backend API',
-        'version': '1.0.0',
-        'status': 'online',
-        'documentation': '/api/health'
-    }), 200
+    return Response(_ROOT_JSON, status=200, mimetype='application/json', headers=_STATIC_HEADERS)
 
 
 @app.route('/api/health', methods=['GET'])
@@ -81,37 +143,7 @@ def global_health():
     Returns:
         JSON with overall status and service list
     """
-    return jsonify({
-        'status': 'healthy',
-        'server': 'siren_backend',
-        'version': '1.0.0',
-        'services': {
-            'process_monitor': {
-                'status': 'active',
-                'endpoint': '/api/process/health'
-            },
-            'integrity_scanner': {
-                'status': 'active',
-                'endpoint': '/api/integrity/scan/<host_id>'
-            },
-            'ioc_hunting': {
-                'status': 'active',
-                'endpoint': '/api/ioc/hunt'
-            },
-            'behavior_monitor': {
-                'status': 'active',
-                'endpoint': '/api/behavior/events'
-            },
-            'containment': {
-                'status': 'active',
-                'endpoint': '/api/contain/isolate/<host>'
-            },
-            'report_generation': {
-                'status': 'active',
-                'endpoint': '/api/report/generate/<incident_id>'
-            }
-        }
-    }), 200
+    return Response(_HEALTH_JSON, status=200, mimetype='application/json', headers=_STATIC_HEADERS)
 
 
 # ============================================================================
@@ -172,6 +204,12 @@ def shutdown_services():
     # Shutdown process monitor
     shutdown_process_monitor()
     
+    # Stop accepting integrity scans
+    shutdown_integrity_scanner()
+    
+    # Stop accepting IOC hunts
+    shutdown_ioc_hunter()
+    
     # TODO: Shutdown other services as needed
     
     logger.info("All services shut down successfully")
@@ -224,6 +262,7 @@ if __name__ == '__main__':
     logger.info("")
     logger.info("  Process Monitor:")
     logger.info("    GET  /api/process/processes             - List all processes")
+    logger.info("    GET  /api/process/processes/stream      - List all processes (NDJSON)")
     logger.info("    GET  /api/process/metrics               - System metrics (60s)")
     logger.info("    POST /api/process/kill/<pid>            - Terminate process")
     logger.info("    GET  /api/process/health                - Service health")
@@ -234,11 +273,12 @@ if __name__ == '__main__':
     logger.info("")
     logger.info("  IOC Hunting:")
     logger.info("    POST /api/ioc/hunt                      - Start hunt")
+    logger.info("    POST /api/ioc/hunt/bulk                 - Start bulk hunt")
     logger.info("    GET  /api/ioc/results/<hunt_id>         - Get results")
     logger.info("")
     logger.info("  Behavior Monitor:")
     logger.info("    GET  /api/behavior/events               - Get events")
-    logger.info("    GET  /api/behavior/stream               - Stream events")
+    logger.info("    GET  /api/behavior/stream               - Stream events (SSE)")
     logger.info("")
     logger.info("  Containment:")
     logger.info("    POST /api/contain/isolate/<host>        - Isolate host")
@@ -260,5 +300,6 @@ if __name__ == '__main__':
         host=config.HOST,
         port=config.PORT,
         debug=config.DEBUG,
+        threaded=True,  # One thread per request so /stream clients don't block others
         use_reloader=False  # Disable reloader to prevent duplicate services
     )
@@ -0,0 +1,21 @@
+"""
+Behavior Monitor service package.
+
+Exposes the shared BehaviorWatcher so every importer sees the same
+event buffer and rule set.
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def get_watcher():
+    """
+    Get the process-wide BehaviorWatcher, creating it on first use.
+    
+    Returns:
+        Shared BehaviorWatcher instance
+    """
+    from utils.config import config
+    from .watcher import BehaviorWatcher
+    return BehaviorWatcher(max_events=config.BEHAVIOR_MAX_EVENTS)
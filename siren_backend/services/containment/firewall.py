@@ -0,0 +1,173 @@
+"""
+FirewallBatcher - Coalesces firewall changes into batched netsh calls
+
+Containment requests run on separate server threads. Each one submits its
+netsh commands to a shared queue; a single background worker drains
+whatever has accumulated and applies it with one "netsh -f" script. If
+that script fails, each request is rerun on its own so every caller gets
+its own outcome.
+"""
+
+import logging
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+
+class FirewallBatcher:
+    """
+    Background submission queue for netsh firewall commands.
+    
+    Callers block on apply() until the batch containing their commands
+    has been executed, so results still reflect the real firewall state.
+    """
+    
+    def __init__(self, batch_size: int = 64, linger: float = 0.01):
+        """
+        Initialize the batcher.
+        
+        Args:
+            batch_size: Maximum commands coalesced into one netsh call
+            linger: Seconds to wait for more submissions before flushing
+        """
+        self.batch_size = batch_size
+        self.linger = linger
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+    
+    def submit(self, commands: List[str]) -> Future:
+        """
+        Queue netsh commands for the next batch.
+        
+        Args:
+            commands: netsh commands, without the leading "netsh"
+        
+        Returns:
+            Future resolving to the success status of these commands
+        """
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((commands, future))
+        return future
+    
+    def apply(self, commands: List[str], timeout: float = 90.0) -> bool:
+        """
+        Queue netsh commands and wait for them to be applied.
+        
+        Args:
+            commands: netsh commands, without the leading "netsh"
+            timeout: Maximum seconds to wait for the batch
+        
+        Returns:
+            Success status
+        """
+        try:
+            return self.submit(commands).result(timeout=timeout)
+        except Exception as e:
+            logger.error(f"Firewall batch did not complete: {e}")
+            return False
+    
+    def _ensure_worker(self) -> None:
+        """Start the background worker on first use."""
+        if self._worker is not None:
+            return
+        
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name='FirewallBatcher',
+                    daemon=True
+                )
+                self._worker.start()
+    
+    def _run(self) -> None:
+        """Worker loop: gather submissions, run them, resolve futures."""
+        while True:
+            batch = [self._queue.get()]
+            count = len(batch[0][0])
+            deadline = time.monotonic() + self.linger
+            
+            # Pick up anything submitted concurrently, up to batch_size
+            while count < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                count += len(item[0])
+            
+            if len(batch) == 1:
+                results = [self._execute(batch[0][0])]
+            elif self._execute([command for item in batch for command in item[0]]):
+                results = [True] * len(batch)
+            else:
+                # netsh has already applied the commands before the failing
+                # one, so the shared result is wrong for some requests: rerun
+                # each on its own. A rule added twice is harmless.
+                results = [self._execute(commands) for commands, _ in batch]
+            
+            for (_, future), success in zip(batch, results):
+                future.set_result(success)
+    
+    def _execute(self, commands: List[str]) -> bool:
+        """
+        Run one netsh script, keeping the worker alive on unexpected errors.
+        
+        Args:
+            commands: netsh commands, without the leading "netsh"
+        
+        Returns:
+            Success status
+        """
+        try:
+            return run_netsh_script(commands)
+        except Exception as e:
+            logger.error(f"netsh batch failed ({len(commands)} commands): {e}")
+            return False
+
+
+def run_netsh_script(commands: List[str]) -> bool:
+    """
+    Run netsh commands from a temporary script file.
+    
+    Args:
+        commands: netsh commands, without the leading "netsh"
+    
+    Returns:
+        Success status
+    """
+    fd, script_path = tempfile.mkstemp(prefix='siren_fw_', suffix='.txt')
+    try:
+        with os.fdopen(fd, 'w') as script:
+            script.write('\n'.join(commands) + '\n')
+        
+        subprocess.run(
+            ['netsh', '-f', script_path],
+            check=True,
+            capture_output=True,
+            timeout=60
+        )
+        logger.debug(f"Applied netsh batch ({len(commands)} commands)")
+        return True
+    
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.error(f"netsh batch failed ({len(commands)} commands): {e}")
+        return False
+    
+    finally:
+        try:
+            os.remove(script_path)
+        except OSError:
+            pass
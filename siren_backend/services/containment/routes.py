@@ -9,6 +9,7 @@ Endpoints:
     POST /api/contain/block/<ip>              - Block IP address
     DELETE /api/contain/block/<ip>            - Unblock IP
     POST /api/contain/quarantine              - Quarantine file
+    POST /api/contain/batch                   - Run several actions at once
     GET  /api/contain/status/<host>           - Get containment status
     GET  /api/contain/blocked-ips             - List blocked IPs
     GET  /api/contain/isolated-hosts          - List isolated hosts
@@ -17,9 +18,14 @@ Endpoints:
     GET  /api/contain/statistics              - Get statistics
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, request
+from functools import lru_cache
+from werkzeug.routing import BaseConverter, ValidationError
+import ipaddress
 import logging
-from .actions import ContainmentActions
+import orjson
+from utils.common import json_response, safe_endpoint
+from .actions import ContainmentActions, STATE_MESSAGES
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +33,65 @@ containment_bp = Blueprint('contain', __name__)
 actions = ContainmentActions()
 
 
+class IPConverter(BaseConverter):
+    """
+    URL converter that only matches valid IPv4/IPv6 addresses.
+    
+    Invalid addresses fail routing with a 404 before reaching the view;
+    valid ones arrive in canonical form (e.g. lower-case, compressed IPv6).
+    """
+    
+    regex = r'[0-9A-Fa-f:.]+'
+    
+    def to_python(self, value: str) -> str:
+        try:
+            return str(ipaddress.ip_address(value))
+        except ValueError:
+            raise ValidationError()
+
+
+# Converters must exist before the blueprint's rules are added to the app
+containment_bp.record_once(
+    lambda state: state.app.url_map.converters.setdefault('ip', IPConverter)
+)
+
+# Upper bound on operations accepted by a single /batch request
+MAX_BATCH_OPERATIONS = 500
+
+
+@lru_cache(maxsize=1024)
+def _state_conflict_body(status: str, field: str, value: str) -> bytes:
+    """
+    Serialized body for a request that conflicts with the current state.
+    
+    Retry storms repeat the same host/IP, so the encoded bytes are cached.
+    
+    Args:
+        status: Conflict status (a STATE_MESSAGES key)
+        field: Name of the identifying field ('host' or 'ip_address')
+        value: Host or IP the request was for
+    
+    Returns:
+        JSON response body
+    """
+    return orjson.dumps({
+        'status': status,
+        field: value,
+        'message': STATE_MESSAGES[status]
+    })
+
+
+def _state_conflict(status: str, field: str, value: str):
+    """Build the 400 response for a state conflict fast path."""
+    return Response(
+        _state_conflict_body(status, field, value),
+        status=400,
+        mimetype='application/json'
+    )
+
+
 @containment_bp.route('/isolate/<host>', methods=['POST'])
+@safe_endpoint('isolating host')
 def isolate_host(host):
     """
     POST /api/contain/isolate/<host>
@@ -42,21 +106,20 @@ def isolate_host(host):
     Returns:
         Action result with action_id
     """
-    try:
-        data = request.get_json() if request.is_json else {}
-        reason = data.get('reason', 'Security incident')
-        
-        result = actions.isolate_host(host, reason)
-        
-        status_code = 200 if result['status'] == 'success' else 400
-        return jsonify(result), status_code
-        
-    except Exception as e:
-        logger.error(f"Error isolating host: {e}")
-        return jsonify({'error': str(e)}), 500
+    if host in actions.isolated_hosts:
+        return _state_conflict('already_isolated', 'host', host)
+    
+    data = request.get_json() if request.is_json else {}
+    reason = data.get('reason', 'Security incident')
+    
+    result = actions.isolate_host(host, reason)
+    
+    status_code = 200 if result['status'] == 'success' else 400
+    return json_response(result, status_code)
 
 
 @containment_bp.route('/restore/<host>', methods=['POST'])
+@safe_endpoint('restoring host')
 def restore_host(host):
     """
     POST /api/contain/restore/<host>
@@ -66,17 +129,28 @@ def restore_host(host):
     Returns:
         Restoration result
     """
-    try:
-        result = actions.restore_host(host)
-        status_code = 200 if result['status'] == 'success' else 400
-        return jsonify(result), status_code
-        
-    except Exception as e:
-        logger.error(f"Error restoring host: {e}")
-        return jsonify({'error': str(e)}), 500
+    if host not in actions.isolated_hosts:
+        return _state_conflict('not_isolated', 'host', host)
+    
+    result = actions.restore_host(host)
+    status_code = 200 if result['status'] == 'success' else 400
+    return json_response(result, status_code)
+
+
+@containment_bp.route('/block/<ip:ip>', methods=['POST', 'DELETE'])
+def block_ip_route(ip):
+    """
+    POST|DELETE /api/contain/block/<ip>
+    
+    Single rule for both methods: with two rules, Werkzeug answers 405
+    instead of 404 when the converter rejects the address on the second.
+    """
+    if request.method == 'DELETE':
+        return unblock_ip(ip)
+    return block_ip(ip)
 
 
-@containment_bp.route('/block/<ip>', methods=['POST'])
+@safe_endpoint('blocking IP')
 def block_ip(ip):
     """
     POST /api/contain/block/<ip>
@@ -91,20 +165,18 @@ def block_ip(ip):
     Returns:
         Action result with action_id
     """
-    try:
-        data = request.get_json() if request.is_json else {}
-        reason = data.get('reason', 'Malicious activity')
-        
-        result = actions.block_ip(ip, reason)
-        status_code = 200 if result['status'] == 'success' else 400
-        return jsonify(result), status_code
-        
-    except Exception as e:
-        logger.error(f"Error blocking IP: {e}")
-        return jsonify({'error': str(e)}), 500
+    if ip in actions.blocked_ips:
+        return _state_conflict('already_blocked', 'ip_address', ip)
+    
+    data = request.get_json() if request.is_json else {}
+    reason = data.get('reason', 'Malicious activity')
+    
+    result = actions.block_ip(ip, reason)
+    status_code = 200 if result['status'] == 'success' else 400
+    return json_response(result, status_code)
 
 
-@containment_bp.route('/block/<ip>', methods=['DELETE'])
+@safe_endpoint('unblocking IP')
 def unblock_ip(ip):
     """
     DELETE /api/contain/block/<ip>
@@ -114,17 +186,16 @@ def unblock_ip(ip):
     Returns:
         Unblock result
     """
-    try:
-        result = actions.unblock_ip(ip)
-        status_code = 200 if result['status'] == 'success' else 400
-        return jsonify(result), status_code
-        
-    except Exception as e:
-        logger.error(f"Error unblocking IP: {e}")
-        return jsonify({'error': str(e)}), 500
+    if ip not in actions.blocked_ips:
+        return _state_conflict('not_blocked', 'ip_address', ip)
+    
+    result = actions.unblock_ip(ip)
+    status_code = 200 if result['status'] == 'success' else 400
+    return json_response(result, status_code)
 
 
 @containment_bp.route('/quarantine', methods=['POST'])
+@safe_endpoint('quarantining file')
 def quarantine_file():
     """
     POST /api/contain/quarantine
@@ -140,26 +211,58 @@ def quarantine_file():
     Returns:
         Quarantine result with action_id
     """
-    try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'Request body required'}), 400
-        
-        file_path = data.get('file_path')
-        host = data.get('host')
-        
-        if not file_path or not host:
-            return jsonify({'error': 'file_path and host are required'}), 400
-        
-        result = actions.quarantine_file(file_path, host)
-        return jsonify(result), 200
-        
-    except Exception as e:
-        logger.error(f"Error quarantining file: {e}")
-        return jsonify({'error': str(e)}), 500
+    data = request.get_json()
+    if not data:
+        return json_response({'error': 'Request body required'}, 400)
+    
+    file_path = data.get('file_path')
+    host = data.get('host')
+    
+    if not file_path or not host:
+        return json_response({'error': 'file_path and host are required'}, 400)
+    
+    result = actions.quarantine_file(file_path, host)
+    return json_response(result, 200)
+
+
+@containment_bp.route('/batch', methods=['POST'])
+@safe_endpoint('running batch')
+def batch_actions():
+    """
+    POST /api/contain/batch
+    
+    Run several containment actions in one request. IP blocks are
+    applied to the firewall together.
+    
+    Request Body:
+        {
+            "operations": [
+                {"op": "isolate", "host": "hostname", "reason": "..."},
+                {"op": "block", "ip": "1.2.3.4", "reason": "..."},
+                {"op": "quarantine", "file_path": "C:\\\\path\\\\file.exe", "host": "hostname"}
+            ]
+        }
+    
+    Returns:
+        Per-operation results in request order
+    """
+    data = request.get_json()
+    if not data:
+        return json_response({'error': 'Request body required'}, 400)
+    
+    operations = data.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return json_response({'error': 'operations must be a non-empty list'}, 400)
+    
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return json_response({'error': f'At most {MAX_BATCH_OPERATIONS} operations per batch'}, 400)
+    
+    result = actions.execute_batch(operations)
+    return json_response(result, 200)
 
 
 @containment_bp.route('/status/<host>', methods=['GET'])
+@safe_endpoint('fetching status')
 def get_status(host):
     """
     GET /api/contain/status/<host>
@@ -169,16 +272,12 @@ def get_status(host):
     Returns:
         Status information
     """
-    try:
-        result = actions.get_containment_status(host)
-        return jsonify(result), 200
-        
-    except Exception as e:
-        logger.error(f"Error fetching status: {e}")
-        return jsonify({'error': str(e)}), 500
+    result = actions.get_containment_status(host)
+    return json_response(result, 200)
 
 
 @containment_bp.route('/blocked-ips', methods=['GET'])
+@safe_endpoint('listing blocked IPs')
 def list_blocked_ips():
     """
     GET /api/contain/blocked-ips
@@ -188,16 +287,12 @@ def list_blocked_ips():
     Returns:
         Array of blocked IPs
     """
-    try:
-        result = actions.list_blocked_ips()
-        return jsonify(result), 200
-        
-    except Exception as e:
-        logger.error(f"Error listing blocked IPs: {e}")
-        return jsonify({'error': str(e)}), 500
+    result = actions.list_blocked_ips()
+    return json_response(result, 200)
 
 
 @containment_bp.route('/isolated-hosts', methods=['GET'])
+@safe_endpoint('listing isolated hosts')
 def list_isolated_hosts():
     """
     GET /api/contain/isolated-hosts
@@ -207,16 +302,12 @@ def list_isolated_hosts():
     Returns:
         Array of isolated hosts
     """
-    try:
-        result = actions.list_isolated_hosts()
-        return jsonify(result), 200
-        
-    except Exception as e:
-        logger.error(f"Error listing isolated hosts: {e}")
-        return jsonify({'error': str(e)}), 500
+    result = actions.list_isolated_hosts()
+    return json_response(result, 200)
 
 
 @containment_bp.route('/rollback/<action_id>', methods=['POST'])
+@safe_endpoint('rolling back action')
 def rollback_action(action_id):
     """
     POST /api/contain/rollback/<action_id>
@@ -226,17 +317,16 @@ def rollback_action(action_id):
     Returns:
         Rollback result
     """
-    try:
-        result = actions.rollback_action(action_id)
-        status_code = 200 if result['status'] == 'success' else 404
-        return jsonify(result), status_code
-        
-    except Exception as e:
-        logger.error(f"Error rolling back action: {e}")
-        return jsonify({'error': str(e)}), 500
+    result = actions.rollback_action(action_id)
+    if result['status'] == 'failed':
+        return json_response(result, 400)
+    
+    status_code = 200 if result['status'] == 'success' else 404
+    return json_response(result, status_code)
 
 
 @containment_bp.route('/history', methods=['GET'])
+@safe_endpoint('fetching history')
 def get_history():
     """
     GET /api/contain/history?limit=50
@@ -249,21 +339,17 @@ def get_history():
     Returns:
         Array of actions
     """
-    try:
-        limit = int(request.args.get('limit', 50))
-        history = actions.get_action_history(limit)
-        
-        return jsonify({
-            'actions': history,
-            'count': len(history)
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error fetching history: {e}")
-        return jsonify({'error': str(e)}), 500
+    limit = int(request.args.get('limit', 50))
+    history = actions.get_action_history(limit)
+    
+    return json_response({
+        'actions': history,
+        'count': len(history)
+    }, 200)
 
 
 @containment_bp.route('/statistics', methods=['GET'])
+@safe_endpoint('fetching statistics')
 def get_statistics():
     """
     GET /api/contain/statistics
@@ -273,13 +359,8 @@ def get_statistics():
     Returns:
         Statistics dictionary
     """
-    try:
-        stats = actions.get_statistics()
-        return jsonify(stats), 200
-        
-    except Exception as e:
-        logger.error(f"Error fetching statistics: {e}")
-        return jsonify({'error': str(e)}), 500
+    stats = actions.get_statistics()
+    return json_response(stats, 200)
 
 
 @containment_bp.route('/health', methods=['GET'])
@@ -294,10 +375,10 @@ def health_check():
     """
     stats = actions.get_statistics()
     
-    return jsonify({
+    return json_response({
         'status': 'healthy',
         'service': 'containment',
         'total_actions': stats['total_actions'],
         'isolated_hosts': stats['isolated_hosts'],
         'blocked_ips': stats['blocked_ips']
-    }), 200
+    }, 200)
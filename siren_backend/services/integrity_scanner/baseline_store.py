@@ -0,0 +1,246 @@
+"""
+BaselineStore - SQLite persistence for integrity baselines
+
+Baselines hold one row per file, so they survive restarts and do not
+keep every host's full snapshot in memory. Scans are compared against a
+baseline with a join inside SQLite rather than a Python dict walk.
+"""
+
+import logging
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+from .snapshot import Snapshot, format_mtime
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS baselines (
+    host_id    TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    file_count INTEGER NOT NULL,
+    last_scan  TEXT,
+    algorithm  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS baseline_files (
+    host_id  TEXT NOT NULL,
+    filepath TEXT NOT NULL,
+    hash     BLOB NOT NULL,
+    size     INTEGER,
+    modified TEXT,
+    UNIQUE (host_id, filepath)
+);
+CREATE TABLE IF NOT EXISTS file_hashes (
+    file_key TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size     INTEGER NOT NULL,
+    hash     BLOB NOT NULL
+);
+"""
+
+
+class BaselineStore:
+    """
+    SQLite-backed baseline storage keyed by host.
+    
+    A single connection is shared between request threads and guarded
+    by a lock; each write runs in its own transaction.
+    """
+    
+    def __init__(self, db_path: str = ':memory:'):
+        """
+        Open (and create if needed) the baseline database.
+        
+        Args:
+            db_path: SQLite database file, or ':memory:'
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._conn.execute(
+            "CREATE TEMP TABLE current_files (filepath TEXT PRIMARY KEY, hash BLOB NOT NULL)"
+        )
+        self._conn.execute("CREATE TEMP TABLE lookup_paths (filepath TEXT PRIMARY KEY)")
+        logger.info(f"BaselineStore opened: {db_path}")
+    
+    def __contains__(self, host_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM baselines WHERE host_id = ?", (host_id,)
+            ).fetchone()
+        return row is not None
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM baselines").fetchone()[0]
+    
+    def get(self, host_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get baseline metadata for a host.
+        
+        Args:
+            host_id: Host identifier
+        
+        Returns:
+            Baseline summary or None if not found
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT host_id, created_at, file_count, COALESCE(last_scan, created_at), algorithm "
+                "FROM baselines WHERE host_id = ?",
+                (host_id,)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        return {
+            'host_id': row[0],
+            'created_at': row[1],
+            'file_count': row[2],
+            'last_scan': row[3],
+            'algorithm': row[4]
+        }
+    
+    def save(
+        self,
+        host_id: str,
+        created_at: str,
+        snapshot: Snapshot,
+        algorithm: str = 'sha256'
+    ) -> None:
+        """
+        Replace a host's baseline with a new snapshot.
+        
+        Args:
+            host_id: Host identifier
+            created_at: Baseline creation timestamp
+            snapshot: Scanned files
+            algorithm: Hash algorithm used for the snapshot
+        """
+        rows = [
+            (host_id, path, file_hash, size, format_mtime(mtime))
+            for path, file_hash, size, mtime in snapshot.rows()
+        ]
+        
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM baseline_files WHERE host_id = ?", (host_id,))
+            self._conn.executemany(
+                "INSERT INTO baseline_files (host_id, filepath, hash, size, modified) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO baselines "
+                "(host_id, created_at, file_count, last_scan, algorithm) "
+                "VALUES (?, ?, ?, NULL, ?)",
+                (host_id, created_at, len(rows), algorithm)
+            )
+    
+    def lookup(self, host_id: str, paths: List[str]) -> Dict[str, Tuple[bytes, int, str]]:
+        """
+        Fetch the baseline entries of the given files.
+        
+        Args:
+            host_id: Host identifier
+            paths: File paths to look up
+        
+        Returns:
+            {filepath: (hash, size, modified)} for files in the baseline
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM temp.lookup_paths")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO temp.lookup_paths (filepath) VALUES (?)",
+                ((path,) for path in paths)
+            )
+            
+            rows = self._conn.execute(
+                "SELECT b.filepath, b.hash, b.size, b.modified "
+                "FROM temp.lookup_paths l "
+                "JOIN baseline_files b ON b.host_id = ? AND b.filepath = l.filepath",
+                (host_id,)
+            ).fetchall()
+            
+            self._conn.execute("DELETE FROM temp.lookup_paths")
+        
+        return {filepath: (file_hash, size, modified) for filepath, file_hash, size, modified in rows}
+    
+    def diff(
+        self,
+        host_id: str,
+        snapshot: Snapshot
+    ) -> Tuple[List[Tuple[str, bytes, Optional[bytes]]], List[str]]:
+        """
+        Compare a snapshot against a host's baseline.
+        
+        Args:
+            host_id: Host identifier
+            snapshot: Scanned files
+        
+        Returns:
+            Tuple of ([(filepath, hash, baseline_hash)] for new or modified
+            files, in snapshot order - baseline_hash is None for new files,
+            [filepath] for files missing from the snapshot, in baseline order)
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM temp.current_files")
+            self._conn.executemany(
+                "INSERT INTO temp.current_files (filepath, hash) VALUES (?, ?)",
+                zip(snapshot.paths, snapshot.hashes)
+            )
+            
+            changed = self._conn.execute(
+                "SELECT c.filepath, c.hash, b.hash "
+                "FROM temp.current_files c "
+                "LEFT JOIN baseline_files b ON b.host_id = ? AND b.filepath = c.filepath "
+                "WHERE b.hash IS NULL OR b.hash <> c.hash "
+                "ORDER BY c.rowid",
+                (host_id,)
+            ).fetchall()
+            
+            deleted = [row[0] for row in self._conn.execute(
+                "SELECT b.filepath FROM baseline_files b "
+                "WHERE b.host_id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM temp.current_files c WHERE c.filepath = b.filepath) "
+                "ORDER BY b.rowid",
+                (host_id,)
+            )]
+            
+            self._conn.execute("DELETE FROM temp.current_files")
+        
+        return changed, deleted
+    
+    def load_file_hashes(self, limit: int) -> List[Tuple[str, int, int, bytes]]:
+        """
+        Load the most recently saved file hashes, oldest first.
+        
+        Args:
+            limit: Maximum number of entries
+        
+        Returns:
+            List of (file_key, mtime_ns, size, hash) tuples
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_key, mtime_ns, size, hash FROM file_hashes "
+                "ORDER BY rowid DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        rows.reverse()
+        return rows
+    
+    def save_file_hashes(self, entries: Iterable[Tuple[str, int, int, bytes]]) -> None:
+        """
+        Persist file hashes so a restart keeps the hash cache warm.
+        
+        Args:
+            entries: (file_key, mtime_ns, size, hash) tuples
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO file_hashes (file_key, mtime_ns, size, hash) "
+                "VALUES (?, ?, ?, ?)",
+                entries
+            )
@@ -0,0 +1,140 @@
+"""
+HashCache - Reuse file hashes across scans while files are unchanged
+
+Entries are keyed by hash algorithm and file identity (device, inode),
+and are only valid while the file's mtime and size still match, so an
+unchanged file is served from a stat() result instead of being read and
+hashed again.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+# (file_key, mtime_ns, size, hash), as persisted by BaselineStore
+HashEntry = Tuple[str, int, int, bytes]
+
+
+class HashCache:
+    """
+    Thread-safe LRU cache of file hashes.
+    
+    New entries are also queued so the caller can persist them in bulk.
+    """
+    
+    def __init__(self, maxsize: int = 100_000):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            maxsize: Maximum number of files remembered
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # {file_key: (mtime_ns, size, hash)}
+        self._pending: List[HashEntry] = []
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def file_key(filepath: str, file_stat, algorithm: str = 'sha256') -> str:
+        """
+        Identity of a file's hash that survives renames within a volume.
+        
+        Stats from os.scandir on Windows carry no inode (st_ino is 0), so
+        the path identifies the file there instead.
+        
+        Args:
+            filepath: Path to the file
+            file_stat: os.stat_result for the file
+            algorithm: Hash algorithm
+        
+        Returns:
+            "<algorithm>:<device>:<inode>" or "<algorithm>:<path>" string
+        """
+        if file_stat.st_ino:
+            return f"{algorithm}:{file_stat.st_dev}:{file_stat.st_ino}"
+        return f"{algorithm}:{filepath}"
+    
+    def get(self, filepath: str, file_stat, algorithm: str = 'sha256') -> Optional[bytes]:
+        """
+        Look up the hash of an unchanged file.
+        
+        Args:
+            filepath: Path to the file
+            file_stat: os.stat_result for the file
+            algorithm: Hash algorithm
+        
+        Returns:
+            Cached hash, or None if unknown or the file changed
+        """
+        key = self.file_key(filepath, file_stat, algorithm)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            mtime_ns, size, file_hash = entry
+            if mtime_ns != file_stat.st_mtime_ns or size != file_stat.st_size:
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return file_hash
+    
+    def put(
+        self,
+        filepath: str,
+        file_stat,
+        file_hash: bytes,
+        algorithm: str = 'sha256'
+    ) -> None:
+        """
+        Remember the hash of a file.
+        
+        Args:
+            filepath: Path to the file
+            file_stat: os.stat_result taken before the file was hashed
+            file_hash: Raw digest bytes
+            algorithm: Hash algorithm used
+        """
+        entry = (
+            self.file_key(filepath, file_stat, algorithm),
+            file_stat.st_mtime_ns,
+            file_stat.st_size,
+            file_hash
+        )
+        with self._lock:
+            self._store(entry)
+            self._pending.append(entry)
+    
+    def load(self, entries: Iterable[HashEntry]) -> None:
+        """
+        Populate the cache from persisted entries, oldest first.
+        
+        Args:
+            entries: (file_key, mtime_ns, size, hash) tuples
+        """
+        with self._lock:
+            for entry in entries:
+                self._store(entry)
+    
+    def drain(self) -> List[HashEntry]:
+        """
+        Take the entries added since the last drain.
+        
+        Returns:
+            List of (file_key, mtime_ns, size, hash) tuples
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return pending
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _store(self, entry: HashEntry) -> None:
+        """Insert an entry and evict the least recently used ones (lock held)."""
+        key, mtime_ns, size, file_hash = entry
+        self._entries[key] = (mtime_ns, size, file_hash)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
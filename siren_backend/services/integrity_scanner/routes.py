@@ -12,10 +12,12 @@ Endpoints:
     GET  /api/integrity/scans/<host_id>          - List scans for host
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, request
+from typing import Any, Dict, Iterator
 import logging
-from .scanner import IntegrityScanner
-from utils.common import format_response, format_error, get_timestamp
+import orjson
+from .scanner import IntegrityScanner, HASH_ALGORITHMS
+from utils.common import format_response, format_error, get_timestamp, json_response
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +27,42 @@ integrity_bp = Blueprint('integrity', __name__)
 # Initialize service
 scanner = IntegrityScanner()
 
+def shutdown_integrity_scanner():
+    """Stop the background scan executor."""
+    logger.info("Shutting down Integrity Scanner service...")
+    scanner.shutdown()
+    logger.info("Integrity Scanner service shut down")
+
+
+# Changes serialized per chunk when streaming scan results
+RESULTS_CHUNK_SIZE = 256
+
+
+def _stream_results(scan: Dict[str, Any]) -> Iterator[bytes]:
+    """
+    Serialize a scan record incrementally.
+    
+    The changes list is encoded a chunk at a time, so a large scan is
+    never held as one serialized body alongside the Python objects.
+    
+    Args:
+        scan: Scan record from IntegrityScanner.get_results()
+    
+    Yields:
+        Pieces of the JSON document
+    """
+    changes = scan.get('changes', [])
+    header = {key: value for key, value in scan.items() if key != 'changes'}
+    
+    # Reopen the header object to append the changes array
+    yield orjson.dumps(header)[:-1] + (b',"changes":[' if header else b'"changes":[')
+    
+    for start in range(0, len(changes), RESULTS_CHUNK_SIZE):
+        chunk = orjson.dumps(changes[start:start + RESULTS_CHUNK_SIZE])[1:-1]
+        yield chunk if start == 0 else b',' + chunk
+    
+    yield b']}'
+
 
 @integrity_bp.route('/scan/<host_id>', methods=['POST'])
 def start_scan(host_id):
@@ -35,23 +73,32 @@ def start_scan(host_id):
     
     Request Body (optional):
         {
-            "scan_paths": ["C:\\Windows\\System32", "C:\\Program Files"]
+            "scan_paths": ["C:\\Windows\\System32", "C:\\Program Files"],
+            "algorithm": "sha256"  // or "blake2b" for faster routine scans
         }
     
     Returns:
-        JSON with job_id and status
+        202 with job_id; the scan runs in the background, poll
+        /results/<job_id> until its status is no longer "running"
     """
     try:
         data = request.get_json() if request.is_json else {}
         scan_paths = data.get('scan_paths', None)
+        algorithm = data.get('algorithm', 'sha256')
+        
+        if algorithm not in HASH_ALGORITHMS:
+            return json_response(format_error(
+                f"Unsupported algorithm: {algorithm}",
+                details={'supported': list(HASH_ALGORITHMS)}
+            ), 400)
         
         logger.info(f"Starting integrity scan for host: {host_id}")
-        result = scanner.start_scan(host_id, scan_paths)
-        return jsonify(result), 200
+        result = scanner.start_scan(host_id, scan_paths, algorithm)
+        return json_response(result, 202)
         
     except Exception as e:
         logger.error(f"Error starting scan: {e}")
-        return jsonify(format_error(str(e))), 500
+        return json_response(format_error(str(e)), 500)
 
 
 @integrity_bp.route('/results/<job_id>', methods=['GET'])
@@ -69,13 +116,13 @@ def get_results(job_id):
         result = scanner.get_results(job_id)
         
         if result.get('status') == 'not_found':
-            return jsonify(result), 404
+            return json_response(result, 404)
         
-        return jsonify(result), 200
+        return Response(_stream_results(result), status=200, mimetype='application/json')
         
     except Exception as e:
         logger.error(f"Error fetching results: {e}")
-        return jsonify(format_error(str(e))), 500
+        return json_response(format_error(str(e)), 500)
 
 
 @integrity_bp.route('/baseline/<host_id>', methods=['GET'])
@@ -93,16 +140,16 @@ def get_baseline(host_id):
         baseline = scanner.get_baseline(host_id)
         
         if baseline is None:
-            return jsonify({
+            return json_response({
                 'status': 'not_found',
                 'message': f'No baseline found for {host_id}'
-            }), 404
+            }, 404)
         
-        return jsonify(baseline), 200
+        return json_response(baseline, 200)
         
     except Exception as e:
         logger.error(f"Error fetching baseline: {e}")
-        return jsonify(format_error(str(e))), 500
+        return json_response(format_error(str(e)), 500)
 
 
 @integrity_bp.route('/baseline/<host_id>', methods=['POST'])
@@ -118,11 +165,11 @@ def create_baseline(host_id):
     try:
         logger.info(f"Creating baseline for host: {host_id}")
         result = scanner.create_baseline(host_id)
-        return jsonify(result), 200
+        return json_response(result, 202)
         
     except Exception as e:
         logger.error(f"Error creating baseline: {e}")
-        return jsonify(format_error(str(e))), 500
+        return json_response(format_error(str(e)), 500)
 
 
 @integrity_bp.route('/scans', methods=['GET'])
@@ -141,14 +188,14 @@ def list_scans(host_id=None):
         logger.debug(f"Listing scans for host: {host_id or 'all'}")
         scans = scanner.list_scans(host_id)
         
-        return jsonify({
+        return json_response({
             'scans': scans,
             'count': len(scans)
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Error listing scans: {e}")
-        return jsonify(format_error(str(e))), 500
+        return json_response(format_error(str(e)), 500)
 
 
 @integrity_bp.route('/health', methods=['GET'])
@@ -161,10 +208,10 @@ def health_check():
     Returns:
         JSON with service status
     """
-    return jsonify({
+    return json_response({
         'status': 'healthy',
         'service': 'integrity_scanner',
-        'active_scans': sum(1 for s in scanner.scans.values() if s['status'] == 'running'),
+        'active_scans': sum(1 for s in scanner.list_scans() if s['status'] == 'running'),
         'total_scans': len(scanner.scans),
         'baselines_count': len(scanner.baselines)
-    }), 200
+    }, 200)
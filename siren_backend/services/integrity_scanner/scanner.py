@@ -7,16 +7,308 @@ and deviation detection for monitored Windows hosts.
 
 import os
 import hashlib
+import heapq
 import logging
+import mmap
+import threading
 import uuid
 import json
-from datetime import datetime
+import re
+from collections import Counter
+from functools import lru_cache, partial
+from operator import attrgetter, itemgetter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from utils.common import get_timestamp
+from utils.config import config
+from .baseline_store import BaselineStore
+from .hash_cache import HashCache
+from .snapshot import Snapshot, format_mtime
 
 logger = logging.getLogger(__name__)
 
+# Read size for hashing; large reads keep per-chunk Python overhead low
+# and let each update() run longer with the GIL released
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Maximum files hashed per scan (demo limit)
+MAX_SCAN_FILES = 500
+
+# Maximum files considered for those slots; bounds the walk on huge trees
+MAX_WALK_FILES = 100_000
+
+# Threads hashing files concurrently within a scan
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+# Scans running in the background at once
+SCAN_WORKERS = 4
+
+# Threads listing directories concurrently within a scan
+WALK_WORKERS = min(8, os.cpu_count() or 1)
+
+# Path fragments that make a changed file high or medium risk
+HIGH_RISK_INDICATORS = (
+    'system32\\drivers',
+    'system32\\config',
+    'windows\\system32\\',
+    'startup',
+    'run\\',
+    'temp\\',
+    'public\\'
+)
+
+MEDIUM_RISK_INDICATORS = (
+    'program files',
+    'programdata',
+    'users\\'
+)
+
+# All indicators compiled into one case-insensitive pattern; the named
+# group that matched gives the risk level. The lookahead makes matches
+# zero-width, so overlapping indicators are all reported in one pass.
+RISK_PATTERN = re.compile(
+    '(?=(?P<high>{})|(?P<medium>{}))'.format(
+        '|'.join(map(re.escape, HIGH_RISK_INDICATORS)),
+        '|'.join(map(re.escape, MEDIUM_RISK_INDICATORS))
+    ),
+    re.IGNORECASE
+)
+
+# Severity levels, lowest first
+RISK_LEVELS = ('low', 'medium', 'high')
+
+# A match touching the file name starts at most this far before it
+_INDICATOR_OVERLAP = max(map(len, HIGH_RISK_INDICATORS + MEDIUM_RISK_INDICATORS)) - 1
+
+
+def _match_risk(text: str) -> str:
+    """
+    Classify text against the risk indicator patterns.
+    
+    Args:
+        text: Path or path fragment
+    
+    Returns:
+        Risk level: 'low', 'medium', or 'high'
+    """
+    level = 'low'
+    for match in RISK_PATTERN.finditer(text):
+        if match.lastgroup == 'high':
+            return 'high'
+        level = 'medium'
+    
+    return level
+
+
+@lru_cache(maxsize=4096)
+def _directory_risk(directory: str) -> str:
+    """
+    Risk level of a directory prefix (including its trailing separator).
+    
+    Changes cluster in a few directories, so each one is only matched once.
+    """
+    return _match_risk(directory)
+
+
+# Supported file hash algorithms. SHA-256 is the default for forensic
+# baselines; BLAKE2b (32-byte digest) is a faster option for routine
+# change detection
+HASH_ALGORITHMS = {
+    'sha256': hashlib.sha256,
+    'blake2b': partial(hashlib.blake2b, digest_size=32),
+    'md5': hashlib.md5
+}
+
+# Digest recorded for files that could not be read; never a real digest
+HASH_FAILED = b''
+
+def _hex_digest(digest: bytes) -> str:
+    """Hex-encode a stored digest for scan results."""
+    return digest.hex() if digest != HASH_FAILED else 'hash_failed'
+
+
+# hashlib.file_digest is only available on Python 3.11+
+_file_digest = getattr(hashlib, 'file_digest', None)
+
+# Files above this size are memory-mapped and evicted from the page cache
+# afterwards; one-shot scans would otherwise flush it
+LARGE_FILE_SIZE = 1024 * 1024
+
+# Bytes of a mapped file handed to the hasher per update() call
+MMAP_WINDOW = 64 * 1024 * 1024
+
+# posix_fadvise is unavailable on Windows and macOS
+_posix_fadvise = getattr(os, 'posix_fadvise', None)
+
+# Per-thread read buffers, allocated once per hashing thread
+_hash_buffers = threading.local()
+
+
+def _fadvise(fd: int, advice: str) -> None:
+    """
+    Give the kernel an access-pattern hint for a whole file.
+    
+    Args:
+        fd: Open file descriptor
+        advice: Name of an os.POSIX_FADV_* constant
+    """
+    if _posix_fadvise is None:
+        return
+    try:
+        _posix_fadvise(fd, 0, 0, getattr(os, advice))
+    except (AttributeError, OSError):
+        pass
+
+
+def _hash_stream(f, digest) -> bytes:
+    """
+    Hash an open binary file through this thread's reusable buffer.
+    
+    Args:
+        f: File object opened in binary mode
+        digest: hashlib constructor
+    
+    Returns:
+        Raw digest bytes
+    """
+    view = getattr(_hash_buffers, 'view', None)
+    if view is None:
+        view = _hash_buffers.view = memoryview(bytearray(HASH_CHUNK_SIZE))
+    
+    hasher = digest()
+    while True:
+        size = f.readinto(view)
+        if not size:
+            break
+        hasher.update(view[:size])
+    return hasher.digest()
+
+
+def _hash_mapped(f, digest) -> bytes:
+    """
+    Hash an open file by memory-mapping it.
+    
+    The hasher reads the mapping directly in large windows, with the GIL
+    released, instead of copying the file through a read buffer.
+    
+    Args:
+        f: File object opened in binary mode
+        digest: hashlib constructor
+    
+    Returns:
+        Raw digest bytes
+    """
+    hasher = digest()
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        # madvise is unavailable on Windows
+        if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        
+        with memoryview(mapped) as view:
+            for start in range(0, len(view), MMAP_WINDOW):
+                hasher.update(view[start:start + MMAP_WINDOW])
+    return hasher.digest()
+
+
+def _list_directory(path: str) -> Tuple[List[os.DirEntry], List[str]]:
+    """
+    List one directory without following symlinked subdirectories.
+    
+    Files are returned as DirEntry objects so their stat can be taken
+    later, only for files that are actually scanned: free on Windows,
+    where it is part of the listing, and one stat() elsewhere.
+    
+    Args:
+        path: Directory to list
+    
+    Returns:
+        Tuple of (file entries, subdirectory paths); empty if unreadable
+    """
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                
+                # Like os.walk, symlinked directories are neither files
+                # nor descended into
+                if not is_dir:
+                    files.append(entry)
+                elif not entry.is_symlink():
+                    subdirs.append(entry.path)
+    except OSError as e:
+        logger.debug(f"Cannot list {path}: {e}")
+    return files, subdirs
+
+
+def _dedupe_roots(scan_paths: List[str]) -> List[str]:
+    """
+    Drop scan roots that repeat or lie inside another root.
+    
+    Their files are already reached from the enclosing root; walking them
+    again would offer the same file twice and hash it twice.
+    
+    Args:
+        scan_paths: Root directories
+    
+    Returns:
+        Remaining roots, in their original order
+    """
+    keys = [os.path.normcase(os.path.abspath(path)) for path in scan_paths]
+    
+    roots = []
+    for index, (path, key) in enumerate(zip(scan_paths, keys)):
+        if key in keys[:index]:
+            continue
+        if any(key.startswith(os.path.join(other, '')) for other in keys if other != key):
+            continue
+        roots.append(path)
+    return roots
+
+
+def _walk_files(scan_paths: List[str]) -> Iterator[Tuple[int, os.DirEntry]]:
+    """
+    Walk several directory trees breadth-first.
+    
+    Each level's directories are listed in parallel on one worker pool,
+    but the listings are sorted and consumed in a fixed order, so the
+    files found before the MAX_WALK_FILES bound are the same on every run.
+    
+    Args:
+        scan_paths: Root directories to walk
+    
+    Yields:
+        (root index, file entry) tuples
+    """
+    seen = 0
+    level = list(enumerate(scan_paths))  # [(root index, directory)]
+    
+    with ThreadPoolExecutor(max_workers=WALK_WORKERS) as executor:
+        while level:
+            futures = [executor.submit(_list_directory, path) for _, path in level]
+            next_level = []
+            
+            for (index, _), future in zip(level, futures):
+                found, subdirs = future.result()
+                
+                for entry in sorted(found, key=attrgetter('name')):
+                    if seen >= MAX_WALK_FILES:
+                        # Walk bound reached: drop listings that have not started yet
+                        for pending in futures:
+                            pending.cancel()
+                        return
+                    seen += 1
+                    yield index, entry
+                
+                next_level.extend((index, subdir) for subdir in sorted(subdirs))
+            
+            level = next_level
+
 
 class IntegrityScanner:
     """
@@ -29,22 +321,41 @@ class IntegrityScanner:
     - Deviation detection and severity scoring
     """
     
-    def __init__(self):
-        """Initialize the integrity scanner with in-memory storage."""
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the integrity scanner.
+        
+        Args:
+            db_path: SQLite file for baselines (default: config.BASELINE_DB)
+        """
         self.scans = {}  # Job storage: {job_id: scan_data}
-        self.baselines = {}  # Baseline storage: {host_id: baseline_data}
+        self.baselines = BaselineStore(db_path or config.BASELINE_DB)
+        self._hash_cache = HashCache()
+        self._hash_cache.load(self.baselines.load_file_hashes(self._hash_cache.maxsize))
+        self._lock = threading.Lock()  # Guards self.scans
+        self._executor = ThreadPoolExecutor(
+            max_workers=SCAN_WORKERS,
+            thread_name_prefix='IntegrityScan'
+        )
         logger.info("IntegrityScanner initialized")
     
-    def start_scan(self, host_id: str, scan_paths: Optional[List[str]] = None) -> Dict[str, Any]:
+    def start_scan(
+        self,
+        host_id: str,
+        scan_paths: Optional[List[str]] = None,
+        algorithm: str = 'sha256'
+    ) -> Dict[str, Any]:
         """
         Initiate a baseline integrity scan for a host.
         
         Args:
             host_id: Host identifier (e.g., "WIN-SRV-01")
             scan_paths: Optional list of paths to scan. If None, scans common directories.
+            algorithm: File hash algorithm (a HASH_ALGORITHMS key)
         
         Returns:
-            Dictionary with job_id and initial status
+            Dictionary with job_id and initial status. The scan itself runs
+            in the background; poll get_results() for its outcome.
         """
         job_id = f"scan-{uuid.uuid4().hex[:8]}"
         
@@ -59,35 +370,65 @@ class IntegrityScanner:
             ]
         
         # Initialize scan job
-        self.scans[job_id] = {
-            'job_id': job_id,
-            'host': host_id,
-            'status': 'running',
-            'timestamp': get_timestamp(),
-            'scan_paths': scan_paths,
-            'baseline_score': 100,
-            'changes': [],
-            'files_scanned': 0,
-            'severity': 'low'
-        }
+        with self._lock:
+            self.scans[job_id] = {
+                'job_id': job_id,
+                'host': host_id,
+                'status': 'running',
+                'timestamp': get_timestamp(),
+                'scan_paths': scan_paths,
+                'algorithm': algorithm,
+                'baseline_score': 100,
+                'changes': [],
+                'files_scanned': 0,
+                'severity': 'low'
+            }
         
         logger.info(f"Scan initiated: {job_id} for host {host_id}")
         
-        # Perform the actual scan
-        try:
-            self._execute_scan(job_id, host_id, scan_paths)
-        except Exception as e:
-            logger.error(f"Scan {job_id} failed: {e}")
-            self.scans[job_id]['status'] = 'failed'
-            self.scans[job_id]['error'] = str(e)
+        self._executor.submit(self._run_scan, job_id, host_id, scan_paths, algorithm)
         
         return {
             'job_id': job_id,
-            'status': self.scans[job_id]['status'],
+            'status': 'running',
             'message': f'Scan initiated for {host_id}'
         }
     
-    def _execute_scan(self, job_id: str, host_id: str, scan_paths: List[str]) -> None:
+    def _run_scan(
+        self,
+        job_id: str,
+        host_id: str,
+        scan_paths: List[str],
+        algorithm: str
+    ) -> None:
+        """
+        Background task: perform the scan and record failures on the job.
+        
+        Args:
+            job_id: Scan job identifier
+            host_id: Host being scanned
+            scan_paths: Paths to scan
+            algorithm: File hash algorithm
+        """
+        try:
+            self._execute_scan(job_id, host_id, scan_paths, algorithm)
+        except Exception as e:
+            logger.error(f"Scan {job_id} failed: {e}")
+            with self._lock:
+                self.scans[job_id]['status'] = 'failed'
+                self.scans[job_id]['error'] = str(e)
+    
+    def shutdown(self) -> None:
+        """Stop accepting scans; running scans are left to finish."""
+        self._executor.shutdown(wait=False)
+    
+    def _execute_scan(
+        self,
+        job_id: str,
+        host_id: str,
+        scan_paths: List[str],
+        algorithm: str = 'sha256'
+    ) -> None:
         """
         Execute the actual file system scan.
         
@@ -95,12 +436,20 @@ class IntegrityScanner:
             job_id: Scan job identifier
             host_id: Host being scanned
             scan_paths: Paths to scan
+            algorithm: File hash algorithm
         """
-        current_snapshot = {}
-        files_scanned = 0
         changes = []
         
-        # Scan each path
+        # Hashes from different algorithms can never match
+        baseline = self.baselines.get(host_id)
+        if baseline is not None and baseline['algorithm'] != algorithm:
+            raise ValueError(
+                f"Baseline for {host_id} uses {baseline['algorithm']}, "
+                f"cannot compare a {algorithm} scan"
+            )
+        
+        # Phase 1: collect candidate files from every path
+        existing_paths = []
         for scan_path in scan_paths:
             if not os.path.exists(scan_path):
                 logger.warning(f"Path does not exist: {scan_path}")
@@ -110,94 +459,189 @@ class IntegrityScanner:
                     'severity': 'low'
                 })
                 continue
-            
-            # Scan directory
-            try:
-                for root, dirs, files in os.walk(scan_path):
-                    # Limit depth and file count for performance
-                    if files_scanned >= 500:  # Limit for demo purposes
-                        break
-                    
-                    for file in files:
-                        filepath = os.path.join(root, file)
-                        
-                        try:
-                            # Calculate file hash
-                            file_hash = self._calculate_file_hash(filepath)
-                            file_stat = os.stat(filepath)
-                            
-                            current_snapshot[filepath] = {
-                                'hash': file_hash,
-                                'size': file_stat.st_size,
-                                'modified': datetime.fromtimestamp(file_stat.st_mtime).isoformat()
-                            }
-                            
-                            files_scanned += 1
-                            
-                        except (PermissionError, OSError) as e:
-                            logger.debug(f"Cannot access {filepath}: {e}")
-                            continue
-                    
-                    if files_scanned >= 500:
-                        break
-                        
-            except Exception as e:
-                logger.error(f"Error scanning {scan_path}: {e}")
-                continue
+            existing_paths.append(scan_path)
+        
+        # Scan directories, all paths concurrently
+        try:
+            candidates = self._collect_files(existing_paths, MAX_SCAN_FILES)
+        except Exception as e:
+            logger.error(f"Error scanning {', '.join(existing_paths)}: {e}")
+            candidates = []
+        
+        # Files whose size and mtime match the baseline keep its hash
+        entries = {}
+        to_hash = []
+        baseline_files = (
+            self.baselines.lookup(host_id, [filepath for filepath, _ in candidates])
+            if baseline is not None else {}
+        )
+        for filepath, file_stat in candidates:
+            known = baseline_files.get(filepath)
+            if (
+                known is not None
+                and known[0] != HASH_FAILED
+                and known[1] == file_stat.st_size
+                and known[2] == format_mtime(file_stat.st_mtime)
+            ):
+                entries[filepath] = (known[0], file_stat.st_size, file_stat.st_mtime)
+            else:
+                to_hash.append((filepath, file_stat))
+        
+        # Phase 2: hash the rest. hashlib releases the GIL while hashing,
+        # so files are processed in parallel across worker threads
+        paths = [filepath for filepath, _ in to_hash]
+        stats = [file_stat for _, file_stat in to_hash]
+        snapshot_file = partial(self._snapshot_file, algorithm=algorithm)
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+            entries.update(zip(paths, executor.map(snapshot_file, paths, stats)))
+        
+        current_snapshot = Snapshot()
+        for filepath, _ in candidates:
+            entry = entries.get(filepath)
+            if entry is not None:
+                current_snapshot.append(filepath, *entry)
+        
+        # Keep newly hashed files for the next scan, including after a restart
+        new_hashes = self._hash_cache.drain()
+        if new_hashes:
+            self.baselines.save_file_hashes(new_hashes)
+        
+        files_scanned = len(current_snapshot)
         
         # Compare with baseline if exists
-        if host_id in self.baselines:
+        if baseline is not None:
             changes = self._compare_with_baseline(host_id, current_snapshot)
         else:
             # First scan - create baseline
             logger.info(f"Creating initial baseline for {host_id}")
-            self.baselines[host_id] = {
-                'host_id': host_id,
-                'created_at': get_timestamp(),
-                'snapshot': current_snapshot,
-                'file_count': len(current_snapshot)
-            }
+            self.baselines.save(host_id, get_timestamp(), current_snapshot, algorithm)
         
         # Calculate baseline score and severity
         baseline_score = 100 - min(len(changes) * 2, 30)  # Deduct 2 points per change, max 30
         severity = self._calculate_severity(changes)
         
         # Update scan job with results
-        self.scans[job_id].update({
-            'status': 'completed',
-            'files_scanned': files_scanned,
-            'changes': changes,
-            'baseline_score': baseline_score,
-            'severity': severity,
-            'completed_at': get_timestamp()
-        })
+        with self._lock:
+            self.scans[job_id].update({
+                'status': 'completed',
+                'files_scanned': files_scanned,
+                'changes': changes,
+                'baseline_score': baseline_score,
+                'severity': severity,
+                'completed_at': get_timestamp()
+            })
         
         logger.info(f"Scan {job_id} completed: {len(changes)} changes detected, score: {baseline_score}")
     
-    def _calculate_file_hash(self, filepath: str, algorithm: str = 'sha256') -> str:
+    def _collect_files(
+        self,
+        scan_paths: List[str],
+        limit: int
+    ) -> List[Tuple[str, os.stat_result]]:
+        """
+        Walk several directory trees and pick the riskiest files to scan.
+        
+        Every file found is classified by path risk and only the `limit`
+        most important are kept, so the scan's slots go to high-risk files
+        rather than to whichever directories happened to be listed first.
+        Ties keep the earlier root, then the lower path, so the selection
+        does not depend on the order in which listings complete.
+        
+        Args:
+            scan_paths: Root directories to walk
+            limit: Maximum number of files to return
+        
+        Returns:
+            List of (file path, stat) tuples, by root then path
+        """
+        # (-risk rank, root index, path, entry): the smallest keys are the
+        # most important files; nsmallest holds only `limit` at a time
+        candidates = (
+            (-RISK_LEVELS.index(self._assess_file_risk(entry.path)), index, entry.path, entry)
+            for index, entry in _walk_files(_dedupe_roots(scan_paths))
+        )
+        selected = heapq.nsmallest(limit, candidates, key=itemgetter(0, 1, 2))
+        
+        files = []
+        for _, _, _, entry in sorted(selected, key=itemgetter(1, 2)):
+            try:
+                files.append((entry.path, entry.stat()))
+            except OSError:
+                # Vanished or dangling symlink; os.stat would fail too
+                continue
+        return files
+    
+    def _snapshot_file(
+        self,
+        filepath: str,
+        file_stat: os.stat_result,
+        algorithm: str = 'sha256'
+    ) -> Optional[Tuple[bytes, int, float]]:
+        """
+        Hash a single file for the scan snapshot.
+        
+        Args:
+            filepath: Path to file
+            file_stat: Stat taken while listing the file's directory
+            algorithm: File hash algorithm
+        
+        Returns:
+            Tuple of (hash, size, mtime), or None if the file has disappeared
+        """
+        # Unchanged files (same inode, mtime and size) are not read again
+        file_hash = self._hash_cache.get(filepath, file_stat, algorithm)
+        if file_hash is None:
+            file_hash = self._calculate_file_hash(filepath, algorithm)
+            if file_hash != HASH_FAILED:
+                self._hash_cache.put(filepath, file_stat, file_hash, algorithm)
+            elif not os.path.exists(filepath):
+                # Deleted since it was listed; report it like an unlisted file
+                logger.debug(f"Cannot access {filepath}: file disappeared")
+                return None
+        
+        return file_hash, file_stat.st_size, file_stat.st_mtime
+    
+    def _calculate_file_hash(self, filepath: str, algorithm: str = 'sha256') -> bytes:
         """
         Calculate hash of a file.
         
         Args:
             filepath: Path to file
-            algorithm: Hash algorithm (md5, sha256)
+            algorithm: Hash algorithm (a HASH_ALGORITHMS key)
         
         Returns:
-            Hexadecimal hash string
+            Raw digest bytes, or HASH_FAILED if the file cannot be read
         """
-        hasher = hashlib.sha256() if algorithm == 'sha256' else hashlib.md5()
+        digest = HASH_ALGORITHMS[algorithm]
         
         try:
             with open(filepath, 'rb') as f:
-                # Read in chunks for large files
-                for chunk in iter(lambda: f.read(8192), b''):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
+                fd = f.fileno()
+                
+                if os.fstat(fd).st_size <= LARGE_FILE_SIZE:
+                    # Start readahead for the whole file before hashing it
+                    _fadvise(fd, 'POSIX_FADV_WILLNEED')
+                    
+                    # hashlib's OpenSSL backend already uses SHA-NI where the
+                    # CPU has it; file_digest (3.11+) keeps the read loop in C
+                    if _file_digest is not None:
+                        return _file_digest(f, digest).digest()
+                    return _hash_stream(f, digest)
+                
+                try:
+                    return _hash_mapped(f, digest)
+                except (OSError, ValueError):
+                    # Not mappable (e.g. special files); read it instead
+                    _fadvise(fd, 'POSIX_FADV_SEQUENTIAL')
+                    f.seek(0)
+                    return _hash_stream(f, digest)
+                finally:
+                    _fadvise(fd, 'POSIX_FADV_DONTNEED')
         except Exception as e:
             logger.debug(f"Cannot hash {filepath}: {e}")
-            return "hash_failed"
+            return HASH_FAILED
     
-    def _compare_with_baseline(self, host_id: str, current_snapshot: Dict) -> List[Dict]:
+    def _compare_with_baseline(self, host_id: str, current_snapshot: Snapshot) -> List[Dict]:
         """
         Compare current snapshot with baseline.
         
@@ -209,39 +653,35 @@ class IntegrityScanner:
             List of detected changes
         """
         changes = []
-        baseline_snapshot = self.baselines[host_id]['snapshot']
+        changed, deleted = self.baselines.diff(host_id, current_snapshot)
         
-        # Check for new or modified files
-        for filepath, current_data in current_snapshot.items():
-            if filepath not in baseline_snapshot:
-                # New file detected
-                severity = self._assess_file_risk(filepath)
+        # New or modified files
+        for filepath, file_hash, previous_hash in changed:
+            severity = self._assess_file_risk(filepath)
+            if previous_hash is None:
                 changes.append({
                     'path': filepath,
                     'change': 'new',
-                    'hash': current_data['hash'],
+                    'hash': _hex_digest(file_hash),
                     'severity': severity
                 })
-            elif current_data['hash'] != baseline_snapshot[filepath]['hash']:
-                # Modified file detected
-                severity = self._assess_file_risk(filepath)
+            else:
                 changes.append({
                     'path': filepath,
                     'change': 'modified',
-                    'hash': current_data['hash'],
-                    'previous_hash': baseline_snapshot[filepath]['hash'],
+                    'hash': _hex_digest(file_hash),
+                    'previous_hash': _hex_digest(previous_hash),
                     'severity': severity
                 })
         
-        # Check for deleted files
-        for filepath in baseline_snapshot:
-            if filepath not in current_snapshot:
-                severity = self._assess_file_risk(filepath)
-                changes.append({
-                    'path': filepath,
-                    'change': 'deleted',
-                    'severity': severity
-                })
+        # Deleted files
+        for filepath in deleted:
+            severity = self._assess_file_risk(filepath)
+            changes.append({
+                'path': filepath,
+                'change': 'deleted',
+                'severity': severity
+            })
         
         return changes
     
@@ -255,35 +695,15 @@ class IntegrityScanner:
         Returns:
             Risk level: 'low', 'medium', or 'high'
         """
-        filepath_lower = filepath.lower()
-        
-        # High-risk paths
-        high_risk_indicators = [
-            'system32\\drivers',
-            'system32\\config',
-            'windows\\system32\\',
-            'startup',
-            'run\\',
-            'temp\\',
-            'public\\'
-        ]
-        
-        # Medium-risk paths
-        medium_risk_indicators = [
-            'program files',
-            'programdata',
-            'users\\'
-        ]
-        
-        for indicator in high_risk_indicators:
-            if indicator in filepath_lower:
-                return 'high'
-        
-        for indicator in medium_risk_indicators:
-            if indicator in filepath_lower:
-                return 'medium'
-        
-        return 'low'
+        split = max(filepath.rfind('\\'), filepath.rfind('/')) + 1
+        
+        directory_risk = _directory_risk(filepath[:split])
+        if directory_risk == 'high':
+            return 'high'
+        
+        # Only matches overlapping the file name remain to be checked
+        name_risk = _match_risk(filepath[max(0, split - _INDICATOR_OVERLAP):])
+        return max(directory_risk, name_risk, key=RISK_LEVELS.index)
     
     def _calculate_severity(self, changes: List[Dict]) -> str:
         """
@@ -298,8 +718,9 @@ class IntegrityScanner:
         if not changes:
             return 'low'
         
-        high_severity_count = sum(1 for c in changes if c.get('severity') == 'high')
-        medium_severity_count = sum(1 for c in changes if c.get('severity') == 'medium')
+        severity_counts = Counter(c.get('severity') for c in changes)
+        high_severity_count = severity_counts['high']
+        medium_severity_count = severity_counts['medium']
         
         if high_severity_count >= 3 or len(changes) >= 10:
             return 'high'
@@ -318,15 +739,19 @@ class IntegrityScanner:
         Returns:
             Dictionary with scan results
         """
-        if job_id not in self.scans:
-            logger.warning(f"Scan job not found: {job_id}")
-            return {
-                'job_id': job_id,
-                'status': 'not_found',
-                'message': 'Scan job not found'
-            }
+        with self._lock:
+            scan = self.scans.get(job_id)
+            
+            # Copy so a finishing scan does not change the record mid-response
+            if scan is not None:
+                return dict(scan)
         
-        return self.scans[job_id]
+        logger.warning(f"Scan job not found: {job_id}")
+        return {
+            'job_id': job_id,
+            'status': 'not_found',
+            'message': 'Scan job not found'
+        }
     
     def get_baseline(self, host_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -338,16 +763,7 @@ class IntegrityScanner:
         Returns:
             Baseline data or None if not found
         """
-        if host_id not in self.baselines:
-            return None
-        
-        baseline = self.baselines[host_id]
-        return {
-            'host_id': baseline['host_id'],
-            'created_at': baseline['created_at'],
-            'file_count': baseline['file_count'],
-            'last_scan': baseline.get('last_scan', baseline['created_at'])
-        }
+        return self.baselines.get(host_id)
     
     def create_baseline(self, host_id: str) -> Dict[str, Any]:
         """
@@ -378,8 +794,11 @@ class IntegrityScanner:
         Returns:
             List of scan job summaries
         """
+        with self._lock:
+            all_scans = list(self.scans.values())
+        
         scans = []
-        for job_id, scan in self.scans.items():
+        for scan in all_scans:
             if host_id is None or scan['host'] == host_id:
                 scans.append({
                     'job_id': scan['job_id'],
@@ -390,4 +809,5 @@ class IntegrityScanner:
                     'changes_count': len(scan.get('changes', []))
                 })
         
-        return sorted(scans, key=lambda x: x['timestamp'], reverse=True)
+        scans.sort(key=itemgetter('timestamp'), reverse=True)
+        return scans
@@ -0,0 +1,71 @@
+"""
+Snapshot - Column-oriented file snapshot for integrity scans
+
+A scan can cover thousands of files. Keeping one dict per file costs far
+more memory than the data itself, so the snapshot stores each field in
+its own list instead, with one index per file.
+"""
+
+from datetime import datetime
+from typing import Iterator, List, Tuple
+
+
+def format_mtime(mtime: float) -> str:
+    """
+    Format a modification time the way baselines store it.
+    
+    Args:
+        mtime: Seconds since the epoch
+    
+    Returns:
+        ISO 8601 local timestamp
+    """
+    return datetime.fromtimestamp(mtime).isoformat()
+
+
+class Snapshot:
+    """
+    Parallel lists of path, hash, size and mtime for scanned files.
+    
+    Paths are unique; adding a path a second time is ignored.
+    """
+    
+    __slots__ = ('paths', 'hashes', 'sizes', 'mtimes', '_seen')
+    
+    def __init__(self):
+        """Initialize an empty snapshot."""
+        self.paths: List[str] = []
+        self.hashes: List[bytes] = []
+        self.sizes: List[int] = []
+        self.mtimes: List[float] = []
+        self._seen = set()
+    
+    def append(self, path: str, file_hash: bytes, size: int, mtime: float) -> None:
+        """
+        Add a file to the snapshot.
+        
+        Args:
+            path: File path
+            file_hash: Raw content digest
+            size: File size in bytes
+            mtime: Modification time (seconds since the epoch)
+        """
+        if path in self._seen:
+            return
+        self._seen.add(path)
+        self.paths.append(path)
+        self.hashes.append(file_hash)
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+    
+    def __len__(self) -> int:
+        return len(self.paths)
+    
+    def rows(self) -> Iterator[Tuple[str, bytes, int, float]]:
+        """
+        Iterate over files in insertion order.
+        
+        Returns:
+            Iterator of (path, hash, size, mtime) tuples
+        """
+        return zip(self.paths, self.hashes, self.sizes, self.mtimes)
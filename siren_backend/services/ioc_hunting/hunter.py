@@ -6,15 +6,183 @@ monitored hosts including file hashes, IP addresses, domains, and URLs.
 """
 
 import logging
-import uuid
+import orjson
+import threading
+import secrets
 import re
+import socket
+import sys
 import hashlib
-from typing import Dict, List, Any, Optional
+from itertools import chain, count
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from utils.common import get_timestamp
+from utils.config import config
 
 logger = logging.getLogger(__name__)
 
+VALID_IOC_TYPES = ('file_hash', 'ip_address', 'domain', 'url', 'email')
+MAX_BULK_IOCS = 10_000  # IOCs accepted in a single bulk hunt
+HUNT_WORKERS = 8  # Hunts executed concurrently in the background
+
+# IOC value formats, compiled once at import
+_HASH_RE = re.compile(r'[a-fA-F0-9]{32}|[a-fA-F0-9]{64}')  # MD5 or SHA256 hex
+_URL_RE = re.compile(r'^https?://')
+
+# Character sets for the domain and email checks (ASCII only; str.isalnum
+# would also accept other Unicode letters and digits)
+_ALPHA = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
+_ALNUM = _ALPHA | frozenset('0123456789')
+_LABEL_CHARS = _ALNUM | frozenset('-')
+_EMAIL_LOCAL_CHARS = _ALNUM | frozenset('._%+-')
+_EMAIL_DOMAIN_CHARS = _ALNUM | frozenset('.-')
+
+# IOC types compared case-insensitively; hashes and IPs must match exactly
+_CASE_INSENSITIVE_TYPES = frozenset(('domain', 'email', 'url'))
+
+
+def _is_file_hash(value: str) -> bool:
+    """Check for an MD5 (32 chars) or SHA256 (64 chars) hex digest."""
+    return _HASH_RE.fullmatch(value) is not None
+
+
+def _is_ipv4(value: str) -> bool:
+    """
+    Check for a dotted-quad IPv4 address.
+    
+    Parsed in C; unlike inet_aton this rejects shorthand ("10.1"),
+    hex/octal octets and trailing garbage.
+    
+    Args:
+        value: Candidate address
+    
+    Returns:
+        True if valid, False otherwise
+    """
+    try:
+        socket.inet_pton(socket.AF_INET, value)
+    except (OSError, ValueError):  # ValueError: embedded NUL
+        return False
+    return True
+
+
+def _is_url(value: str) -> bool:
+    """Check for an http(s) URL."""
+    return _URL_RE.match(value) is not None
+
+
+def _is_tld(value: str) -> bool:
+    """Check for a top-level domain: at least two ASCII letters."""
+    return len(value) >= 2 and _ALPHA.issuperset(value)
+
+
+def _is_domain(value: str) -> bool:
+    """
+    Check for a domain name such as "evil.example.com".
+    
+    Each label is 1-63 letters, digits or hyphens and does not start or
+    end with a hyphen; the last label is an alphabetic TLD.
+    
+    Args:
+        value: Candidate domain
+    
+    Returns:
+        True if valid, False otherwise
+    """
+    if len(value) > 253:
+        return False
+    
+    labels = value.split('.')
+    if len(labels) < 2 or not _is_tld(labels[-1]):
+        return False
+    
+    for label in labels[:-1]:
+        if not 0 < len(label) <= 63 or label[0] == '-' or label[-1] == '-':
+            return False
+        if not _LABEL_CHARS.issuperset(label):
+            return False
+    
+    return True
+
+
+def _is_email(value: str) -> bool:
+    """
+    Check for an email address such as "user@example.com".
+    
+    Args:
+        value: Candidate address
+    
+    Returns:
+        True if valid, False otherwise
+    """
+    local, at, domain = value.partition('@')
+    if not at or not local or not _EMAIL_LOCAL_CHARS.issuperset(local):
+        return False
+    
+    host, dot, tld = domain.rpartition('.')
+    return bool(dot and host) and _EMAIL_DOMAIN_CHARS.issuperset(host) and _is_tld(tld)
+
+
+def _ioc_key(ioc_type: str, ioc_value: str) -> Tuple[str, str]:
+    """
+    Build the evidence index key for an IOC.
+    
+    Args:
+        ioc_type: Type of IOC
+        ioc_value: IOC value
+    
+    Returns:
+        (ioc_type, normalized value) tuple
+    """
+    if ioc_type in _CASE_INSENSITIVE_TYPES:
+        return ioc_type, ioc_value.casefold()
+    return ioc_type, ioc_value
+
+
+# Value format check per IOC type
+_IOC_VALIDATORS: Dict[str, Callable[[str], bool]] = {
+    'file_hash': _is_file_hash,
+    'ip_address': _is_ipv4,
+    'domain': _is_domain,
+    'url': _is_url,
+    'email': _is_email
+}
+
+
+class Evidence:
+    """
+    One indicator observed on a host.
+    
+    A slotted object rather than a dict: the evidence store holds one per
+    observation, and slots keep each to four attribute pointers. The IOC
+    type is interned, so all items share the same few type strings.
+    """
+    
+    __slots__ = ('ioc_type', 'value', 'location', 'timestamp')
+    
+    def __init__(self, ioc_type: str, value: str, location: str, timestamp: str):
+        self.ioc_type = sys.intern(ioc_type)
+        self.value = value
+        self.location = location
+        self.timestamp = timestamp
+    
+    def to_dict(self) -> Dict[str, str]:
+        """
+        Convert to the API representation.
+        
+        Returns:
+            Dictionary with type, value, location and timestamp
+        """
+        return {
+            'type': self.ioc_type,
+            'value': self.value,
+            'location': self.location,
+            'timestamp': self.timestamp
+        }
+
 
 class IOCHunter:
     """
@@ -30,17 +198,28 @@ class IOCHunter:
     
     def __init__(self):
         """Initialize the IOC hunter with mock data store."""
-        self.hunts = {}  # Hunt job storage
+        self.hunts = OrderedDict()  # Hunt job storage, oldest first
+        self._running = 0  # Hunts in self.hunts with status 'running'
+        self._results_json = {}  # {hunt_id: serialized record} for finished hunts
+        # Hunt IDs count up from a random 32-bit start, so they are unique
+        # within the process and unlikely to repeat across restarts
+        self._hunt_ids = count(int.from_bytes(secrets.token_bytes(4), 'big'))
+        self._lock = threading.Lock()  # Guards the above, self.host_evidence and self._index
+        self._executor = ThreadPoolExecutor(
+            max_workers=HUNT_WORKERS,
+            thread_name_prefix='IOCHunt'
+        )
+        self._index = defaultdict(list)  # {(ioc_type, normalized value): [(host, evidence)]}
         self.host_evidence = self._generate_mock_evidence()  # Mock evidence database
         logger.info("IOCHunter initialized")
     
-    def _generate_mock_evidence(self) -> Dict[str, List[Dict]]:
+    def _generate_mock_evidence(self) -> Dict[str, Dict[str, List[Evidence]]]:
         """
         Generate mock evidence database for testing.
         In production, this would query actual host agents or SIEM.
         
         Returns:
-            Dictionary mapping hosts to evidence items
+            Dictionary mapping hosts to evidence items, sharded by IOC type
         """
         # Simulated evidence from various hosts
         evidence_db = {
@@ -82,7 +261,26 @@ class IOCHunter:
             ]
         }
         
-        return evidence_db
+        # {host: {ioc_type: [Evidence]}}, creating shards on first use
+        host_evidence = defaultdict(partial(defaultdict, list))
+        for host, evidence_list in evidence_db.items():
+            host_map = host_evidence[host]
+            for item in evidence_list:
+                evidence = Evidence(item['type'], item['value'], item['location'], item['timestamp'])
+                host_map[evidence.ioc_type].append(evidence)
+                self._index_evidence(host, evidence)
+        
+        return host_evidence
+    
+    def _index_evidence(self, host: str, evidence: Evidence) -> None:
+        """
+        Add an evidence item to the (type, value) lookup index.
+        
+        Args:
+            host: Host the evidence was found on
+            evidence: Evidence item
+        """
+        self._index[_ioc_key(evidence.ioc_type, evidence.value)].append((host, evidence))
     
     def start_hunt(self, ioc_type: str, ioc_value: str) -> Dict[str, Any]:
         """
@@ -93,90 +291,207 @@ class IOCHunter:
             ioc_value: Value to search for
         
         Returns:
-            Dictionary with hunt_id and status
+            Dictionary with hunt_id and initial status. The hunt itself runs
+            in the background; poll get_results() for its matches.
         """
-        hunt_id = f"hunt-{uuid.uuid4().hex[:8]}"
+        hunt_id = self._next_hunt_id()
         
-        # Validate IOC type
-        valid_types = ['file_hash', 'ip_address', 'domain', 'url', 'email']
-        if ioc_type not in valid_types:
-            logger.warning(f"Invalid IOC type: {ioc_type}")
+        error = self._check_ioc(ioc_type, ioc_value)
+        if error:
             return {
                 'status': 'error',
-                'message': f'Invalid IOC type. Must be one of: {", ".join(valid_types)}'
+                'message': error
             }
         
-        # Validate IOC value format
-        if not self._validate_ioc_format(ioc_type, ioc_value):
-            logger.warning(f"Invalid IOC value format: {ioc_value}")
+        # Initialize hunt job
+        self._add_hunt({
+            'hunt_id': hunt_id,
+            'ioc_type': ioc_type,
+            'ioc_value': ioc_value,
+            'status': 'running',
+            'matches': []
+        })
+        
+        logger.info(f"Hunt started: {hunt_id} for {ioc_type}={ioc_value}")
+        
+        self._executor.submit(self._run_hunt, hunt_id, self._execute_hunt, ioc_type, ioc_value)
+        
+        return {
+            'hunt_id': hunt_id,
+            'status': 'running'
+        }
+    
+    def start_bulk_hunt(self, iocs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Hunt for many IOCs (e.g. a threat intel feed) in a single job.
+        
+        Each IOC is resolved through the evidence index, so the cost grows
+        with the number of IOCs and matches rather than IOCs x evidence.
+        
+        Args:
+            iocs: List of {'ioc_type': ..., 'ioc_value': ...} dictionaries
+        
+        Returns:
+            Dictionary with hunt_id, initial status and any rejected IOCs.
+            The hunt runs in the background like start_hunt().
+        """
+        if len(iocs) > MAX_BULK_IOCS:
             return {
                 'status': 'error',
-                'message': f'Invalid {ioc_type} format'
+                'message': f'Too many IOCs (maximum {MAX_BULK_IOCS})'
             }
         
-        # Initialize hunt job
-        self.hunts[hunt_id] = {
+        accepted = {}
+        rejected = []
+        for ioc in iocs:
+            ioc_type = ioc.get('ioc_type') if isinstance(ioc, dict) else None
+            ioc_value = ioc.get('ioc_value') if isinstance(ioc, dict) else None
+            error = self._check_ioc(ioc_type, ioc_value)
+            if error:
+                rejected.append({'ioc': ioc, 'error': error})
+            else:
+                accepted.setdefault(_ioc_key(ioc_type, ioc_value), (ioc_type, ioc_value))
+        
+        if not accepted:
+            return {
+                'status': 'error',
+                'message': 'No valid IOCs to hunt',
+                'rejected': rejected
+            }
+        
+        hunt_id = self._next_hunt_id()
+        ioc_list = list(accepted.values())
+        
+        self._add_hunt({
             'hunt_id': hunt_id,
-            'ioc_type': ioc_type,
-            'ioc_value': ioc_value,
+            'ioc_type': 'bulk',
+            'ioc_value': f'{len(ioc_list)} IOCs',
+            'iocs': [{'ioc_type': t, 'ioc_value': v} for t, v in ioc_list],
             'status': 'running',
-            'started_at': get_timestamp(),
             'matches': []
+        })
+        
+        logger.info(f"Bulk hunt started: {hunt_id} for {len(ioc_list)} IOCs ({len(rejected)} rejected)")
+        
+        self._executor.submit(self._run_hunt, hunt_id, self._execute_bulk_hunt, ioc_list)
+        
+        return {
+            'hunt_id': hunt_id,
+            'status': 'running',
+            'ioc_count': len(ioc_list),
+            'rejected': rejected
         }
+    
+    def _next_hunt_id(self) -> str:
+        """Allocate a hunt ID ("hunt-" + 8 hex digits)."""
+        return f"hunt-{next(self._hunt_ids) & 0xFFFFFFFF:08x}"
+    
+    def _add_hunt(self, hunt: Dict[str, Any]) -> None:
+        """
+        Record a new hunt job, stamping its start time.
         
-        logger.info(f"Hunt started: {hunt_id} for {ioc_type}={ioc_value}")
+        Once more than config.IOC_MAX_HUNTS hunts are kept, the oldest
+        finished ones are dropped; running hunts are never evicted.
         
-        # Execute the hunt
+        Args:
+            hunt: Hunt job record (without started_at)
+        """
+        with self._lock:
+            hunt['started_at'] = get_timestamp()
+            self.hunts[hunt['hunt_id']] = hunt
+            self._running += 1
+            
+            excess = len(self.hunts) - config.IOC_MAX_HUNTS
+            if excess > 0:
+                evict = []
+                for hunt_id, job in self.hunts.items():
+                    if job['status'] != 'running':
+                        evict.append(hunt_id)
+                        if len(evict) == excess:
+                            break
+                for hunt_id in evict:
+                    del self.hunts[hunt_id]
+                    self._results_json.pop(hunt_id, None)
+    
+    def _run_hunt(self, hunt_id: str, execute: Callable[..., None], *args: Any) -> None:
+        """
+        Background task: run a hunt and record failures on the job.
+        
+        Args:
+            hunt_id: Hunt job identifier
+            execute: Hunt implementation, called as execute(hunt_id, *args)
+            *args: Arguments for the hunt implementation
+        """
         try:
-            self._execute_hunt(hunt_id, ioc_type, ioc_value)
+            execute(hunt_id, *args)
         except Exception as e:
             logger.error(f"Hunt {hunt_id} failed: {e}")
-            self.hunts[hunt_id]['status'] = 'failed'
-            self.hunts[hunt_id]['error'] = str(e)
+            self._finish_hunt(hunt_id, {'status': 'failed', 'error': str(e)})
+    
+    def _finish_hunt(self, hunt_id: str, outcome: Dict[str, Any]) -> None:
+        """
+        Move a running hunt to its final state.
         
-        return {
-            'hunt_id': hunt_id,
-            'status': self.hunts[hunt_id]['status']
-        }
+        A finished hunt no longer changes, so its record is serialized once
+        here and served as-is by get_results_json().
+        
+        Args:
+            hunt_id: Hunt job identifier
+            outcome: Fields to set on the job, including the new status
+        """
+        with self._lock:
+            hunt = self.hunts[hunt_id]
+            if hunt['status'] == 'running':
+                self._running -= 1
+            hunt.update(outcome)
+            record = dict(hunt)
+        
+        # Serialize outside the lock; the record may hold many matches
+        body = orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS)
+        with self._lock:
+            if hunt_id in self.hunts:
+                self._results_json[hunt_id] = body
     
-    def _validate_ioc_format(self, ioc_type: str, ioc_value: str) -> bool:
+    def shutdown(self) -> None:
+        """Stop accepting hunts; running hunts are left to finish."""
+        self._executor.shutdown(wait=False)
+    
+    def _check_ioc(self, ioc_type: Any, ioc_value: Any) -> Optional[str]:
         """
-        Validate IOC value format.
+        Validate an IOC's type and value.
         
         Args:
             ioc_type: Type of IOC
             ioc_value: Value to validate
         
         Returns:
-            True if valid, False otherwise
+            Error message, or None if the IOC is valid
         """
-        if ioc_type == 'file_hash':
-            # MD5 (32 chars) or SHA256 (64 chars) hex
-            return bool(re.match(r'^[a-fA-F0-9]{32}$|^[a-fA-F0-9]{64}$', ioc_value))
-        
-        elif ioc_type == 'ip_address':
-            # Basic IPv4 validation
-            parts = ioc_value.split('.')
-            if len(parts) != 4:
-                return False
-            try:
-                return all(0 <= int(part) <= 255 for part in parts)
-            except ValueError:
-                return False
+        if ioc_type not in VALID_IOC_TYPES:
+            logger.warning(f"Invalid IOC type: {ioc_type}")
+            return f'Invalid IOC type. Must be one of: {", ".join(VALID_IOC_TYPES)}'
         
-        elif ioc_type == 'domain':
-            # Basic domain validation
-            return bool(re.match(r'^[a-zA-Z0-9][a-zA-Z0-9-]{0,61}[a-zA-Z0-9]?\.[a-zA-Z]{2,}$', ioc_value))
+        if not isinstance(ioc_value, str) or not self._validate_ioc_format(ioc_type, ioc_value):
+            logger.warning(f"Invalid IOC value format: {ioc_value}")
+            return f'Invalid {ioc_type} format'
         
-        elif ioc_type == 'url':
-            # Basic URL validation
-            return bool(re.match(r'^https?://', ioc_value))
+        return None
+    
+    def _validate_ioc_format(self, ioc_type: str, ioc_value: str) -> bool:
+        """
+        Validate IOC value format.
         
-        elif ioc_type == 'email':
-            # Basic email validation
-            return bool(re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', ioc_value))
+        Args:
+            ioc_type: Type of IOC
+            ioc_value: Value to validate
         
-        return True  # Default to valid for unknown types
+        Returns:
+            True if valid, False otherwise
+        """
+        validator = _IOC_VALIDATORS.get(ioc_type)
+        if validator is None:
+            return True  # Default to valid for unknown types
+        return validator(ioc_value)
     
     def _execute_hunt(self, hunt_id: str, ioc_type: str, ioc_value: str) -> None:
         """
@@ -187,27 +502,59 @@ class IOCHunter:
             ioc_type: Type of IOC
             ioc_value: Value to search for
         """
+        self._complete_hunt(hunt_id, self._find_matches(ioc_type, ioc_value))
+    
+    def _execute_bulk_hunt(self, hunt_id: str, iocs: List[Tuple[str, str]]) -> None:
+        """
+        Execute a bulk IOC hunt across hosts.
+        
+        Args:
+            hunt_id: Hunt job identifier
+            iocs: Validated (ioc_type, ioc_value) pairs, without duplicates
+        """
         matches = []
+        for ioc_type, ioc_value in iocs:
+            matches.extend(self._find_matches(ioc_type, ioc_value))
+        
+        self._complete_hunt(hunt_id, matches)
+    
+    def _find_matches(self, ioc_type: str, ioc_value: str) -> List[Dict[str, Any]]:
+        """
+        Look up evidence matching an IOC by type and normalized value.
         
-        # Search through evidence database
-        for host, evidence_list in self.host_evidence.items():
-            for evidence in evidence_list:
-                # Match on type and value
-                if evidence['type'] == ioc_type:
-                    if self._ioc_matches(evidence['value'], ioc_value, ioc_type):
-                        matches.append({
-                            'host': host,
-                            'evidence': evidence['location'],
-                            'first_seen': evidence['timestamp'],
-                            'confidence': 'high',
-                            'context': {
-                                'ioc_type': ioc_type,
-                                'ioc_value': evidence['value']
-                            }
-                        })
-        
-        # Update hunt with results
-        self.hunts[hunt_id].update({
+        Args:
+            ioc_type: Type of IOC
+            ioc_value: Value to search for
+        
+        Returns:
+            List of match dictionaries
+        """
+        with self._lock:
+            found = list(self._index.get(_ioc_key(ioc_type, ioc_value), ()))
+        
+        return [
+            {
+                'host': host,
+                'evidence': evidence.location,
+                'first_seen': evidence.timestamp,
+                'confidence': 'high',
+                'context': {
+                    'ioc_type': ioc_type,
+                    'ioc_value': evidence.value
+                }
+            }
+            for host, evidence in found
+        ]
+    
+    def _complete_hunt(self, hunt_id: str, matches: List[Dict[str, Any]]) -> None:
+        """
+        Record the results of a finished hunt.
+        
+        Args:
+            hunt_id: Hunt job identifier
+            matches: Matches found
+        """
+        self._finish_hunt(hunt_id, {
             'status': 'completed',
             'matches': matches,
             'completed_at': get_timestamp(),
@@ -217,44 +564,40 @@ class IOCHunter:
         
         logger.info(f"Hunt {hunt_id} completed: {len(matches)} matches found across {len(self.host_evidence)} hosts")
     
-    def _ioc_matches(self, evidence_value: str, search_value: str, ioc_type: str) -> bool:
+    def get_results(self, hunt_id: str) -> Dict[str, Any]:
         """
-        Check if evidence value matches search value.
+        Get hunt results.
         
         Args:
-            evidence_value: Value from evidence
-            search_value: Value being searched for
-            ioc_type: Type of IOC
+            hunt_id: Hunt job identifier
         
         Returns:
-            True if match, False otherwise
+            Dictionary with hunt results
         """
-        # Case-insensitive comparison for most types
-        if ioc_type in ['domain', 'email', 'url']:
-            return evidence_value.lower() == search_value.lower()
+        with self._lock:
+            hunt = self.hunts.get(hunt_id)
+            if hunt is not None:
+                return dict(hunt)
         
-        # Exact match for hashes and IPs
-        return evidence_value == search_value
+        logger.warning(f"Hunt not found: {hunt_id}")
+        return {
+            'hunt_id': hunt_id,
+            'status': 'not_found',
+            'message': 'Hunt job not found'
+        }
     
-    def get_results(self, hunt_id: str) -> Dict[str, Any]:
+    def get_results_json(self, hunt_id: str) -> Optional[bytes]:
         """
-        Get hunt results.
+        Get the serialized record of a finished hunt.
         
         Args:
             hunt_id: Hunt job identifier
         
         Returns:
-            Dictionary with hunt results
+            JSON bytes, or None if the hunt is unknown or still running
         """
-        if hunt_id not in self.hunts:
-            logger.warning(f"Hunt not found: {hunt_id}")
-            return {
-                'hunt_id': hunt_id,
-                'status': 'not_found',
-                'message': 'Hunt job not found'
-            }
-        
-        return self.hunts[hunt_id]
+        with self._lock:
+            return self._results_json.get(hunt_id)
     
     def list_hunts(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -264,10 +607,14 @@ class IOCHunter:
             status: Optional status filter (running, completed, failed)
         
         Returns:
-            List of hunt job summaries
+            List of hunt job summaries, newest first
         """
+        # Hunts are inserted as they start, so reversed order is newest first
+        with self._lock:
+            snapshot = list(self.hunts.values())
+        
         hunts = []
-        for hunt_id, hunt in self.hunts.items():
+        for hunt in reversed(snapshot):
             if status is None or hunt['status'] == status:
                 hunts.append({
                     'hunt_id': hunt['hunt_id'],
@@ -278,7 +625,21 @@ class IOCHunter:
                     'matches_found': hunt.get('matches_found', 0)
                 })
         
-        return sorted(hunts, key=lambda x: x['started_at'], reverse=True)
+        return hunts
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get hunt and host counts without walking the hunt list.
+        
+        Returns:
+            Dictionary with active_hunts, total_hunts and hosts_monitored
+        """
+        with self._lock:
+            return {
+                'active_hunts': self._running,
+                'total_hunts': len(self.hunts),
+                'hosts_monitored': len(self.host_evidence)
+            }
     
     def add_evidence(self, host: str, evidence_type: str, evidence_value: str, location: str) -> Dict[str, Any]:
         """
@@ -291,17 +652,21 @@ class IOCHunter:
             location: Location/context where found
         
         Returns:
-            Confirmation message
+            Confirmation message, or an error if any field is not a string
         """
-        if host not in self.host_evidence:
-            self.host_evidence[host] = []
+        # Validate and build the index key before touching the store, so a
+        # bad item can't be stored without its index entry
+        if not all(isinstance(field, str) for field in (host, evidence_type, evidence_value, location)):
+            return {
+                'status': 'error',
+                'message': 'host, evidence_type, evidence_value and location must be strings'
+            }
         
-        self.host_evidence[host].append({
-            'type': evidence_type,
-            'value': evidence_value,
-            'location': location,
-            'timestamp': get_timestamp()
-        })
+        evidence = Evidence(evidence_type, evidence_value, location, get_timestamp())
+        key = _ioc_key(evidence.ioc_type, evidence.value)
+        with self._lock:
+            self.host_evidence[host][evidence.ioc_type].append(evidence)
+            self._index[key].append((host, evidence))
         
         logger.info(f"Evidence added for {host}: {evidence_type}={evidence_value}")
         
@@ -310,27 +675,29 @@ class IOCHunter:
             'message': f'Evidence added for {host}'
         }
     
-    def get_host_evidence(self, host: str) -> Dict[str, Any]:
+    def get_host_evidence(self, host: str, evidence_type: Optional[str] = None) -> Dict[str, Any]:
         """
         Get all evidence for a specific host.
         
         Args:
             host: Host identifier
+            evidence_type: Optional IOC type filter
         
         Returns:
             Dictionary with evidence list
         """
-        if host not in self.host_evidence:
-            return {
-                'host': host,
-                'evidence': [],
-                'count': 0
-            }
+        # .get() so that looking up an unknown host does not create it
+        with self._lock:
+            host_map = self.host_evidence.get(host, {})
+            if evidence_type is None:
+                evidence = list(chain.from_iterable(host_map.values()))
+            else:
+                evidence = list(host_map.get(evidence_type, ()))
         
         return {
             'host': host,
-            'evidence': self.host_evidence[host],
-            'count': len(self.host_evidence[host])
+            'evidence': [item.to_dict() for item in evidence],
+            'count': len(evidence)
         }
     
     def analyze_ioc_prevalence(self, ioc_type: str, ioc_value: str) -> Dict[str, Any]:
@@ -344,28 +711,24 @@ class IOCHunter:
         Returns:
             Prevalence statistics
         """
-        affected_hosts = []
-        total_occurrences = 0
+        with self._lock:
+            found = list(self._index.get(_ioc_key(ioc_type, ioc_value), ()))
+            total_hosts = len(self.host_evidence)
         
-        for host, evidence_list in self.host_evidence.items():
-            host_count = 0
-            for evidence in evidence_list:
-                if evidence['type'] == ioc_type and self._ioc_matches(evidence['value'], ioc_value, ioc_type):
-                    host_count += 1
-            
-            if host_count > 0:
-                affected_hosts.append({
-                    'host': host,
-                    'occurrences': host_count
-                })
-                total_occurrences += host_count
+        host_counts = Counter(host for host, _ in found)
+        
+        affected_hosts = [
+            {'host': host, 'occurrences': occurrences}
+            for host, occurrences in host_counts.items()
+        ]
+        total_occurrences = len(found)
         
         return {
             'ioc_type': ioc_type,
             'ioc_value': ioc_value,
-            'total_hosts': len(self.host_evidence),
+            'total_hosts': total_hosts,
             'affected_hosts': len(affected_hosts),
             'total_occurrences': total_occurrences,
-            'prevalence_rate': len(affected_hosts) / len(self.host_evidence) if self.host_evidence else 0,
+            'prevalence_rate': len(affected_hosts) / total_hosts if total_hosts else 0,
             'hosts': affected_hosts
         }
@@ -5,6 +5,7 @@ Provides REST API endpoints for hunting Indicators of Compromise.
 
 Endpoints:
     POST /api/ioc/hunt                      - Start IOC hunt
+    POST /api/ioc/hunt/bulk                 - Start hunt for a list of IOCs
     GET  /api/ioc/results/<hunt_id>         - Get hunt results
     GET  /api/ioc/hunts                     - List all hunts
     GET  /api/ioc/evidence/<host>           - Get evidence for host
@@ -12,8 +13,9 @@ Endpoints:
     POST /api/ioc/analyze                   - Analyze IOC prevalence
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, request
 import logging
+from utils.common import json_response
 from .hunter import IOCHunter
 
 logger = logging.getLogger(__name__)
@@ -21,6 +23,12 @@ logger = logging.getLogger(__name__)
 ioc_bp = Blueprint('ioc', __name__)
 hunter = IOCHunter()
 
+def shutdown_ioc_hunter():
+    """Stop the background hunt executor."""
+    logger.info("Shutting down IOC Hunting service...")
+    hunter.shutdown()
+    logger.info("IOC Hunting service shut down")
+
 
 @ioc_bp.route('/hunt', methods=['POST'])
 def start_hunt():
@@ -36,29 +44,68 @@ def start_hunt():
         }
     
     Returns:
-        JSON with hunt_id and status
+        JSON with hunt_id and status (202; the hunt runs in the background)
     """
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'Request body required'}), 400
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not data:
+            return json_response({'error': 'Request body required'}, 400)
         
         ioc_type = data.get('ioc_type')
         ioc_value = data.get('ioc_value')
         
         if not ioc_type or not ioc_value:
-            return jsonify({'error': 'ioc_type and ioc_value are required'}), 400
+            return json_response({'error': 'ioc_type and ioc_value are required'}, 400)
         
         result = hunter.start_hunt(ioc_type, ioc_value)
         
         if result.get('status') == 'error':
-            return jsonify(result), 400
+            return json_response(result, 400)
         
-        return jsonify(result), 200
+        return json_response(result, 202)
         
     except Exception as e:
         logger.error(f"Error starting hunt: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
+
+
+@ioc_bp.route('/hunt/bulk', methods=['POST'])
+def start_bulk_hunt():
+    """
+    POST /api/ioc/hunt/bulk
+    
+    Hunt for a batch of IOCs (e.g. a threat intel feed) in one job.
+    
+    Request Body:
+        {
+            "iocs": [
+                {"ioc_type": "file_hash|ip_address|domain|url|email", "ioc_value": "..."}
+            ]
+        }
+    
+    Returns:
+        JSON with hunt_id, status and rejected IOCs (202; the hunt runs
+        in the background)
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not data:
+            return json_response({'error': 'Request body required'}, 400)
+        
+        iocs = data.get('iocs')
+        if not iocs or not isinstance(iocs, list):
+            return json_response({'error': 'iocs must be a non-empty list'}, 400)
+        
+        result = hunter.start_bulk_hunt(iocs)
+        
+        if result.get('status') == 'error':
+            return json_response(result, 400)
+        
+        return json_response(result, 202)
+        
+    except Exception as e:
+        logger.error(f"Error starting bulk hunt: {e}")
+        return json_response({'error': str(e)}, 500)
 
 
 @ioc_bp.route('/results/<hunt_id>', methods=['GET'])
@@ -72,16 +119,21 @@ def get_hunt_results(hunt_id):
         JSON with hunt results and matches
     """
     try:
+        # Finished hunts are served from their cached serialization
+        body = hunter.get_results_json(hunt_id)
+        if body is not None:
+            return Response(body, status=200, mimetype='application/json')
+        
         result = hunter.get_results(hunt_id)
         
         if result.get('status') == 'not_found':
-            return jsonify(result), 404
+            return json_response(result, 404)
         
-        return jsonify(result), 200
+        return json_response(result, 200)
         
     except Exception as e:
         logger.error(f"Error fetching hunt results: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @ioc_bp.route('/hunts', methods=['GET'])
@@ -101,33 +153,36 @@ def list_hunts():
         status = request.args.get('status', None)
         hunts = hunter.list_hunts(status)
         
-        return jsonify({
+        return json_response({
             'hunts': hunts,
             'count': len(hunts)
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Error listing hunts: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @ioc_bp.route('/evidence/<host>', methods=['GET'])
 def get_host_evidence(host):
     """
-    GET /api/ioc/evidence/<host>
+    GET /api/ioc/evidence/<host>?type=<ioc_type>
     
     Get all evidence for a specific host.
     
+    Query Parameters:
+        type: Optional IOC type filter (file_hash, ip_address, domain, url, email)
+    
     Returns:
         JSON with evidence list
     """
     try:
-        result = hunter.get_host_evidence(host)
-        return jsonify(result), 200
+        result = hunter.get_host_evidence(host, request.args.get('type'))
+        return json_response(result, 200)
         
     except Exception as e:
         logger.error(f"Error fetching evidence: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @ioc_bp.route('/evidence', methods=['POST'])
@@ -149,9 +204,9 @@ def add_evidence():
         Confirmation message
     """
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'Request body required'}), 400
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not data:
+            return json_response({'error': 'Request body required'}, 400)
         
         host = data.get('host')
         evidence_type = data.get('evidence_type')
@@ -159,14 +214,21 @@ def add_evidence():
         location = data.get('location', 'Unknown')
         
         if not all([host, evidence_type, evidence_value]):
-            return jsonify({'error': 'host, evidence_type, and evidence_value are required'}), 400
+            return json_response({'error': 'host, evidence_type, and evidence_value are required'}, 400)
+        
+        # evidence_type is interned by Evidence, which only accepts str
+        if not all(isinstance(field, str) for field in (host, evidence_type, evidence_value, location)):
+            return json_response({'error': 'host, evidence_type, evidence_value and location must be strings'}, 400)
         
         result = hunter.add_evidence(host, evidence_type, evidence_value, location)
-        return jsonify(result), 200
+        if result.get('status') == 'error':
+            return json_response(result, 400)
+        
+        return json_response(result, 200)
         
     except Exception as e:
         logger.error(f"Error adding evidence: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @ioc_bp.route('/analyze', methods=['POST'])
@@ -186,22 +248,25 @@ def analyze_prevalence():
         JSON with prevalence statistics
     """
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'Request body required'}), 400
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not data:
+            return json_response({'error': 'Request body required'}, 400)
         
         ioc_type = data.get('ioc_type')
         ioc_value = data.get('ioc_value')
         
         if not ioc_type or not ioc_value:
-            return jsonify({'error': 'ioc_type and ioc_value are required'}), 400
+            return json_response({'error': 'ioc_type and ioc_value are required'}, 400)
+        
+        if not isinstance(ioc_type, str) or not isinstance(ioc_value, str):
+            return json_response({'error': 'ioc_type and ioc_value must be strings'}, 400)
         
         result = hunter.analyze_ioc_prevalence(ioc_type, ioc_value)
-        return jsonify(result), 200
+        return json_response(result, 200)
         
     except Exception as e:
         logger.error(f"Error analyzing prevalence: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @ioc_bp.route('/health', methods=['GET'])
@@ -214,10 +279,8 @@ def health_check():
     Returns:
         JSON with service status
     """
-    return jsonify({
+    return json_response({
         'status': 'healthy',
         'service': 'ioc_hunting',
-        'active_hunts': sum(1 for h in hunter.hunts.values() if h['status'] == 'running'),
-        'total_hunts': len(hunter.hunts),
-        'hosts_monitored': len(hunter.host_evidence)
-    }), 200
+        **hunter.get_stats()
+    }, 200)
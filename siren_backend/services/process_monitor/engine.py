@@ -7,17 +7,156 @@ Provides high-level operations for:
 - Collecting system metrics in background thread
 """
 
+import os
 import psutil
+import sys
 import threading
 import time
 import logging
-from typing import List, Dict, Optional
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Iterator, List, Dict, Optional
 from .risk_engine import RiskEngine
 from .metrics_buffer import MetricsBuffer
 
 
 logger = logging.getLogger(__name__)
 
+# Process attributes read for each process, in one oneshot() batch
+PROCESS_ATTRS = ['pid', 'name', 'cpu_percent', 'memory_info', 'exe', 'username']
+
+# Seconds a process list is reused for before /proc is enumerated again
+PROCESS_LIST_TTL = 1.0
+
+# psutil 6.0+ no longer re-checks every cached PID for reuse on each
+# process_iter() call, and exposes process_iter.cache_clear() instead
+PSUTIL_ITER_CACHE = psutil.version_info >= (6, 0, 0)
+
+# On Linux the process list is read straight from /proc: three small reads
+# per process instead of the dozen or so psutil makes behind as_dict()
+PROC_FS = sys.platform.startswith('linux') and os.path.isdir('/proc')
+if PROC_FS:
+    import pwd
+    CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+    PF_KTHREAD = 0x00200000  # Kernel thread bit of the stat flags field
+
+
+def clear_process_cache() -> None:
+    """Drop the Process objects cached by psutil.process_iter()."""
+    if PSUTIL_ITER_CACHE:
+        psutil.process_iter.cache_clear()
+
+
+@lru_cache(maxsize=256)
+def _uid_to_name(uid: int) -> str:
+    """
+    Resolve a uid to a user name, falling back to the number.
+    
+    getpwuid() is an NSS lookup that may go to LDAP or SSSD, while a host
+    runs processes under only a handful of uids, so results are cached.
+    """
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+def _read_proc(pid: str) -> Optional[tuple]:
+    """
+    Read one process from /proc.
+    
+    Args:
+        pid: Process ID, as listed in /proc
+    
+    Returns:
+        Tuple of (name, cpu_ticks, start_time, rss_bytes, exe, username),
+        or None if the process exited while being read
+    """
+    base = '/proc/' + pid
+    try:
+        with open(base + '/stat', 'rb') as f:
+            stat = f.read()
+    except (FileNotFoundError, ProcessLookupError):
+        return None
+    
+    # The name is in parentheses and may itself contain spaces or ')'
+    rparen = stat.rfind(b')')
+    name = os.fsdecode(stat[stat.find(b'(') + 1:rparen])
+    fields = stat[rparen + 2:].split()
+    # Fields after the name, from state (field 3 in proc(5)) onwards
+    cpu_ticks = int(fields[11]) + int(fields[12])
+    start_time = int(fields[19])
+    rss = int(fields[21]) * PAGE_SIZE
+    
+    if int(fields[6]) & PF_KTHREAD:
+        # Kernel threads run as root with no executable or command line,
+        # so the remaining reads would only fail or repeat that
+        return name, cpu_ticks, start_time, rss, '', _uid_to_name(0)
+    
+    try:
+        with open(base + '/status', 'rb') as f:
+            status = f.read()
+    except (FileNotFoundError, ProcessLookupError):
+        return None
+    
+    uid_line = status.find(b'\nUid:')
+    username = _uid_to_name(int(status[uid_line + 5:status.find(b'\n', uid_line + 1)].split()[0]))
+    
+    if len(name) >= 15:
+        # The kernel truncates names to 15 characters; recover the full
+        # one from the command line the way psutil does
+        try:
+            with open(base + '/cmdline', 'rb') as f:
+                argv0 = os.path.basename(os.fsdecode(f.read().split(b'\0', 1)[0]))
+            if argv0.startswith(name):
+                name = argv0
+        except OSError:
+            pass
+    
+    try:
+        exe = os.readlink(base + '/exe')
+    except OSError:
+        # Other users' processes deny access to their executable
+        exe = ''
+    
+    return name, cpu_ticks, start_time, rss, exe, username
+
+
+@dataclass
+class ProcessRow:
+    """
+    One process in the process list, with its risk assessment.
+    
+    A slotted dataclass rather than a dict: an enumeration builds one per
+    running process, and orjson serializes slotted dataclasses directly,
+    so no intermediate dict is needed on the way to the response.
+    """
+    
+    __slots__ = (
+        'pid', 'name', 'cpu_usage', 'memory_usage', 'path', 'username',
+        'risk_score', 'risk_level', 'risk_factors'
+    )
+    
+    pid: int
+    name: str
+    cpu_usage: float
+    memory_usage: float
+    path: str
+    username: str
+    risk_score: int
+    risk_level: str
+    risk_factors: List[str]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the API representation.
+        
+        Returns:
+            Dictionary with one key per field
+        """
+        return asdict(self)
+
 
 class ProcessService:
     """
@@ -27,76 +166,88 @@ class ProcessService:
     with integrated risk assessment.
     """
     
-    def __init__(self):
-        """Initialize the process service with risk engine."""
+    def __init__(
+        self,
+        cache_ttl: float = PROCESS_LIST_TTL,
+        metrics_buffer: Optional[MetricsBuffer] = None
+    ):
+        """
+        Initialize the process service with risk engine.
+        
+        Args:
+            cache_ttl: Seconds to reuse a process list for (0 disables)
+            metrics_buffer: Buffer filled by a MetricsCollector; its latest
+                sample is used for the summary instead of sampling again
+        """
         self.risk_engine = RiskEngine()
+        self.metrics_buffer = metrics_buffer
+        self.cache_ttl = cache_ttl
+        self._cache_lock = threading.Lock()
+        self._cached = None
+        self._cached_at = 0.0
+        # CPU time of each process at the previous /proc enumeration:
+        # {pid: (start_time, cpu_ticks)}
+        self._cpu_ticks = {}
+        self._cpu_sampled_at = None
+        # Prime the system-wide CPU counter for non-blocking reads
+        psutil.cpu_percent(interval=None)
     
     def get_all_processes(self) -> Dict[str, any]:
         """
         Retrieve all running processes with risk scores.
         
+        Dashboards poll this every second or two, so a result is reused
+        for cache_ttl seconds. Concurrent callers wait for a single
+        enumeration instead of each walking /proc. The returned dictionary
+        is shared and must not be modified.
+        
         Returns:
             Dictionary containing:
-                - processes: List of process dictionaries
+                - processes: List of ProcessRow objects (serialized by the
+                  app's orjson JSON provider)
                 - summary: Overall system summary
         """
+        with self._cache_lock:
+            if self._cached is not None and time.monotonic() - self._cached_at < self.cache_ttl:
+                return self._cached
+            
+            result = self._enumerate_processes()
+            self._cached = result
+            self._cached_at = time.monotonic()
+            return result
+    
+    def _enumerate_processes(self) -> Dict[str, any]:
+        """
+        Enumerate all running processes and score them.
+        
+        Returns:
+            Dictionary with processes and summary (see get_all_processes)
+        """
         processes = []
         high_risk_count = 0
         
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_info', 'exe', 'username']):
-            try:
-                # Get process information
-                pinfo = proc.info
-                
-                # Calculate memory in MB
-                memory_mb = pinfo['memory_info'].rss / (1024 * 1024) if pinfo['memory_info'] else 0
-                
-                # Get executable path
-                path = pinfo.get('exe', '') or ''
-                
-                # Get username
-                username = pinfo.get('username', '') or 'unknown'
-                
-                # Build process info dict
-                process_info = {
-                    'pid': pinfo['pid'],
-                    'name': pinfo['name'] or 'unknown',
-                    'cpu_usage': pinfo['cpu_percent'] or 0.0,
-                    'memory_usage': round(memory_mb, 2),
-                    'path': path,
-                    'username': username
-                }
-                
-                # Calculate risk score
-                risk_assessment = self.risk_engine.calculate_risk_score(process_info)
-                
-                # Merge risk data into process info
-                process_info.update({
-                    'risk_score': risk_assessment['risk_score'],
-                    'risk_level': risk_assessment['risk_level'],
-                    'risk_factors': risk_assessment['risk_factors']
-                })
-                
-                processes.append(process_info)
-                
-                # Count high-risk processes
-                if risk_assessment['risk_level'] == 'High':
-                    high_risk_count += 1
-                    
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
-                # Skip processes we can't access
-                logger.debug(f"Skipped process due to: {e}")
-                continue
+        # Rows are scored as they are read and counted as they are stored,
+        # in a single pass over the process table
+        rows = self._iter_proc_fs() if PROC_FS else self._iter_psutil()
+        for process_info in rows:
+            processes.append(process_info)
+            if process_info.risk_level == 'High':
+                high_risk_count += 1
         
-        # Get system-level metrics
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        memory = psutil.virtual_memory()
+        # Get system-level metrics: the collector's latest sample if there
+        # is one, else CPU usage since the previous reading (non-blocking)
+        latest = self.metrics_buffer.peek_latest() if self.metrics_buffer is not None else None
+        if latest is not None:
+            cpu_percent, memory_percent = latest
+        else:
+            cpu_percent = psutil.cpu_percent(interval=None)
+            memory_percent = psutil.virtual_memory().percent
         
         summary = {
             'total': len(processes),
             'high_risk': high_risk_count,
             'cpu_percent': round(cpu_percent, 2),
-            'memory_percent': round(memory.percent, 2)
+            'memory_percent': round(memory_percent, 2)
         }
         
         return {
@@ -104,6 +255,132 @@ class ProcessService:
             'summary': summary
         }
     
+    def _iter_proc_fs(self) -> Iterator[ProcessRow]:
+        """
+        Read and score all processes straight from /proc (Linux).
+        
+        CPU usage is measured between this enumeration and the previous
+        one, like psutil's cpu_percent(): 0.0 for processes not seen
+        before, and not divided by the number of CPUs. The samples are
+        recorded once the iterator is exhausted.
+        
+        Yields:
+            ProcessRow for each process
+        """
+        cpu_ticks = {}
+        now = time.monotonic()
+        previous = self._cpu_ticks
+        elapsed = now - self._cpu_sampled_at if self._cpu_sampled_at is not None else 0.0
+        
+        for pid in os.listdir('/proc'):
+            if not pid.isdigit():
+                continue
+            try:
+                entry = _read_proc(pid)
+            except (OSError, ValueError, IndexError) as e:
+                logger.debug(f"Skipped process {pid} due to: {e}")
+                continue
+            if entry is None:
+                continue
+            
+            name, ticks, start_time, rss, exe, username = entry
+            pid = int(pid)
+            cpu_ticks[pid] = (start_time, ticks)
+            
+            cpu_usage = 0.0
+            prior = previous.get(pid)
+            # A different start time means the PID was reused
+            if prior is not None and prior[0] == start_time and elapsed > 0:
+                cpu_usage = round((ticks - prior[1]) / CLOCK_TICKS / elapsed * 100, 1)
+            
+            yield self._make_row(pid, name, cpu_usage, rss, exe, username)
+        
+        self._cpu_ticks = cpu_ticks
+        self._cpu_sampled_at = now
+    
+    def _iter_psutil(self) -> Iterator[ProcessRow]:
+        """
+        Read and score all processes through psutil (non-Linux).
+        
+        Yields:
+            ProcessRow for each process
+        """
+        # process_iter() reuses the Process objects of earlier calls, so
+        # cpu_percent is measured since the previous enumeration
+        for proc in psutil.process_iter():
+            try:
+                # Read all attributes in one /proc (or API) pass
+                with proc.oneshot():
+                    pinfo = proc.as_dict(attrs=PROCESS_ATTRS)
+                
+                process_info = self._build_process_info(pinfo)
+                    
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
+                # Skip processes we can't access
+                logger.debug(f"Skipped process due to: {e}")
+                continue
+            
+            yield process_info
+    
+    def _build_process_info(self, pinfo: Dict) -> ProcessRow:
+        """
+        Build the API representation of a process, with risk assessment.
+        
+        Args:
+            pinfo: Attributes from Process.as_dict(attrs=PROCESS_ATTRS)
+        
+        Returns:
+            ProcessRow for the process
+        """
+        return self._make_row(
+            pinfo['pid'],
+            pinfo['name'],
+            pinfo['cpu_percent'],
+            pinfo['memory_info'].rss if pinfo['memory_info'] else 0,
+            pinfo.get('exe', ''),
+            pinfo.get('username', '')
+        )
+    
+    def _make_row(
+        self,
+        pid: int,
+        name: Optional[str],
+        cpu_percent: Optional[float],
+        rss: int,
+        exe: Optional[str],
+        username: Optional[str]
+    ) -> ProcessRow:
+        """
+        Score a process and build its ProcessRow.
+        
+        Args:
+            pid: Process ID
+            name: Process name
+            cpu_percent: CPU usage percentage
+            rss: Resident memory in bytes
+            exe: Executable path
+            username: Owner of the process
+        
+        Returns:
+            ProcessRow for the process
+        """
+        name = name or 'unknown'
+        cpu_usage = cpu_percent or 0.0
+        # Calculate memory in MB
+        memory_usage = round(rss / (1024 * 1024), 2)
+        path = exe or ''
+        username = username or 'unknown'
+        
+        risk_assessment = self.risk_engine.calculate_risk_score(
+            cpu_usage, memory_usage, path, name, username
+        )
+        return ProcessRow(
+            pid, name, cpu_usage, memory_usage, path, username,
+            risk_assessment['risk_score'],
+            risk_assessment['risk_level'],
+            risk_assessment['risk_factors']
+        )
+    
     def get_process_by_pid(self, pid: int) -> Optional[Dict]:
         """
         Get detailed information about a specific process.
@@ -120,28 +397,10 @@ class ProcessService:
         """
         try:
             proc = psutil.Process(pid)
-            pinfo = proc.as_dict(attrs=['pid', 'name', 'cpu_percent', 'memory_info', 'exe', 'username'])
-            
-            memory_mb = pinfo['memory_info'].rss / (1024 * 1024) if pinfo['memory_info'] else 0
-            
-            process_info = {
-                'pid': pinfo['pid'],
-                'name': pinfo['name'] or 'unknown',
-                'cpu_usage': pinfo['cpu_percent'] or 0.0,
-                'memory_usage': round(memory_mb, 2),
-                'path': pinfo.get('exe', '') or '',
-                'username': pinfo.get('username', '') or 'unknown'
-            }
-            
-            # Add risk assessment
-            risk_assessment = self.risk_engine.calculate_risk_score(process_info)
-            process_info.update({
-                'risk_score': risk_assessment['risk_score'],
-                'risk_level': risk_assessment['risk_level'],
-                'risk_factors': risk_assessment['risk_factors']
-            })
+            with proc.oneshot():
+                pinfo = proc.as_dict(attrs=PROCESS_ATTRS)
             
-            return process_info
+            return self._build_process_info(pinfo).to_dict()
             
         except psutil.NoSuchProcess:
             logger.warning(f"Process {pid} not found")
@@ -220,6 +479,8 @@ class MetricsCollector:
         self.interval = interval
         self._stop_event = threading.Event()
         self._thread = None
+        # Prime the CPU counter so the first sample covers a real interval
+        psutil.cpu_percent(interval=None)
     
     def start(self) -> None:
         """Start the background metrics collection thread."""
@@ -251,21 +512,31 @@ class MetricsCollector:
         Main loop for collecting metrics.
         
         Runs in a background thread, sampling system metrics every
-        interval seconds until stopped.
+        interval seconds until stopped. Samples are scheduled against
+        fixed deadlines, so time spent sampling or waiting for the GIL
+        behind busy request threads does not accumulate as drift.
         """
         logger.info("Starting metrics collection loop")
         
+        next_sample = time.monotonic()
         while not self._stop_event.is_set():
             try:
-                # Sample system metrics
-                cpu_percent = psutil.cpu_percent(interval=0.1)
+                # Sample system metrics; CPU usage is averaged over the time
+                # since the previous sample instead of a blocking 0.1s window
+                cpu_percent = psutil.cpu_percent(interval=None)
                 memory = psutil.virtual_memory()
                 
                 # Store in buffer
                 self.metrics_buffer.add_metric(cpu_percent, memory.percent)
                 
-                # Sleep until next sample
-                self._stop_event.wait(self.interval)
+                # Sleep until the next deadline; after a stall longer than
+                # an interval, start a new schedule instead of catching up
+                next_sample += self.interval
+                delay = next_sample - time.monotonic()
+                if delay < 0:
+                    next_sample = time.monotonic()
+                    delay = 0
+                self._stop_event.wait(delay)
                 
             except Exception as e:
                 logger.error(f"Error collecting metrics: {e}")
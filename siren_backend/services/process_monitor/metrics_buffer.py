@@ -3,12 +3,16 @@ MetricsBuffer - Thread-safe circular buffer for system metrics
 
 Stores the last 60 seconds of CPU and memory usage data for visualization.
 Uses a deque with maxlen=60 to automatically discard old data.
+
+There is a single producer (the metrics collector thread), and each sample
+is appended as one tuple. deque.append() and copying a deque of tuples
+both run without releasing the GIL, so readers always see whole samples
+and no lock is needed.
 """
 
-import threading
 from collections import deque
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 
 
 class MetricsBuffer:
@@ -16,7 +20,8 @@ class MetricsBuffer:
     Thread-safe circular buffer for storing system metrics.
     
     Maintains exactly 60 seconds of CPU and memory usage data,
-    automatically discarding older entries.
+    automatically discarding older entries. Meant for a single writer;
+    any number of threads may read.
     """
     
     def __init__(self, max_size: int = 60):
@@ -26,54 +31,69 @@ class MetricsBuffer:
         Args:
             max_size: Maximum number of entries to store (default: 60)
         """
-        self._cpu_buffer = deque(maxlen=max_size)
-        self._memory_buffer = deque(maxlen=max_size)
-        self._lock = threading.Lock()
+        self._samples = deque(maxlen=max_size)  # (timestamp, cpu, memory)
+        self._version = 0  # Bumped by every write
+        self._view = (-1, None)  # (version, payload) last built by get_all_metrics
     
     def add_metric(self, cpu_percent: float, memory_percent: float) -> None:
         """
         Add a new metric entry with current timestamp.
         
-        Thread-safe operation that adds CPU and memory usage to their
-        respective buffers with an ISO 8601 timestamp.
+        Adds CPU and memory usage as a single sample with an ISO 8601
+        timestamp.
         
         Args:
             cpu_percent: CPU usage percentage (0-100)
             memory_percent: Memory usage percentage (0-100)
         """
         timestamp = datetime.utcnow().isoformat() + 'Z'
-        
-        with self._lock:
-            self._cpu_buffer.append({
-                'time': timestamp,
-                'usage': round(cpu_percent, 2)
-            })
-            self._memory_buffer.append({
-                'time': timestamp,
-                'usage': round(memory_percent, 2)
-            })
+        self._samples.append((timestamp, round(cpu_percent, 2), round(memory_percent, 2)))
+        self._version += 1
     
     def get_all_metrics(self) -> Dict[str, List[Dict[str, any]]]:
         """
         Retrieve all stored metrics.
         
+        The payload is built once per new sample and shared by all reads
+        until the next one, so it must not be modified.
+        
         Returns:
             Dictionary with 'cpu' and 'memory' keys, each containing
             a list of {time, usage} dictionaries.
         """
-        with self._lock:
-            return {
-                'cpu': list(self._cpu_buffer),
-                'memory': list(self._memory_buffer)
-            }
+        # Read the version first: a sample appended after this point is
+        # picked up by the snapshot and simply triggers one more rebuild
+        version = self._version
+        built_version, payload = self._view
+        if built_version == version:
+            return payload
+        
+        samples = tuple(self._samples)
+        payload = {
+            'cpu': [{'time': timestamp, 'usage': cpu} for timestamp, cpu, _ in samples],
+            'memory': [{'time': timestamp, 'usage': memory} for timestamp, _, memory in samples]
+        }
+        self._view = (version, payload)
+        return payload
+    
+    def peek_latest(self) -> Optional[Tuple[float, float]]:
+        """
+        Get the most recent sample without building the full payload.
+        
+        Returns:
+            Tuple of (cpu_percent, memory_percent), or None if empty
+        """
+        try:
+            _, cpu, memory = self._samples[-1]
+        except IndexError:
+            return None
+        return cpu, memory
     
     def clear(self) -> None:
         """Clear all stored metrics."""
-        with self._lock:
-            self._cpu_buffer.clear()
-            self._memory_buffer.clear()
+        self._samples.clear()
+        self._version += 1
     
     def get_size(self) -> int:
         """Get the current number of stored metrics."""
-        with self._lock:
-            return len(self._cpu_buffer)
+        return len(self._samples)
@@ -10,10 +10,15 @@ Calculates risk scores for processes based on multiple factors:
 """
 
 import os
+import re
 import getpass
 from typing import Dict, Optional
 
 
+# The server's own user, looked up once per process rather than per engine
+CURRENT_USER = getpass.getuser()
+
+
 class RiskEngine:
     """
     Engine for calculating process risk scores.
@@ -22,8 +27,10 @@ class RiskEngine:
     contextual factors, categorizing processes as Low, Medium, or High risk.
     """
     
-    # Suspicious process names commonly used in attacks
-    SUSPICIOUS_NAMES = {
+    __slots__ = ()
+    
+    # Suspicious process names commonly used in attacks (all lowercase)
+    SUSPICIOUS_NAMES = frozenset({
         'powershell.exe', 'powershell', 'pwsh.exe', 'pwsh',
         'cmd.exe', 'cmd',
         'rundll32.exe', 'rundll32',
@@ -34,32 +41,43 @@ class RiskEngine:
         'certutil.exe', 'certutil',
         'bitsadmin.exe', 'bitsadmin',
         'psexec.exe', 'psexec',
-    }
+    })
     
     # Suspicious path patterns
-    SUSPICIOUS_PATHS = {
+    SUSPICIOUS_PATHS = frozenset({
         '/tmp/', '/var/tmp/', '/dev/shm/',  # Linux temp dirs
         'C:\\Temp\\', 'C:\\Windows\\Temp\\',  # Windows temp
         'Downloads/', '\\Downloads\\',  # Downloads folders
         'AppData\\Local\\Temp\\',  # Windows user temp
         '/home/.hidden/',  # Hidden directories
-    }
+    })
     
-    def __init__(self):
-        """Initialize the risk engine."""
-        self.current_user = getpass.getuser()
+    # All path patterns as one case-insensitive alternation, matched
+    # against the lowercased path in a single scan
+    _SUSPICIOUS_PATH_RE = re.compile(
+        '|'.join(re.escape(pattern.lower()) for pattern in SUSPICIOUS_PATHS)
+    )
     
-    def calculate_risk_score(self, process_info: Dict) -> Dict[str, any]:
+    def calculate_risk_score(
+        self,
+        cpu_usage: float,
+        memory_usage: float,
+        path: str,
+        name: str,
+        username: str
+    ) -> Dict[str, any]:
         """
         Calculate comprehensive risk score for a process.
         
+        Called once per process on every enumeration, so the details are
+        passed as arguments rather than in a dictionary.
+        
         Args:
-            process_info: Dictionary containing process details:
-                - name: Process name
-                - cpu_usage: CPU percentage
-                - memory_usage: Memory in MB
-                - path: Executable path
-                - username: Process owner
+            cpu_usage: CPU percentage
+            memory_usage: Memory in MB
+            path: Executable path
+            name: Process name
+            username: Process owner
         
         Returns:
             Dictionary with:
@@ -71,7 +89,6 @@ class RiskEngine:
         risk_factors = []
         
         # Factor 1: High CPU usage
-        cpu_usage = process_info.get('cpu_usage', 0)
         if cpu_usage > 50:
             score += 30
             risk_factors.append(f'High CPU usage ({cpu_usage:.1f}%)')
@@ -80,29 +97,26 @@ class RiskEngine:
             risk_factors.append(f'Elevated CPU usage ({cpu_usage:.1f}%)')
         
         # Factor 2: High memory usage
-        memory_mb = process_info.get('memory_usage', 0)
-        if memory_mb > 500:
+        if memory_usage > 500:
             score += 20
-            risk_factors.append(f'High memory usage ({memory_mb:.1f} MB)')
-        elif memory_mb > 250:
+            risk_factors.append(f'High memory usage ({memory_usage:.1f} MB)')
+        elif memory_usage > 250:
             score += 10
-            risk_factors.append(f'Elevated memory usage ({memory_mb:.1f} MB)')
+            risk_factors.append(f'Elevated memory usage ({memory_usage:.1f} MB)')
         
         # Factor 3: Suspicious path
-        path = process_info.get('path', '')
         if self._check_suspicious_path(path):
             score += 40
             risk_factors.append(f'Suspicious path detected')
         
         # Factor 4: Suspicious process name
-        name = process_info.get('name', '').lower()
+        name = name.lower()
         if self._check_suspicious_name(name):
             score += 30
             risk_factors.append(f'Suspicious process name ({name})')
         
         # Factor 5: Running as different user (potential privilege escalation)
-        username = process_info.get('username', '')
-        if username and username != self.current_user and username != 'root':
+        if username and username != CURRENT_USER and username != 'root':
             score += 20
             risk_factors.append(f'Running as different user ({username})')
         
@@ -136,17 +150,16 @@ class RiskEngine:
         if not path:
             return False
         
-        path_lower = path.lower()
-        return any(pattern.lower() in path_lower for pattern in self.SUSPICIOUS_PATHS)
+        return self._SUSPICIOUS_PATH_RE.search(path.lower()) is not None
     
     def _check_suspicious_name(self, name: str) -> bool:
         """
         Check if process name is in the suspicious list.
         
         Args:
-            name: Process name (case-insensitive)
+            name: Process name, lowercased (SUSPICIOUS_NAMES is all lowercase)
         
         Returns:
             True if name is suspicious, False otherwise
         """
-        return name.lower() in self.SUSPICIOUS_NAMES
+        return name in self.SUSPICIOUS_NAMES
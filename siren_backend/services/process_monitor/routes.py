@@ -4,16 +4,19 @@ Process Monitor Routes - Flask Blueprint
 Provides REST API endpoints for process monitoring with risk assessment.
 
 Endpoints:
-    GET  /api/process/processes      - List all processes with risk scores
-    GET  /api/process/metrics        - Get last 60s of system metrics
-    POST /api/process/kill/<pid>     - Terminate a process
-    GET  /api/process/health         - Service health check
+    GET  /api/process/processes         - List all processes with risk scores
+    GET  /api/process/processes/stream  - Same list as NDJSON, one process per line
+    GET  /api/process/metrics           - Get last 60s of system metrics
+    POST /api/process/kill/<pid>        - Terminate a process
+    GET  /api/process/health            - Service health check
 """
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response
+import orjson
 import psutil
 import logging
-from .engine import ProcessService, MetricsCollector
+from utils.common import json_response
+from .engine import ProcessService, MetricsCollector, clear_process_cache
 from .metrics_buffer import MetricsBuffer
 
 logger = logging.getLogger(__name__)
@@ -23,7 +26,7 @@ process_bp = Blueprint('process', __name__)
 
 # Initialize services (singletons for this blueprint)
 metrics_buffer = MetricsBuffer(max_size=60)
-process_service = ProcessService()
+process_service = ProcessService(metrics_buffer=metrics_buffer)
 metrics_collector = MetricsCollector(metrics_buffer, interval=1.0)
 
 
@@ -38,6 +41,7 @@ def shutdown_process_monitor():
     """Shutdown the metrics collector gracefully."""
     logger.info("Shutting down Process Monitor service...")
     metrics_collector.stop()
+    clear_process_cache()
     logger.info("Process Monitor service shut down")
 
 
@@ -56,14 +60,45 @@ def get_processes():
     try:
         logger.debug("Fetching all processes")
         result = process_service.get_all_processes()
-        return jsonify(result), 200
+        return json_response(result, 200)
     
     except Exception as e:
         logger.error(f"Error fetching processes: {e}")
-        return jsonify({
+        return json_response({
             'error': 'Internal server error',
             'message': str(e)
-        }), 500
+        }, 500)
+
+
+@process_bp.route('/processes/stream', methods=['GET'])
+def stream_processes():
+    """
+    GET /api/process/processes/stream
+    
+    Retrieve all running processes as newline-delimited JSON, so clients
+    can render rows as they arrive instead of parsing one large document.
+    
+    Returns:
+        application/x-ndjson response: one process object per line,
+        followed by a final {"summary": {...}} line
+    """
+    try:
+        logger.debug("Streaming all processes")
+        result = process_service.get_all_processes()
+    
+    except Exception as e:
+        logger.error(f"Error fetching processes: {e}")
+        return json_response({
+            'error': 'Internal server error',
+            'message': str(e)
+        }, 500)
+    
+    def generate():
+        for process_info in result['processes']:
+            yield orjson.dumps(process_info) + b'\n'
+        yield orjson.dumps({'summary': result['summary']}) + b'\n'
+    
+    return Response(generate(), status=200, mimetype='application/x-ndjson')
 
 
 @process_bp.route('/metrics', methods=['GET'])
@@ -79,14 +114,14 @@ def get_metrics():
     try:
         logger.debug("Fetching system metrics")
         metrics = metrics_buffer.get_all_metrics()
-        return jsonify(metrics), 200
+        return json_response(metrics, 200)
     
     except Exception as e:
         logger.error(f"Error fetching metrics: {e}")
-        return jsonify({
+        return json_response({
             'error': 'Internal server error',
             'message': str(e)
-        }), 500
+        }, 500)
 
 
 @process_bp.route('/kill/<int:pid>', methods=['POST'])
@@ -105,39 +140,39 @@ def kill_process(pid):
     try:
         logger.info(f"Attempting to kill process {pid}")
         result = process_service.kill_process(pid)
-        return jsonify(result), 200
+        return json_response(result, 200)
     
     except psutil.NoSuchProcess:
         logger.warning(f"Process {pid} not found")
-        return jsonify({
+        return json_response({
             'status': 'error',
             'message': 'Process not found',
             'pid': pid
-        }), 404
+        }, 404)
     
     except psutil.AccessDenied:
         logger.warning(f"Access denied to kill process {pid}")
-        return jsonify({
+        return json_response({
             'status': 'error',
             'message': 'Access denied - insufficient permissions',
             'pid': pid
-        }), 403
+        }, 403)
     
     except psutil.TimeoutExpired:
         logger.error(f"Timeout killing process {pid}")
-        return jsonify({
+        return json_response({
             'status': 'error',
             'message': 'Process termination timed out',
             'pid': pid
-        }), 500
+        }, 500)
     
     except Exception as e:
         logger.error(f"Error killing process {pid}: {e}")
-        return jsonify({
+        return json_response({
             'status': 'error',
             'message': str(e),
             'pid': pid
-        }), 500
+        }, 500)
 
 
 @process_bp.route('/health', methods=['GET'])
@@ -150,9 +185,9 @@ def health_check():
     Returns:
         JSON with service status.
     """
-    return jsonify({
+    return json_response({
         'status': 'healthy',
         'service': 'process_monitor',
         'metrics_collector_running': metrics_collector.is_running(),
         'metrics_buffer_size': metrics_buffer.get_size()
-    }), 200
+    }, 200)
@@ -6,14 +6,144 @@ actions taken, and recommendations.
 """
 
 import logging
-import uuid
+import secrets
 import json
-from typing import Dict, List, Any, Optional
+import orjson
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import dataclass
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from utils.common import get_timestamp
+from utils.config import config
 
 logger = logging.getLogger(__name__)
 
+# Export formats; report bodies are cached only for these, so arbitrary
+# format strings from requests cannot grow the cache
+REPORT_FORMATS = ('json', 'html', 'pdf')
+
+# Mock incident data for testing, built once at import and shared read-only
+# by all generators
+MOCK_INCIDENTS = MappingProxyType({
+    'INC-001': {
+        'incident_id': 'INC-001',
+        'title': 'Malware Execution Detected',
+        'severity': 'high',
+        'status': 'contained',
+        'created_at': '2025-11-24T14:30:00Z',
+        'host': 'WIN-WKS-05',
+        'summary': 'Malicious PowerShell execution detected with encoded commands',
+        'impact': '1 host affected, no confirmed data exfiltration',
+        'timeline': [
+            {'time': '14:30:00', 'event': 'Initial detection - PowerShell encoded command'},
+            {'time': '14:31:15', 'event': 'Process injection attempt detected'},
+            {'time': '14:32:00', 'event': 'Host isolated from network'},
+            {'time': '14:33:30', 'event': 'Malicious process terminated'},
+            {'time': '14:35:00', 'event': 'Evidence collected - memory dump'}
+        ],
+        'actions_taken': [
+            'Isolated WIN-WKS-05 from network',
+            'Terminated malicious process (PID: 3456)',
+            'Collected memory dump (2.1 GB)',
+            'Quarantined suspicious file: C:\\Temp\\payload.exe',
+            'Reset user credentials'
+        ],
+        'evidence': [
+            {'type': 'file_hash', 'value': 'b40f6b2c167239519fcfb2028ab2524a', 'location': 'C:\\Temp\\payload.exe'},
+            {'type': 'process', 'value': 'powershell.exe (PID: 3456)', 'cmdline': 'powershell.exe -enc JAB...'},
+            {'type': 'network', 'value': 'Outbound connection to 192.168.100.50:4444'}
+        ],
+        'recommendations': [
+            'Deploy application whitelisting on all workstations',
+            'Restrict PowerShell execution for standard users',
+            'Implement network segmentation for workstations',
+            'Add detected file hash to global blocklist',
+            'Conduct security awareness training'
+        ]
+    },
+    'INC-002': {
+        'incident_id': 'INC-002',
+        'title': 'Lateral Movement Attempt',
+        'severity': 'medium',
+        'status': 'investigating',
+        'created_at': '2025-11-24T16:00:00Z',
+        'host': 'WIN-SRV-01',
+        'summary': 'Suspicious authentication attempts from compromised workstation',
+        'impact': '2 hosts involved, credentials potentially compromised',
+        'timeline': [
+            {'time': '16:00:00', 'event': 'Multiple failed login attempts detected'},
+            {'time': '16:03:00', 'event': 'Successful login from WIN-WKS-12'},
+            {'time': '16:05:00', 'event': 'SMB connection to file share'},
+            {'time': '16:07:00', 'event': 'Alert triggered - unusual behavior'}
+        ],
+        'actions_taken': [
+            'Monitored activity in real-time',
+            'Collected authentication logs',
+            'Reset affected user account password'
+        ],
+        'evidence': [
+            {'type': 'authentication', 'value': 'Failed logins from WIN-WKS-12'},
+            {'type': 'network', 'value': 'SMB traffic to \\\\WIN-SRV-01\\share'}
+        ],
+        'recommendations': [
+            'Enable MFA for all privileged accounts',
+            'Review and  tighten SMB access controls',
+            'Implement privileged access management (PAM)'
+        ]
+    }
+})
+
+
+@dataclass
+class Report:
+    """
+    A generated incident report.
+    
+    A slotted dataclass rather than a dict, since generated reports are
+    kept in memory for the life of the process. Custom reports have a
+    free-form schema and stay dicts.
+    """
+    
+    __slots__ = (
+        'report_id', 'incident_id', 'generated_at', 'generated_by', 'format',
+        'title', 'severity', 'status', 'created_at', 'affected_host',
+        'executive_summary', 'impact_assessment', 'timeline', 'actions_taken',
+        'evidence_collected', 'recommendations', 'statistics'
+    )
+    
+    report_id: str
+    incident_id: str
+    generated_at: str
+    generated_by: str
+    format: str
+    title: str
+    severity: str
+    status: str
+    created_at: str
+    affected_host: str
+    executive_summary: str
+    impact_assessment: str
+    timeline: List[Dict[str, str]]
+    actions_taken: List[str]
+    evidence_collected: List[Dict[str, str]]
+    recommendations: List[str]
+    statistics: Dict[str, int]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the API representation.
+        
+        Shallow, unlike dataclasses.asdict(): the nested lists are shared
+        with the incident and are not copied.
+        
+        Returns:
+            Dictionary with one key per field
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
 class ReportGenerator:
     """
@@ -28,83 +158,29 @@ class ReportGenerator:
     - Multiple export formats (JSON, HTML placeholder, PDF future)
     """
     
+    __slots__ = (
+        'reports', 'custom_reports', '_format_counts', '_reports_by_incident',
+        '_lock', 'incidents', '_incident_summary_cache', '_incidents_json',
+        '_incident_list_json', '_report_body_cache'
+    )
+    
     def __init__(self):
         """Initialize report generator."""
-        self.reports = {}  # Report storage
-        self.incidents = self._generate_mock_incidents()
+        # Both stores are kept in least-recently-used order and capped at
+        # config.REPORT_CACHE_SIZE entries each
+        self.reports = OrderedDict()  # Generated reports (Report objects)
+        self.custom_reports = OrderedDict()  # Custom reports (dicts)
+        self._format_counts = Counter()  # Generated reports per format
+        # {incident_id: {report_id: Report}}, each in creation order
+        self._reports_by_incident: Dict[str, Dict[str, Report]] = defaultdict(dict)
+        self._lock = threading.Lock()  # Guards the above
+        self.incidents = MOCK_INCIDENTS  # Read-only, so the caches below never go stale
+        self._incident_summary_cache: Optional[List[Dict[str, Any]]] = None
+        self._incidents_json: Dict[str, bytes] = {}  # Serialized incidents by ID
+        self._incident_list_json: Optional[bytes] = None  # Serialized incident list response
+        self._report_body_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
         logger.info("ReportGenerator initialized")
     
-    def _generate_mock_incidents(self) -> Dict[str, Dict]:
-        """Generate mock incident data for testing."""
-        return {
-            'INC-001': {
-                'incident_id': 'INC-001',
-                'title': 'Malware Execution Detected',
-                'severity': 'high',
-                'status': 'contained',
-                'created_at': '2025-11-24T14:30:00Z',
-                'host': 'WIN-WKS-05',
-                'summary': 'Malicious PowerShell execution detected with encoded commands',
-                'impact': '1 host affected, no confirmed data exfiltration',
-                'timeline': [
-                    {'time': '14:30:00', 'event': 'Initial detection - PowerShell encoded command'},
-                    {'time': '14:31:15', 'event': 'Process injection attempt detected'},
-                    {'time': '14:32:00', 'event': 'Host isolated from network'},
-                    {'time': '14:33:30', 'event': 'Malicious process terminated'},
-                    {'time': '14:35:00', 'event': 'Evidence collected - memory dump'}
-                ],
-                'actions_taken': [
-                    'Isolated WIN-WKS-05 from network',
-                    'Terminated malicious process (PID: 3456)',
-                    'Collected memory dump (2.1 GB)',
-                    'Quarantined suspicious file: C:\\Temp\\payload.exe',
-                    'Reset user credentials'
-                ],
-                'evidence': [
-                    {'type': 'file_hash', 'value': 'b40f6b2c167239519fcfb2028ab2524a', 'location': 'C:\\Temp\\payload.exe'},
-                    {'type': 'process', 'value': 'powershell.exe (PID: 3456)', 'cmdline': 'powershell.exe -enc JAB...'},
-                    {'type': 'network', 'value': 'Outbound connection to 192.168.100.50:4444'}
-                ],
-                'recommendations': [
-                    'Deploy application whitelisting on all workstations',
-                    'Restrict PowerShell execution for standard users',
-                    'Implement network segmentation for workstations',
-                    'Add detected file hash to global blocklist',
-                    'Conduct security awareness training'
-                ]
-            },
-            'INC-002': {
-                'incident_id': 'INC-002',
-                'title': 'Lateral Movement Attempt',
-                'severity': 'medium',
-                'status': 'investigating',
-                'created_at': '2025-11-24T16:00:00Z',
-                'host': 'WIN-SRV-01',
-                'summary': 'Suspicious authentication attempts from compromised workstation',
-                'impact': '2 hosts involved, credentials potentially compromised',
-                'timeline': [
-                    {'time': '16:00:00', 'event': 'Multiple failed login attempts detected'},
-                    {'time': '16:03:00', 'event': 'Successful login from WIN-WKS-12'},
-                    {'time': '16:05:00', 'event': 'SMB connection to file share'},
-                    {'time': '16:07:00', 'event': 'Alert triggered - unusual behavior'}
-                ],
-                'actions_taken': [
-                    'Monitored activity in real-time',
-                    'Collected authentication logs',
-                    'Reset affected user account password'
-                ],
-                'evidence': [
-                    {'type': 'authentication', 'value': 'Failed logins from WIN-WKS-12'},
-                    {'type': 'network', 'value': 'SMB traffic to \\\\WIN-SRV-01\\share'}
-                ],
-                'recommendations': [
-                    'Enable MFA for all privileged accounts',
-                    'Review and  tighten SMB access controls',
-                    'Implement privileged access management (PAM)'
-                ]
-            }
-        }
-    
     def generate_report(self, incident_id: str, report_format: str = 'json') -> Dict[str, Any]:
         """
         Generate an incident report.
@@ -122,14 +198,66 @@ class ReportGenerator:
                 'message': f'Incident {incident_id} not found'
             }
         
-        report_id = f"rep-{uuid.uuid4().hex[:8]}"
+        report_id = f"rep-{secrets.token_hex(4)}"
+        generated_at = get_timestamp()
+        
+        # Only the id and timestamp differ between reports of the same
+        # incident and format
+        report = Report(
+            report_id=report_id,
+            generated_at=generated_at,
+            **self._get_report_body(incident_id, report_format)
+        )
+        
+        # Store report
+        with self._lock:
+            self.reports[report_id] = report
+            self._reports_by_incident[incident_id][report_id] = report
+            self._format_counts[report_format] += 1
+            while len(self.reports) > config.REPORT_CACHE_SIZE:
+                evicted_id, evicted = self.reports.popitem(last=False)
+                self._format_counts[evicted.format] -= 1
+                incident_reports = self._reports_by_incident[evicted.incident_id]
+                del incident_reports[evicted_id]
+                if not incident_reports:
+                    del self._reports_by_incident[evicted.incident_id]
+        
+        # Generate download URL based on format
+        download_url = f'/api/report/download/{report_id}.{report_format}'
+        
+        logger.info(f"Report generated: {report_id} for incident {incident_id}")
+        
+        return {
+            'status': 'success',
+            'report_id': report_id,
+            'incident_id': incident_id,
+            'format': report_format,
+            'download_url': download_url,
+            'generated_at': generated_at
+        }
+    
+    def _get_report_body(self, incident_id: str, report_format: str) -> Dict[str, Any]:
+        """
+        Get the report content for an incident, built once per format.
+        
+        Args:
+            incident_id: Incident identifier (must exist)
+            report_format: Format ('json', 'html', 'pdf')
+        
+        Returns:
+            Report fields other than report_id and generated_at; shared
+            between calls, so it must not be modified
+        """
+        key = (incident_id, report_format)
+        body = self._report_body_cache.get(key)
+        if body is not None:
+            return body
+        
         incident = self.incidents[incident_id]
         
         # Build comprehensive report
-        report = {
-            'report_id': report_id,
+        body = {
             'incident_id': incident_id,
-            'generated_at': get_timestamp(),
             'generated_by': 'SIREN Automated Report Generator',
             'format': report_format,
             
@@ -164,65 +292,78 @@ class ReportGenerator:
                 'recommendations': len(incident['recommendations'])
             }
         }
-        
-        # Store report
-        self.reports[report_id] = report
-        
-        # Generate download URL based on format
-        download_url = f'/api/report/download/{report_id}.{report_format}'
-        
-        logger.info(f"Report generated: {report_id} for incident {incident_id}")
-        
-        return {
-            'status': 'success',
-            'report_id': report_id,
-            'incident_id': incident_id,
-            'format': report_format,
-            'download_url': download_url,
-            'generated_at': get_timestamp()
-        }
+        if report_format in REPORT_FORMATS:
+            self._report_body_cache[key] = body
+        return body
     
     def get_report(self, report_id: str) -> Dict[str, Any]:
         """
         Retrieve a generated report.
         
+        Marks the report as recently used, so it is evicted last.
+        
         Args:
             report_id: Report identifier
         
         Returns:
             Report data or error
         """
-        if report_id not in self.reports:
+        with self._lock:
+            report = self.reports.get(report_id)
+            if report is not None:
+                self.reports.move_to_end(report_id)
+            else:
+                report = self.custom_reports.get(report_id)
+                if report is not None:
+                    self.custom_reports.move_to_end(report_id)
+        
+        if report is None:
             return {
                 'status': 'not_found',
                 'message': f'Report {report_id} not found'
             }
         
-        return self.reports[report_id]
+        return report.to_dict() if isinstance(report, Report) else report
     
     def list_reports(self, incident_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         List all generated reports.
         
+        Filtering by incident reads only that incident's reports, which
+        are indexed in creation order and so need no sorting.
+        
         Args:
             incident_id: Optional filter by incident
         
         Returns:
-            List of report summaries
+            List of report summaries, newest first
         """
-        reports = []
-        
-        for report_id, report in self.reports.items():
-            if incident_id is None or report['incident_id'] == incident_id:
-                reports.append({
-                    'report_id': report['report_id'],
-                    'incident_id': report['incident_id'],
-                    'title': report['title'],
-                    'generated_at': report['generated_at'],
-                    'format': report['format']
-                })
-        
-        return sorted(reports, key=lambda x: x['generated_at'], reverse=True)
+        with self._lock:
+            if incident_id is None:
+                stored = list(self.reports.values())
+            elif incident_id in self._reports_by_incident:
+                stored = list(self._reports_by_incident[incident_id].values())
+            else:
+                stored = []
+        
+        reports = [
+            {
+                'report_id': report.report_id,
+                'incident_id': report.incident_id,
+                'title': report.title,
+                'generated_at': report.generated_at,
+                'format': report.format
+            }
+            for report in stored
+        ]
+        
+        if incident_id is None:
+            # self.reports is in least-recently-used order
+            reports.sort(key=itemgetter('generated_at'), reverse=True)
+        else:
+            reports.reverse()
+        
+        return reports
     
     def download_report(self, report_id: str, format: str = 'json') -> Dict[str, Any]:
         """
@@ -284,26 +425,63 @@ class ReportGenerator:
         
         return self.incidents[incident_id]
     
+    def get_incident_json(self, incident_id: str) -> Optional[bytes]:
+        """
+        Get the serialized details of an incident, built once per incident.
+        
+        Args:
+            incident_id: Incident identifier
+        
+        Returns:
+            JSON bytes, or None if the incident is unknown
+        """
+        body = self._incidents_json.get(incident_id)
+        if body is None and incident_id in self.incidents:
+            body = orjson.dumps(self.incidents[incident_id])
+            self._incidents_json[incident_id] = body
+        return body
+    
+    def list_incidents_json(self) -> bytes:
+        """
+        Get the serialized incident list response, built once.
+        
+        Returns:
+            JSON bytes of {"incidents": [...], "count": N}
+        """
+        body = self._incident_list_json
+        if body is None:
+            incidents = self.list_incidents()
+            body = orjson.dumps({'incidents': incidents, 'count': len(incidents)})
+            self._incident_list_json = body
+        return body
+    
     def list_incidents(self) -> List[Dict[str, Any]]:
         """
         List all incidents.
         
+        The summaries are built and sorted once, then reused; the incidents
+        are read-only, so they never go stale. The returned list must not
+        be modified.
+        
         Returns:
-            List of incident summaries
+            List of incident summaries, newest first
         """
-        incidents = []
-        
-        for inc_id, inc in self.incidents.items():
-            incidents.append({
-                'incident_id': inc['incident_id'],
-                'title': inc['title'],
-                'severity': inc['severity'],
-                'status': inc['status'],
-                'created_at': inc['created_at'],
-                'host': inc.get('host', 'Multiple')
-            })
-        
-        return sorted(incidents, key=lambda x: x['created_at'], reverse=True)
+        if self._incident_summary_cache is None:
+            incidents = [
+                {
+                    'incident_id': inc['incident_id'],
+                    'title': inc['title'],
+                    'severity': inc['severity'],
+                    'status': inc['status'],
+                    'created_at': inc['created_at'],
+                    'host': inc.get('host', 'Multiple')
+                }
+                for inc in self.incidents.values()
+            ]
+            incidents.sort(key=itemgetter('created_at'), reverse=True)
+            self._incident_summary_cache = incidents
+        
+        return self._incident_summary_cache
     
     def create_custom_report(self, title: str, sections: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -316,7 +494,7 @@ class ReportGenerator:
         Returns:
             Report creation result
         """
-        report_id = f"rep-custom-{uuid.uuid4().hex[:8]}"
+        report_id = f"rep-custom-{secrets.token_hex(4)}"
         
         report = {
             'report_id': report_id,
@@ -326,7 +504,10 @@ class ReportGenerator:
             'sections': sections
         }
         
-        self.reports[report_id] = report
+        with self._lock:
+            self.custom_reports[report_id] = report
+            while len(self.custom_reports) > config.REPORT_CACHE_SIZE:
+                self.custom_reports.popitem(last=False)
         
         logger.info(f"Custom report created: {report_id}")
         
@@ -344,11 +525,11 @@ class ReportGenerator:
             Statistics dictionary
         """
         return {
-            'total_reports': len(self.reports),
+            'total_reports': len(self.reports) + len(self.custom_reports),
             'total_incidents': len(self.incidents),
             'reports_by_format': {
-                'json': sum(1 for r in self.reports.values() if r.get('format') == 'json'),
-                'html': sum(1 for r in self.reports.values() if r.get('format') == 'html'),
-                'pdf': sum(1 for r in self.reports.values() if r.get('format') == 'pdf')
+                'json': self._format_counts['json'],
+                'html': self._format_counts['html'],
+                'pdf': self._format_counts['pdf']
             }
         }
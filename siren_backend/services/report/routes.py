@@ -13,9 +13,10 @@ Endpoints:
     POST /api/report/custom                     - Create custom report
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, request
 import logging
-from .generator import ReportGenerator
+from utils.common import json_response
+from .generator import REPORT_FORMATS, ReportGenerator
 
 logger = logging.getLogger(__name__)
 
@@ -39,16 +40,19 @@ def generate_report(incident_id):
         Report generation result with download URL
     """
     try:
-        data = request.get_json() if request.is_json else {}
-        report_format = data.get('format', 'json')
+        data = request.get_json(silent=True)
+        report_format = data.get('format', 'json') if isinstance(data, dict) else 'json'
+        
+        if not isinstance(report_format, str) or report_format not in REPORT_FORMATS:
+            return json_response({'error': f'format must be one of: {", ".join(REPORT_FORMATS)}'}, 400)
         
         result = generator.generate_report(incident_id, report_format)
         status_code = 200 if result.get('status') == 'success' else 400
-        return jsonify(result), status_code
+        return json_response(result, status_code)
         
     except Exception as e:
         logger.error(f"Error generating report: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @report_bp.route('/download/<report_id>', methods=['GET'])
@@ -69,13 +73,13 @@ def download_report(report_id):
         result = generator.download_report(report_id, format)
         
         if result.get('status') == 'not_found':
-            return jsonify(result), 404
+            return json_response(result, 404)
         
-        return jsonify(result), 200
+        return json_response(result, 200)
         
     except Exception as e:
         logger.error(f"Error downloading report: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @report_bp.route('/list', methods=['GET'])
@@ -95,14 +99,14 @@ def list_reports():
         incident_id = request.args.get('incident_id', None)
         reports = generator.list_reports(incident_id)
         
-        return jsonify({
+        return json_response({
             'reports': reports,
             'count': len(reports)
-        }), 200
+        }, 200)
         
     except Exception as e:
         logger.error(f"Error listing reports: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @report_bp.route('/<report_id>', methods=['GET'])
@@ -119,13 +123,13 @@ def get_report(report_id):
         report = generator.get_report(report_id)
         
         if report.get('status') == 'not_found':
-            return jsonify(report), 404
+            return json_response(report, 404)
         
-        return jsonify(report), 200
+        return json_response(report, 200)
         
     except Exception as e:
         logger.error(f"Error fetching report: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @report_bp.route('/incidents', methods=['GET'])
@@ -139,16 +143,13 @@ def list_incidents():
         Array of incident summaries
     """
     try:
-        incidents = generator.list_incidents()
-        
-        return jsonify({
-            'incidents': incidents,
-            'count': len(incidents)
-        }), 200
+        # The incident list never changes, so it is serialized only once
+        body = generator.list_incidents_json()
+        return Response(body, status=200, mimetype='application/json')
         
     except Exception as e:
         logger.error(f"Error listing incidents: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @report_bp.route('/incident/<incident_id>', methods=['GET'])
@@ -162,16 +163,16 @@ def get_incident(incident_id):
         Complete incident data
     """
     try:
-        incident = generator.get_incident(incident_id)
-        
-        if incident.get('status') == 'not_found':
-            return jsonify(incident), 404
+        # Incidents are static and served from their cached serialization
+        body = generator.get_incident_json(incident_id)
+        if body is not None:
+            return Response(body, status=200, mimetype='application/json')
         
-        return jsonify(incident), 200
+        return json_response(generator.get_incident(incident_id), 404)
         
     except Exception as e:
         logger.error(f"Error fetching incident: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @report_bp.route('/custom', methods=['POST'])
@@ -194,22 +195,22 @@ def create_custom_report():
         Report creation result
     """
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'Request body required'}), 400
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not data:
+            return json_response({'error': 'Request body required'}, 400)
         
         title = data.get('title')
         sections = data.get('sections', {})
         
         if not title:
-            return jsonify({'error': 'title is required'}), 400
+            return json_response({'error': 'title is required'}, 400)
         
         result = generator.create_custom_report(title, sections)
-        return jsonify(result), 200
+        return json_response(result, 200)
         
     except Exception as e:
         logger.error(f"Error creating custom report: {e}")
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 
 @report_bp.route('/health', methods=['GET'])
@@ -224,9 +225,9 @@ def health_check():
     """
     stats = generator.get_statistics()
     
-    return jsonify({
+    return json_response({
         'status': 'healthy',
         'service': 'report_generation',
         'total_reports': stats['total_reports'],
         'total_incidents': stats['total_incidents']
-    }), 200
+    }, 200)
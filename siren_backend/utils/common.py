@@ -4,19 +4,88 @@ Common Utilities
 Shared utility functions used across multiple services.
 """
 
-from datetime import datetime
-from typing import Dict, Any, Optional
+from functools import wraps
+from typing import Callable, Dict, Any, Optional
 import json
+import logging
+import time
+import orjson
+from flask import Response
+
+
+# (epoch second, its ISO 8601 date and time) for the last get_timestamp()
+# call; replaced as a whole, so concurrent callers never see a torn pair
+_timestamp_second = (None, '')
 
 
 def get_timestamp() -> str:
     """
     Get current UTC timestamp in ISO 8601 format.
     
+    Only the microseconds change between calls within the same second,
+    so the formatted date and time are reused until the second changes.
+    
     Returns:
-        ISO 8601 formatted timestamp string
+        ISO 8601 formatted timestamp string, with microseconds
     """
-    return datetime.utcnow().isoformat() + 'Z'
+    global _timestamp_second
+    
+    second, micros = divmod(time.time_ns() // 1000, 1000000)
+    cached_second, prefix = _timestamp_second
+    if second != cached_second:
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+        _timestamp_second = (second, prefix)
+    return f'{prefix}.{micros:06d}Z'
+
+
+def json_response(data: Any, status: int = 200) -> Response:
+    """
+    Serialize data straight to a JSON response with orjson.
+    
+    Equivalent to ``jsonify(data), status`` without the app-context and
+    provider dispatch, for routes that return large list-of-dict payloads.
+    
+    Args:
+        data: JSON-serializable response data
+        status: HTTP status code
+    
+    Returns:
+        Flask Response with an application/json body
+    """
+    return Response(
+        orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
+
+
+def safe_endpoint(action: str) -> Callable:
+    """
+    Decorator turning uncaught exceptions in a view into a 500 response.
+    
+    The error is logged on the view module's logger as
+    "Error <action>: <exception>" and returned as {"error": "<exception>"}.
+    
+    Args:
+        action: Short description of what the view does (e.g. 'isolating host')
+    
+    Returns:
+        Decorator for Flask view functions
+    """
+    def decorator(view: Callable) -> Callable:
+        logger = logging.getLogger(view.__module__)
+        
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                return view(*args, **kwargs)
+            except Exception as e:
+                logger.error("Error %s: %s", action, e)
+                return json_response({'error': str(e)}, 500)
+        
+        return wrapper
+    
+    return decorator
 
 
 def format_response(
@@ -94,6 +163,10 @@ def sanitize_path(path: str) -> str:
     return path.replace('\\', '/').strip()
 
 
+# Strings parse_bool() treats as true (compared lowercased)
+_TRUTHY = frozenset({'true', 'yes', '1', 'on'})
+
+
 def parse_bool(value: Any) -> bool:
     """
     Parse various input types to boolean.
@@ -104,10 +177,10 @@ def parse_bool(value: Any) -> bool:
     Returns:
         Boolean value
     """
-    if isinstance(value, bool):
+    if value is True or value is False:
         return value
     if isinstance(value, str):
-        return value.lower() in ('true', 'yes', '1', 'on')
+        return value.lower() in _TRUTHY
     if isinstance(value, (int, float)):
         return value != 0
     return False
@@ -124,7 +197,13 @@ def safe_json_loads(json_str: str, default: Any = None) -> Any:
     Returns:
         Parsed JSON or default value
     """
+    # Missing and empty input is the common failure; answer it without
+    # raising and catching a decode error
+    if not json_str:
+        return default
+    
     try:
         return json.loads(json_str)
-    except (json.JSONDecodeError, TypeError):
+    except (ValueError, TypeError):
+        # ValueError covers JSONDecodeError and undecodable bytes
         return default
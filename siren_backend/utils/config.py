@@ -5,7 +5,9 @@ Centralized configuration for the Siren Backend application.
 """
 
 import os
-from typing import Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping
 
 
 class Config:
@@ -26,22 +28,38 @@ class Config:
     # Service-specific configurations
     PROCESS_MONITOR_INTERVAL = float(os.getenv('PROCESS_MONITOR_INTERVAL', 1.0))
     METRICS_BUFFER_SIZE = int(os.getenv('METRICS_BUFFER_SIZE', 60))
+    BEHAVIOR_MAX_EVENTS = int(os.getenv('BEHAVIOR_MAX_EVENTS', 1000))
+    IOC_MAX_HUNTS = int(os.getenv('SIREN_IOC_MAX_HUNTS', 10000))
+    REPORT_CACHE_SIZE = int(os.getenv('SIREN_REPORT_CACHE_SIZE', 10000))
+    
+    # Integrity scanner baselines (SQLite file, or ':memory:')
+    BASELINE_DB = os.getenv('SIREN_BASELINE_DB', 'siren_baselines.db')
+    
+    # Containment: when false, IP block rules are only logged (simulation);
+    # host isolation is always simulated
+    CONTAINMENT_ENFORCE = os.getenv('SIREN_CONTAINMENT_ENFORCE', 'False').lower() == 'true'
+    FIREWALL_BATCH_SIZE = int(os.getenv('SIREN_FIREWALL_BATCH_SIZE', 64))
     
     @classmethod
-    def get_config(cls) -> Dict[str, Any]:
+    @lru_cache(maxsize=1)
+    def get_config(cls) -> Mapping[str, Any]:
         """
-        Get all configuration as a dictionary.
+        Get all configuration as a mapping.
+        
+        The settings are read from the environment once, when this class
+        is defined, so the snapshot is built on the first call and shared.
         
         Returns:
-            Dictionary of all configuration values
+            Read-only mapping of all configuration values
         """
-        return {
+        return MappingProxyType({
             'host': cls.HOST,
             'port': cls.PORT,
             'debug': cls.DEBUG,
             'log_level': cls.LOG_LEVEL,
             'cors_origins': cls.CORS_ORIGINS,
-        }
+            'containment_enforce': cls.CONTAINMENT_ENFORCE,
+        })
     
     @classmethod
     def print_config(cls) -> None:
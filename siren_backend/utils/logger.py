@@ -4,21 +4,38 @@ Centralized Logging Configuration
 Provides consistent logging setup for all services in the Siren Backend.
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from typing import Optional
 
 
+# Writes queued log records to the real handlers (see setup_logging)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
 def setup_logging(level: str = 'INFO', log_file: Optional[str] = None) -> None:
     """
     Configure logging for the entire application.
     
+    Request threads only put records on a queue; a background listener
+    thread formats them and does the console and file writes, so a slow
+    stdout or disk never blocks a request.
+    
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional file path to write logs to
     """
     log_level = getattr(logging, level.upper(), logging.INFO)
-    
+
+    # The formatter never uses thread/process fields, so skip collecting them
+    # for every LogRecord
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     # Create formatter
     formatter = logging.Formatter(
         '[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s',
@@ -37,10 +54,23 @@ def setup_logging(level: str = 'INFO', log_file: Optional[str] = None) -> None:
         file_handler.setFormatter(formatter)
         handlers.append(file_handler)
     
+    # Replace a listener from an earlier call, flushing what it holds
+    stop_logging()
+    
+    global _listener
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    
+    # The queued record carries the bare message (with any traceback);
+    # the listener's handlers apply the real format
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    
     # Configure root logger
     logging.basicConfig(
         level=log_level,
-        handlers=handlers,
+        handlers=[queue_handler],
         force=True
     )
     
@@ -49,6 +79,17 @@ def setup_logging(level: str = 'INFO', log_file: Optional[str] = None) -> None:
     logging.getLogger('urllib3').setLevel(logging.WARNING)
 
 
+def stop_logging() -> None:
+    """Write out queued log records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for a specific module.